@@ -1,18 +1,28 @@
 from .authorization import router as authorization_router
+from .catalog import router as catalog_router
 from .category import router as categories_router
+from .delivery_zone import router as delivery_zone_router
+from .dispatch import router as dispatch_router
+from .kitchen import router as kitchen_router
 from .orderItem import router as order_item_router
 from .order import router as orders_router
 from .product import router as product_router
+from .report import router as report_router
 from .restaurant import router as restaurant_router
 from .user import router as user_router
 from .userAddress import router as user_address_router
 
 all_routers = [
     authorization_router,
+    catalog_router,
     categories_router,
+    delivery_zone_router,
+    dispatch_router,
+    kitchen_router,
     order_item_router,
     orders_router,
     product_router,
+    report_router,
     restaurant_router,
     user_router,
     user_address_router,
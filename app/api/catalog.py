@@ -0,0 +1,73 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_db_session
+from app.crud.catalog import CatalogCRUD
+from app.crud.product import ProductCRUD, CategoryCRUD
+from app.schemas.catalog import CatalogChanges
+from app.schemas.product import ProductResponse
+from app.services.catalog_snapshot import catalog_snapshots
+from app.services.catalog_version import catalog_etag, etag_matches
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+
+def _snapshot_response(request: Request, body: bytes, version: int) -> Response:
+    etag = catalog_etag(version)
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/changes", response_model=CatalogChanges)
+async def get_catalog_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db_session),
+):
+    result = await CatalogCRUD.get_changes(db=db, since=since, limit=limit)
+    return result
+
+
+@router.get("/products/{product_id:int}", response_model=ProductResponse)
+async def get_catalog_product(
+    product_id: int, request: Request, db: AsyncSession = Depends(get_db_session)
+):
+    """Product from the host's memory-mapped catalog snapshot"""
+    snapshot = catalog_snapshots.current
+    if snapshot is None:
+        # first seconds after startup, before the snapshot is mapped
+        product = await ProductCRUD.get_by_id(db=db, product_id=product_id)
+        if product is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return ProductResponse.from_orm(product)
+
+    body = snapshot.get_product(product_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return _snapshot_response(request, body, snapshot.version)
+
+
+@router.get(
+    "/categories/{category_id:int}/products", response_model=List[ProductResponse]
+)
+async def get_catalog_category_products(
+    category_id: int, request: Request, db: AsyncSession = Depends(get_db_session)
+):
+    """Products of a category from the host's memory-mapped catalog snapshot"""
+    snapshot = catalog_snapshots.current
+    if snapshot is None:
+        category = await CategoryCRUD.get_by_id(db=db, category_id=category_id)
+        if category is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        result = await ProductCRUD.get_products_by_category(
+            db=db, category_id=category_id
+        )
+        return result
+
+    body = snapshot.list_category(category_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return _snapshot_response(request, body, snapshot.version)
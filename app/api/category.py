@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.dependencies import get_db_session
+from app.core.dependencies import get_db_session, check_catalog_etag
 from app.crud.product import CategoryCRUD
 from app.schemas.product import (
     CategoryCreate,
@@ -13,7 +13,11 @@ from app.schemas.product import (
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 
-@router.get("/", response_model=List[CategoryResponse])
+@router.get(
+    "/",
+    response_model=List[CategoryResponse],
+    dependencies=[Depends(check_catalog_etag)],
+)
 async def get_all_category(db: AsyncSession = Depends(get_db_session)):
     result = await CategoryCRUD.get_all(db=db)
     return result
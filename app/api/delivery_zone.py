@@ -0,0 +1,106 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+
+from app.core.dependencies import get_db_session
+from app.crud.delivery_zone import DeliveryZoneCRUD
+from app.crud.restaurant import RestaurantCRUD
+from app.crud.user import UserAddressCRUD
+from app.schemas.delivery_zone import (
+    DeliveryZoneCreate,
+    DeliveryZoneUpdate,
+    DeliveryZoneResponse,
+    DeliveryZoneMatch,
+)
+
+router = APIRouter(prefix="/delivery_zones", tags=["delivery_zones"])
+
+
+@router.get("/serving", response_model=List[DeliveryZoneMatch])
+async def get_serving_zones(
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    user_address_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Delivery zones (and so restaurants) serving a point or a saved user address
+    """
+    if user_address_id is not None:
+        address = await UserAddressCRUD.get_by_id(
+            db=db, user_address_id=user_address_id
+        )
+        if address is None:
+            raise HTTPException(status_code=404, detail="Address not found")
+        latitude, longitude = address.latitude, address.longitude
+        if latitude is None or longitude is None:
+            raise HTTPException(status_code=400, detail="Address is not geocoded")
+    elif latitude is None or longitude is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Pass latitude and longitude or user_address_id",
+        )
+
+    result = await DeliveryZoneCRUD.get_serving(latitude=latitude, longitude=longitude)
+    return result
+
+
+@router.get(
+    "/by-restaurant_id/{restaurant_id:int}", response_model=List[DeliveryZoneResponse]
+)
+async def get_zones_by_restaurant_id(
+    restaurant_id: int, db: AsyncSession = Depends(get_db_session)
+):
+    result = await DeliveryZoneCRUD.get_by_restaurant_id(
+        db=db, restaurant_id=restaurant_id
+    )
+    return result
+
+
+@router.get("/{zone_id:int}", response_model=DeliveryZoneResponse)
+async def get_zone_by_id(zone_id: int, db: AsyncSession = Depends(get_db_session)):
+    result = await DeliveryZoneCRUD.get_by_id(db=db, zone_id=zone_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Delivery zone not found")
+    return DeliveryZoneResponse.from_orm(result)
+
+
+@router.post("/", response_model=DeliveryZoneResponse)
+async def create_zone(
+    zone_create: DeliveryZoneCreate, db: AsyncSession = Depends(get_db_session)
+):
+    restaurant = await RestaurantCRUD.get_by_id(
+        db=db, restaurant_id=zone_create.restaurant_id
+    )
+    if restaurant is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+
+    try:
+        result = await DeliveryZoneCRUD.create(db=db, zone_create=zone_create)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DeliveryZoneResponse.from_orm(result)
+
+
+@router.put("/{zone_id:int}", response_model=DeliveryZoneResponse)
+async def update_zone(
+    zone_id: int,
+    zone_update: DeliveryZoneUpdate,
+    db: AsyncSession = Depends(get_db_session),
+):
+    try:
+        result = await DeliveryZoneCRUD.update(
+            db=db, zone_id=zone_id, zone_update=zone_update
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Delivery zone not found")
+    return DeliveryZoneResponse.from_orm(result)
+
+
+@router.delete("/{zone_id:int}")
+async def delete_zone(zone_id: int, db: AsyncSession = Depends(get_db_session)):
+    if not await DeliveryZoneCRUD.delete(db=db, zone_id=zone_id):
+        raise HTTPException(status_code=404, detail="Delivery zone not found")
+    return {"deleted": zone_id}
@@ -0,0 +1,128 @@
+import time
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core.database import db_manager
+from app.core.dependencies import get_db_session
+from app.crud.order import OrderCRUD
+from app.crud.user import UserCRUD
+from app.schemas.dispatch import (
+    CourierPositionUpdate,
+    CourierNearbyResponse,
+    CourierRouteResponse,
+    RouteStop,
+)
+from app.schemas.order import OrderResponse
+from app.services.courier_locations import location_buffer, parse_pings
+from app.services.dispatch import (
+    update_courier_position,
+    remove_courier,
+    get_nearby_couriers,
+    get_courier_route,
+)
+
+router = APIRouter(prefix="/dispatch", tags=["dispatch"])
+
+
+@router.put("/couriers/{courier_id:int}/position")
+async def set_courier_position(
+    courier_id: int,
+    position: CourierPositionUpdate,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """Courier is on shift at this position and can get orders"""
+    if await UserCRUD.get_by_id(db=db, user_id=courier_id) is None:
+        raise HTTPException(status_code=404, detail="Courier not found")
+    await update_courier_position(courier_id, position.latitude, position.longitude)
+    return {"courier_id": courier_id}
+
+
+@router.websocket("/couriers/{courier_id:int}/locations")
+async def stream_courier_locations(websocket: WebSocket, courier_id: int):
+    """
+    GPS pings of a courier on shift, a JSON ping {"lat", "lon", "ts"} or a
+    list of them per message; ts is unix seconds and defaults to the receive
+    time. Pings are buffered and written in batches, there is no reply
+    except {"error": ..} for an invalid message.
+    """
+    # no session for the lifetime of the socket
+    async with db_manager.get_session() as session:
+        courier = await UserCRUD.get_by_id(db=session, user_id=courier_id)
+    if courier is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                pings = parse_pings(message, time.time())
+            except ValueError as e:
+                await websocket.send_json({"error": str(e)})
+                continue
+            for latitude, longitude, timestamp in pings:
+                location_buffer.add(courier_id, latitude, longitude, timestamp)
+    except WebSocketDisconnect:
+        # the courier stays dispatchable until the position ages out
+        pass
+
+
+@router.delete("/couriers/{courier_id:int}/position")
+async def end_courier_shift(courier_id: int):
+    """Courier gets no new orders until the next position update"""
+    await remove_courier(courier_id)
+    return {"courier_id": courier_id}
+
+
+@router.get("/couriers/nearby", response_model=List[CourierNearbyResponse])
+async def get_couriers_nearby(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5, gt=0, le=50),
+    limit: int = Query(20, ge=1, le=100),
+):
+    couriers = await get_nearby_couriers(latitude, longitude, radius_km, limit)
+    return [
+        CourierNearbyResponse(
+            courier_id=courier_id,
+            distance_km=distance_km,
+            latitude=courier_latitude,
+            longitude=courier_longitude,
+        )
+        for courier_id, distance_km, courier_latitude, courier_longitude in couriers
+    ]
+
+
+@router.get("/couriers/{courier_id:int}/orders", response_model=List[OrderResponse])
+async def get_courier_orders(
+    courier_id: int, db: AsyncSession = Depends(get_db_session)
+):
+    result = await OrderCRUD.get_by_courier_id(db=db, courier_id=courier_id)
+    return result
+
+
+@router.get("/couriers/{courier_id:int}/route", response_model=CourierRouteResponse)
+async def get_route(courier_id: int, db: AsyncSession = Depends(get_db_session)):
+    """Stops of the courier's open orders in visit order"""
+    distance_km, stops = await get_courier_route(db=db, courier_id=courier_id)
+    return CourierRouteResponse(
+        courier_id=courier_id,
+        distance_km=distance_km,
+        stops=[
+            RouteStop(
+                kind=kind, order_id=order_id, latitude=latitude, longitude=longitude
+            )
+            for kind, order_id, latitude, longitude in stops
+        ],
+    )
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.dependencies import get_db_session
+from app.crud.order import OrderCRUD
+from app.crud.outbox import OrderEventType
+from app.schemas.kitchen import KitchenEntry, KitchenEntries, KitchenAckResponse
+from app.services.kitchen_display import (
+    get_display_entries,
+    get_pending_entry,
+    ack_display_entry,
+)
+
+router = APIRouter(prefix="/kitchen", tags=["kitchen"])
+
+DISPLAY_NAME = Path(..., pattern=r"^[A-Za-z0-9_-]{1,50}$")
+
+
+@router.get(
+    "/{restaurant_id:int}/displays/{display}/entries", response_model=KitchenEntries
+)
+async def get_kitchen_entries(
+    restaurant_id: int,
+    display: str = DISPLAY_NAME,
+    block_ms: int = Query(
+        settings.KITCHEN_BLOCK_MS, ge=0, le=settings.KITCHEN_BLOCK_MS
+    ),
+):
+    """
+    Long poll of a kitchen display: entries delivered to it and not acked
+    yet, otherwise the next new ones, waiting up to {block_ms}. An empty
+    list means nothing arrived, poll again.
+    """
+    entries = await get_display_entries(restaurant_id, display, block_ms)
+    return KitchenEntries(entries=[KitchenEntry(**entry) for entry in entries])
+
+
+@router.post(
+    "/{restaurant_id:int}/displays/{display}/entries/{entry_id}/ack",
+    response_model=KitchenAckResponse,
+)
+async def ack_kitchen_entry(
+    restaurant_id: int,
+    display: str = DISPLAY_NAME,
+    entry_id: str = Path(..., pattern=r"^\d+-\d+$"),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    The display handled the entry. Acking an order.created entry accepts
+    the order (NEW -> PROCESSING), which makes it dispatchable. The entry is
+    acked only after that committed, so a failed accept leaves it pending
+    for the next read; accepting again is a no-op.
+    """
+    fields = await get_pending_entry(restaurant_id, display, entry_id)
+    if fields is None:
+        raise HTTPException(status_code=404, detail="Entry not pending")
+
+    order_id = int(fields["order_id"])
+    accepted = False
+    if fields["event_type"] == OrderEventType.CREATED:
+        accepted = await OrderCRUD.accept(
+            db=db, order_id=order_id, restaurant_id=restaurant_id
+        )
+    await ack_display_entry(restaurant_id, display, entry_id)
+    return KitchenAckResponse(entry_id=entry_id, order_id=order_id, accepted=accepted)
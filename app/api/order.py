@@ -1,12 +1,22 @@
+import asyncio
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import db_manager
 from app.core.dependencies import get_db_session
 from app.crud.order import OrderCRUD
 from app.models.order import OrderStatus
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
+from app.schemas.order import (
+    OrderCreate,
+    OrderUpdate,
+    OrderResponse,
+    OrderEtaResponse,
+    DeliveryFeeQuote,
+)
+from app.services.order_eta import OPEN_STATUSES, eta_subscribers, get_order_eta
+from app.services.surge import get_delivery_fee, get_heatmap
 
 router = APIRouter(prefix="/order", tags=["order"])
 
@@ -17,6 +27,79 @@ async def get_order_by_id(order_id: int, db: AsyncSession = Depends(get_db_sessi
     return result
 
 
+@router.get("/delivery-fee", response_model=DeliveryFeeQuote)
+async def quote_delivery_fee(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+):
+    """Delivery fee an order to this point is charged right now"""
+    surge_multiplier, delivery_fee = await get_delivery_fee(latitude, longitude)
+    return DeliveryFeeQuote(
+        surge_multiplier=surge_multiplier, delivery_fee=delivery_fee
+    )
+
+
+@router.get("/surge-heatmap")
+async def get_surge_heatmap():
+    """Surge multiplier per geohash cell, cells not listed are at 1.0"""
+    return await get_heatmap()
+
+
+@router.get("/{order_id:int}/eta", response_model=OrderEtaResponse)
+async def get_eta(order_id: int):
+    """Estimated pickup and delivery time of an open order"""
+    eta = await get_order_eta(order_id)
+    if eta is None:
+        raise HTTPException(status_code=404, detail="No ETA for this order")
+    return OrderEtaResponse.from_cache(eta)
+
+
+@router.websocket("/{order_id:int}/eta/ws")
+async def stream_eta(websocket: WebSocket, order_id: int):
+    """
+    Current ETA of the order, then every significant change of it. A new
+    order gets its first ETA with the next refresh. The socket is closed
+    once the order is no longer open.
+    """
+    await websocket.accept()
+    queue = eta_subscribers.subscribe(order_id)
+    # the client sends nothing, a receive only completes on disconnect
+    receiving = asyncio.create_task(websocket.receive())
+    try:
+        eta = await get_order_eta(order_id)
+        if eta is None:
+            # not estimated yet, or closed before the subscription
+            # no session for the lifetime of the socket
+            async with db_manager.get_session() as session:
+                order = await OrderCRUD.get_by_id(
+                    db=session, order_id=order_id, include_archive=False
+                )
+            if order is None or order.status not in OPEN_STATUSES:
+                await websocket.close()
+                return
+
+        while True:
+            if eta is not None:
+                await websocket.send_text(
+                    OrderEtaResponse.from_cache(eta).model_dump_json()
+                )
+            waiting = asyncio.create_task(queue.get())
+            await asyncio.wait(
+                {waiting, receiving}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if receiving.done():
+                waiting.cancel()
+                return
+            eta = waiting.result()
+            # EtaSubscribers pushes None once the order is closed
+            if eta is None:
+                break
+        await websocket.close()
+    finally:
+        receiving.cancel()
+        eta_subscribers.unsubscribe(order_id, queue)
+
+
 @router.get("/by-user_id/{user_id:int}", response_model=OrderResponse)
 async def get_last_order_by_user_id(
     user_id: int, db: AsyncSession = Depends(get_db_session)
@@ -76,7 +159,32 @@ async def get_orders(user_id: int, db: AsyncSession = Depends(get_db_session)):
 
 @router.post("/", response_model=OrderResponse)
 async def create_order(order: OrderCreate, db: AsyncSession = Depends(get_db_session)):
-    result = await OrderCRUD.create(db=db, order_create=order)
+    try:
+        result = await OrderCRUD.create(db=db, order_create=order)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@router.post("/{order_id:int}/reorder", response_model=OrderResponse)
+async def reorder(order_id: int, db: AsyncSession = Depends(get_db_session)):
+    try:
+        result = await OrderCRUD.reorder(db=db, order_id=order_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Nothing to reorder")
+    return result
+
+
+@router.post("/by-user_id/{user_id:int}/reorder", response_model=OrderResponse)
+async def reorder_last_order(user_id: int, db: AsyncSession = Depends(get_db_session)):
+    try:
+        result = await OrderCRUD.reorder_last(db=db, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Nothing to reorder")
     return result
 
 
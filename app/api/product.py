@@ -1,23 +1,84 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db_session
+from app.core.config import settings
+from app.core.dependencies import get_db_session, check_catalog_etag
 from app.crud.product import ProductCRUD
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
+    ProductSortField,
+    ProductPage,
+    ProductSuggestion,
+    ProductImportFormat,
+    ProductImportReport,
+    ProductBulkUpdate,
+    ProductBulkUpdateResult,
+    CategoryAvailabilityUpdate,
 )
+from app.services.autocomplete import autocomplete
+from app.services.product_import import import_products
 
 
 router = APIRouter(prefix="/products", tags=["products"])
 
 
-@router.get("/", response_model=List[ProductResponse])
-async def get_products(db: AsyncSession = Depends(get_db_session)):
-    result = await ProductCRUD.get_all_products(db)
+@router.get("/", response_model=ProductPage, dependencies=[Depends(check_catalog_etag)])
+async def get_products(
+    category_id: Optional[int] = None,
+    is_available: Optional[bool] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    sort: ProductSortField = ProductSortField.ID,
+    descending: bool = False,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+):
+    try:
+        result = await ProductCRUD.get_all_products(
+            db,
+            category_id=category_id,
+            is_available=is_available,
+            min_price=min_price,
+            max_price=max_price,
+            sort=sort,
+            descending=descending,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@router.get("/search", response_model=ProductPage)
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    category_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+):
+    try:
+        result = await ProductCRUD.search(
+            db, query_text=q, category_id=category_id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@router.get("/autocomplete", response_model=List[ProductSuggestion])
+async def autocomplete_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=10),
+    db: AsyncSession = Depends(get_db_session),
+):
+    result = await autocomplete(db, prefix=q, limit=limit)
     return result
 
 
@@ -51,6 +112,51 @@ async def create_product(
     return result
 
 
+@router.post("/import", response_model=ProductImportReport)
+async def import_products_from_file(
+    request: Request,
+    format: ProductImportFormat = ProductImportFormat.CSV,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Bulk import from a streamed CSV (with header) or NDJSON request body.
+    Existing products are matched by (restaurant_id, category_id, name) and
+    updated.
+    """
+    try:
+        result = await import_products(
+            db,
+            request.stream(),
+            file_format=format,
+            chunk_size=settings.PRODUCT_IMPORT_CHUNK_SIZE,
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    return result
+
+
+@router.patch("/bulk", response_model=ProductBulkUpdateResult)
+async def bulk_update_products(
+    bulk_update: ProductBulkUpdate, db: AsyncSession = Depends(get_db_session)
+):
+    updated = await ProductCRUD.bulk_update(db=db, items=bulk_update.items)
+    return ProductBulkUpdateResult(updated=updated)
+
+
+@router.patch(
+    "/category/{category_id:int}/availability", response_model=ProductBulkUpdateResult
+)
+async def set_category_availability(
+    category_id: int,
+    availability: CategoryAvailabilityUpdate,
+    db: AsyncSession = Depends(get_db_session),
+):
+    updated = await ProductCRUD.set_category_availability(
+        db=db, category_id=category_id, is_available=availability.is_available
+    )
+    return ProductBulkUpdateResult(updated=updated)
+
+
 @router.put("/{id:int}", response_model=ProductResponse)
 async def update_product(
     product_id: int, product: ProductUpdate, db: AsyncSession = Depends(get_db_session)
@@ -0,0 +1,43 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_db_session
+from app.crud.report import ReportCRUD
+from app.models.order import OrderStatus
+from app.schemas.report import OrderDailyRollupResponse, ProductDailyRollupResponse
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+@router.get("/orders/daily", response_model=List[OrderDailyRollupResponse])
+async def get_daily_order_report(
+    date_from: date,
+    date_to: date,
+    status: Optional[OrderStatus] = None,
+    db: AsyncSession = Depends(get_db_session),
+):
+    result = await ReportCRUD.get_order_rollups(
+        db=db, date_from=date_from, date_to=date_to, status=status
+    )
+    return result
+
+
+@router.get("/products/daily", response_model=List[ProductDailyRollupResponse])
+async def get_daily_product_report(
+    date_from: date,
+    date_to: date,
+    product_id: Optional[int] = None,
+    status: Optional[OrderStatus] = None,
+    db: AsyncSession = Depends(get_db_session),
+):
+    result = await ReportCRUD.get_product_rollups(
+        db=db,
+        date_from=date_from,
+        date_to=date_to,
+        product_id=product_id,
+        status=status,
+    )
+    return result
@@ -1,21 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 
 from app.core.dependencies import get_db_session
+from app.crud.opening_hours import OpeningHoursCRUD
 from app.crud.restaurant import RestaurantCRUD
+from app.crud.user import UserAddressCRUD
 from app.schemas.restaurant import (
     RestaurantCreate,
     RestaurantUpdate,
     RestaurantResponse,
+    RestaurantMenuResponse,
+    RestaurantNearbyResponse,
+    RestaurantPage,
 )
+from app.schemas.opening_hours import (
+    OpeningHoursUpdate,
+    OpeningHoursResponse,
+    HoursExceptionCreate,
+    HoursExceptionResponse,
+)
+from app.services.menu_snapshot import menu_snapshots
 
 router = APIRouter(prefix="/restaurant", tags=["restaurant"])
 
 
-@router.get("/", response_model=List[RestaurantResponse])
-async def get_all_restaurants(db: AsyncSession = Depends(get_db_session)):
-    result = await RestaurantCRUD.get_all(db=db)
+@router.get("/", response_model=RestaurantPage)
+async def get_all_restaurants(
+    city: Optional[str] = Query(None, min_length=1),
+    country: Optional[str] = Query(None, min_length=1),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+):
+    try:
+        result = await RestaurantCRUD.get_all(
+            db=db, city=city, country=country, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@router.get("/open-now", response_model=RestaurantPage)
+async def get_open_restaurants(
+    city: str = Query(..., min_length=1),
+    country: Optional[str] = Query(None, min_length=1),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """Restaurants of the city open right now, by their opening hours"""
+    try:
+        result = await RestaurantCRUD.get_open_now(
+            db=db, city=city, country=country, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@router.get("/nearby", response_model=List[RestaurantNearbyResponse])
+async def get_nearby_restaurants(
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    user_address_id: Optional[int] = None,
+    radius_km: float = Query(5, gt=0, le=50),
+    limit: int = Query(20, ge=1, le=100),
+    nearest: bool = False,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Restaurants around a point or a saved user address, nearest first.
+    nearest=true returns the {limit} nearest restaurants within {radius_km},
+    otherwise all restaurants within {radius_km} up to {limit}.
+    """
+    if user_address_id is not None:
+        address = await UserAddressCRUD.get_by_id(
+            db=db, user_address_id=user_address_id
+        )
+        if address is None:
+            raise HTTPException(status_code=404, detail="Address not found")
+        latitude, longitude = address.latitude, address.longitude
+        if latitude is None or longitude is None:
+            raise HTTPException(status_code=400, detail="Address is not geocoded")
+    elif latitude is None or longitude is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Pass latitude and longitude or user_address_id",
+        )
+
+    result = await RestaurantCRUD.get_nearby(
+        db=db,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        limit=limit,
+        nearest=nearest,
+    )
     return result
 
 
@@ -27,11 +109,92 @@ async def get_restaurant_by_id(
     return result
 
 
-@router.get("/by-name/{name}", response_model=List[RestaurantResponse])
+@router.get(
+    "/{restaurant_id:int}/menu",
+    response_model=RestaurantMenuResponse,
+    responses={404: {"description": "Restaurant not found"}},
+)
+async def get_restaurant_menu(restaurant_id: int, request: Request):
+    """
+    Menu of the restaurant (categories with products) served from a
+    pre-serialized snapshot
+    """
+    compressed = "gzip" in request.headers.get("accept-encoding", "")
+    body = await menu_snapshots.get(restaurant_id, compressed=compressed)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+
+    headers = {"Vary": "Accept-Encoding"}
+    if compressed:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{restaurant_id:int}/hours", response_model=OpeningHoursResponse)
+async def get_opening_hours(
+    restaurant_id: int, db: AsyncSession = Depends(get_db_session)
+):
+    restaurant = await OpeningHoursCRUD.get(db=db, restaurant_id=restaurant_id)
+    if restaurant is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    return OpeningHoursResponse.from_orm(restaurant)
+
+
+@router.put("/{restaurant_id:int}/hours", response_model=OpeningHoursResponse)
+async def set_opening_hours(
+    restaurant_id: int,
+    hours_update: OpeningHoursUpdate,
+    db: AsyncSession = Depends(get_db_session),
+):
+    restaurant = await OpeningHoursCRUD.set_weekly(
+        db=db, restaurant_id=restaurant_id, hours_update=hours_update
+    )
+    if restaurant is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    return OpeningHoursResponse.from_orm(restaurant)
+
+
+@router.post(
+    "/{restaurant_id:int}/hours/exceptions", response_model=HoursExceptionResponse
+)
+async def add_hours_exception(
+    restaurant_id: int,
+    exception_create: HoursExceptionCreate,
+    db: AsyncSession = Depends(get_db_session),
+):
+    exception = await OpeningHoursCRUD.add_exception(
+        db=db, restaurant_id=restaurant_id, exception_create=exception_create
+    )
+    if exception is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    return HoursExceptionResponse.from_orm(exception)
+
+
+@router.delete("/{restaurant_id:int}/hours/exceptions/{exception_id:int}")
+async def delete_hours_exception(
+    restaurant_id: int, exception_id: int, db: AsyncSession = Depends(get_db_session)
+):
+    deleted = await OpeningHoursCRUD.delete_exception(
+        db=db, restaurant_id=restaurant_id, exception_id=exception_id
+    )
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Exception not found")
+    return {"deleted": exception_id}
+
+
+@router.get("/by-name/{name}", response_model=RestaurantPage)
 async def get_restaurant_by_name(
-    restaurant_name: str, db: AsyncSession = Depends(get_db_session)
+    restaurant_name: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
 ):
-    result = await RestaurantCRUD.get_by_name(db=db, restaurant_name=restaurant_name)
+    try:
+        result = await RestaurantCRUD.get_by_name(
+            db=db, restaurant_name=restaurant_name, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return result
 
 
@@ -0,0 +1,121 @@
+"""
+Command line tools
+
+    python -m app.cli import-products menu.csv
+    python -m app.cli import-products menu.ndjson --format ndjson
+    python -m app.cli geocode-addresses --batch-size 100
+"""
+
+import argparse
+import asyncio
+import os
+
+# app.core.config changes the working directory on import,
+# so user supplied paths are resolved before the app is imported
+LAUNCH_DIR = os.getcwd()
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_file(path: str):
+    with open(path, "rb") as file:
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+async def import_products_command(path: str, file_format: str):
+    from app.core.config import settings
+    from app.core.database import db_manager, redis_manager
+    from app.schemas.product import ProductImportFormat
+    from app.services.menu_snapshot import menu_snapshots
+    from app.services.product_import import import_products
+
+    db_manager.init_db(settings.DATABASE_URL)
+    # the import invalidates the catalog caches kept in Redis
+    await redis_manager.init_redis(settings.REDIS_URL)
+    try:
+        async with db_manager.get_session() as session:
+            report = await import_products(
+                session,
+                _read_file(path),
+                file_format=ProductImportFormat(file_format),
+                chunk_size=settings.PRODUCT_IMPORT_CHUNK_SIZE,
+            )
+        await menu_snapshots.wait()
+    finally:
+        await redis_manager.close()
+        await db_manager.close()
+
+    print(report.model_dump_json(indent=2))
+
+
+async def geocode_addresses_command(batch_size: int, delay_seconds: float):
+    from app.core.config import settings
+    from app.core.database import db_manager, redis_manager
+    from app.models.restaurant import Restaurant
+    from app.models.user import UserAddress
+    from app.services.geocoding import backfill_coordinates
+    from app.services.restaurant_geo import restaurant_geo_index
+    from app.services.restaurant_list import invalidate_restaurant_list
+
+    if settings.GEOCODER == "none":
+        raise SystemExit("No geocoder configured, set GEOCODER")
+
+    db_manager.init_db(settings.DATABASE_URL)
+    # the restaurant grid and cached pages carry the coordinates
+    await redis_manager.init_redis(settings.REDIS_URL)
+    try:
+        for model in (Restaurant, UserAddress):
+            report = await backfill_coordinates(model, batch_size, delay_seconds)
+            if model is Restaurant and report.geocoded:
+                await restaurant_geo_index.invalidate()
+                await invalidate_restaurant_list(report.locations)
+            print(
+                f"{model.__tablename__}: {report.geocoded} geocoded, "
+                f"{report.unresolved} unresolved"
+            )
+    finally:
+        await redis_manager.close()
+        await db_manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-products", help="Bulk import products from CSV or NDJSON"
+    )
+    import_parser.add_argument("path")
+    import_parser.add_argument(
+        "--format",
+        choices=["csv", "ndjson"],
+        default=None,
+        help="default: guessed from the file extension",
+    )
+
+    geocode_parser = commands.add_parser(
+        "geocode-addresses",
+        help="Geocode restaurants and user addresses without coordinates",
+    )
+    geocode_parser.add_argument("--batch-size", type=int, default=100)
+    geocode_parser.add_argument(
+        "--delay",
+        type=float,
+        default=1.0,
+        help="seconds between geocoder requests (Nominatim allows 1 per second)",
+    )
+
+    args = parser.parse_args()
+    if args.command == "import-products":
+        path = os.path.join(LAUNCH_DIR, args.path)
+        file_format = args.format or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        asyncio.run(import_products_command(path, file_format))
+    elif args.command == "geocode-addresses":
+        asyncio.run(geocode_addresses_command(args.batch_size, args.delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,114 @@ class Settings(BaseSettings):
     REDIS_PORT: int
     REDIS_PASS: str
 
+    ORDER_ARCHIVE_AFTER_MONTHS: int = 6
+    ORDER_ARCHIVE_BATCH_SIZE: int = 1000
+    ORDER_ARCHIVE_INTERVAL_SECONDS: int = 3600
+    ORDER_ARCHIVE_PARTITIONS_AHEAD: int = 3
+
+    ORDER_ROLLUP_BATCH_DAYS: int = 31
+    ORDER_ROLLUP_INTERVAL_SECONDS: int = 30
+
+    OUTBOX_STREAM: str = "orders:events"
+    OUTBOX_STREAM_MAXLEN: int = 100_000
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 0.5
+
+    AUTOCOMPLETE_TRIE_DEPTH: int = 3
+    AUTOCOMPLETE_SIZE: int = 10
+    AUTOCOMPLETE_HOT_THRESHOLD: int = 3
+    AUTOCOMPLETE_MAX_HOT_PREFIXES: int = 50_000
+    AUTOCOMPLETE_MAX_AGE_SECONDS: int = 300
+    AUTOCOMPLETE_REFRESH_INTERVAL_SECONDS: int = 5
+
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 1000
+
+    MENU_SNAPSHOT_TTL_SECONDS: int = 24 * 3600
+
+    CATEGORY_LIST_TTL_SECONDS: int = 3600
+
+    # tmpfs, so the snapshot never hits the disk
+    CATALOG_SNAPSHOT_DIR: str = "/dev/shm"
+    CATALOG_SNAPSHOT_REFRESH_SECONDS: float = 1
+
+    # "none" | "nominatim" | "stub" (made up coordinates, development only)
+    GEOCODER: str = "none"
+    GEOCODER_URL: str = "https://nominatim.openstreetmap.org/search"
+    GEOCODER_USER_AGENT: str = "food-delivery-api"
+    GEOCODER_TIMEOUT_SECONDS: float = 5
+
+    RESTAURANT_GEO_MAX_AGE_SECONDS: int = 300
+    RESTAURANT_GEO_REFRESH_INTERVAL_SECONDS: int = 5
+
+    RESTAURANT_LIST_TTL_SECONDS: int = 600
+
+    OPEN_SLOT_BUCKET_MINUTES: int = 60
+    OPEN_SLOT_HORIZON_HOURS: int = 48
+    OPEN_SLOT_BATCH_SIZE: int = 200
+    OPEN_SLOT_REFRESH_INTERVAL_SECONDS: int = 300
+
+    DELIVERY_ZONE_MAX_AGE_SECONDS: int = 300
+    DELIVERY_ZONE_REFRESH_INTERVAL_SECONDS: int = 5
+
+    COURIER_POSITION_MAX_AGE_SECONDS: int = 60
+    DISPATCH_BATCH_SIZE: int = 1000
+    DISPATCH_INTERVAL_SECONDS: float = 2
+    DISPATCH_WORKERS: int = 2
+    # orders a courier carries at once
+    DISPATCH_COURIER_CAPACITY: int = 3
+    DISPATCH_MAX_DISTANCE_KM: float = 10
+    # one carried order costs as much as this many km of pickup distance
+    DISPATCH_LOAD_PENALTY_KM: float = 2
+    DISPATCH_CANDIDATES: int = 8
+    # orders one courier picks up together
+    ROUTE_BATCH_PICKUP_RADIUS_KM: float = 1
+    ROUTE_BATCH_DROPOFF_SPREAD_KM: float = 3
+    ROUTE_BATCH_WINDOW_MINUTES: float = 10
+
+    ETA_INTERVAL_SECONDS: float = 15
+    ETA_TTL_SECONDS: int = 120
+    # a change this large is pushed to WebSocket clients
+    ETA_PUSH_THRESHOLD_SECONDS: int = 60
+    ETA_HISTORY_DAYS: int = 14
+    ETA_HISTORY_REFRESH_SECONDS: int = 600
+    ETA_MIN_SAMPLES: int = 20
+    ETA_FIT_SAMPLE_SIZE: int = 5000
+    # used until there is enough history
+    ETA_DEFAULT_PREP_MINUTES: float = 20
+    ETA_DEFAULT_SPEED_KMH: float = 18
+    ETA_DEFAULT_HANDOFF_MINUTES: float = 3
+    # orders without a delivery point
+    ETA_DEFAULT_DISTANCE_KM: float = 3
+    ETA_QUEUED_ORDER_MINUTES: float = 2
+
+    SURGE_INTERVAL_SECONDS: float = 30
+    SURGE_TTL_SECONDS: int = 300
+    # ~4.9 x 4.9 km cells
+    SURGE_CELL_PRECISION: int = 5
+    # closed orders created this recently still count as demand
+    SURGE_RECENT_MINUTES: int = 15
+    SURGE_BASE_DELIVERY_FEE: float = 2.99
+    # orders per active courier in a cell before fees go up
+    SURGE_DEMAND_PER_COURIER: float = 2
+    SURGE_STEP: float = 0.25
+    SURGE_MAX_MULTIPLIER: float = 2.5
+
+    KITCHEN_STREAM_MAXLEN: int = 1000
+    KITCHEN_READ_COUNT: int = 50
+    # longest a kitchen display read waits for new orders
+    KITCHEN_BLOCK_MS: int = 5000
+    # kitchen displays waiting on a read at once, per process
+    KITCHEN_MAX_WAITERS: int = 64
+
+    COURIER_LOCATION_FLUSH_INTERVAL_SECONDS: float = 0.5
+    # a flush this large runs the next one right away
+    COURIER_LOCATION_FLUSH_BATCH_SIZE: int = 20000
+    # buffered history pings, beyond that only positions are kept
+    COURIER_LOCATION_MAX_BUFFER: int = 200000
+    COURIER_LOCATION_RETENTION_DAYS: int = 30
+    COURIER_LOCATION_PRUNE_BATCH_SIZE: int = 10000
+    COURIER_LOCATION_PRUNE_INTERVAL_SECONDS: int = 3600
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
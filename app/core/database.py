@@ -126,6 +126,8 @@ class RedisManager(SingletonMeta):
     def __init__(self):
         if not RedisManager._initialized:
             self.redis = None
+            # bytes in / bytes out, for pre-serialized payloads
+            self.redis_raw = None
             self._database_url = None
             RedisManager._initialized = True
 
@@ -139,10 +141,12 @@ class RedisManager(SingletonMeta):
                 database_url, decode_responses=True, encoding="utf-8"
             )
             self.redis.ping()
+            self.redis_raw = redis.from_url(database_url)
             self._database_url = database_url
             print(f"Redis initialized: {database_url}")
         except Exception as e:
             self.redis = None
+            self.redis_raw = None
             raise RuntimeError(f"Redis initialization failed: {e}")
 
     async def set(self, key: str, value: str, expire: Optional[int] = None):
@@ -162,8 +166,11 @@ class RedisManager(SingletonMeta):
 
     async def close(self):
         """Close Redis connection"""
+        if self.redis_raw:
+            self.redis_raw.close()
+            self.redis_raw = None
         if self.redis:
-            await self.redis.close()
+            self.redis.close()
             self.redis = None
             self._database_url = None
             print("RedisManager closed")
@@ -179,5 +186,16 @@ class RedisManager(SingletonMeta):
         finally:
             pass
 
+    @asynccontextmanager
+    async def get_raw_client(self) -> AsyncGenerator[redis.Redis, None]:
+        """Context manager for Redis client without response decoding"""
+        if not self.redis_raw:
+            raise RuntimeError("Redis not initialized! Call init_redis() first")
+
+        try:
+            yield self.redis_raw
+        finally:
+            pass
+
 
 redis_manager = RedisManager()
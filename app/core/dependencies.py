@@ -1,9 +1,15 @@
 from typing import AsyncGenerator
 
 import redis
+from fastapi import HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import db_manager, redis_manager
+from app.services.catalog_version import (
+    catalog_etag,
+    etag_matches,
+    get_catalog_version,
+)
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -14,3 +20,23 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 async def get_redis() -> AsyncGenerator[redis.Redis, None]:
     async with redis_manager.get_client() as redis_client:
         yield redis_client
+
+
+async def get_redis_raw() -> AsyncGenerator[redis.Redis, None]:
+    async with redis_manager.get_raw_client() as redis_client:
+        yield redis_client
+
+
+async def check_catalog_etag(request: Request, response: Response) -> int:
+    """
+    ETag of the current catalog version; answers a matching If-None-Match
+    with 304 before the endpoint runs any query
+    """
+    version = await get_catalog_version()
+    etag = catalog_etag(version)
+
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return version
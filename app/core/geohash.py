@@ -0,0 +1,75 @@
+"""
+Geohash encoding and cell geometry
+
+A geohash of {precision} characters interleaves 5 * precision bits,
+longitude first, and names a lat/lon rectangle; every prefix of it names
+the enclosing cell of a coarser precision.
+"""
+
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(BASE32)}
+
+# (south, west, north, east)
+Box = Tuple[float, float, float, float]
+
+
+def _bits(precision: int) -> Tuple[int, int]:
+    """(latitude bits, longitude bits)"""
+    total = 5 * precision
+    return total // 2, total - total // 2
+
+
+def grid_shape(precision: int) -> Tuple[int, int]:
+    """(rows, columns) of the {precision} grid, for binning outside encode"""
+    lat_bits, lon_bits = _bits(precision)
+    return 1 << lat_bits, 1 << lon_bits
+
+
+def encode(latitude: float, longitude: float, precision: int) -> str:
+    lat_bits, lon_bits = _bits(precision)
+    row = min(int((latitude + 90) / 180 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    column = min(int((longitude + 180) / 360 * (1 << lon_bits)), (1 << lon_bits) - 1)
+    return encode_cell(max(row, 0), max(column, 0), precision)
+
+
+def encode_cell(row: int, column: int, precision: int) -> str:
+    """Geohash of the cell at integer (row, column) of the {precision} grid"""
+    lat_bits, lon_bits = _bits(precision)
+    value = 0
+    for bit in range(5 * precision):
+        # even bits (from the most significant) are longitude
+        if bit % 2 == 0:
+            lon_bits -= 1
+            value = (value << 1) | ((column >> lon_bits) & 1)
+        else:
+            lat_bits -= 1
+            value = (value << 1) | ((row >> lat_bits) & 1)
+
+    chars = []
+    for _ in range(precision):
+        chars.append(BASE32[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode_box(geohash: str) -> Box:
+    south, west, north, east = -90.0, -180.0, 90.0, 180.0
+    is_longitude = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if is_longitude:
+                middle = (west + east) / 2
+                west, east = (middle, east) if bit else (west, middle)
+            else:
+                middle = (south + north) / 2
+                south, north = (middle, north) if bit else (south, middle)
+            is_longitude = not is_longitude
+    return south, west, north, east
+
+
+def children(geohash: str) -> List[str]:
+    return [geohash + char for char in BASE32]
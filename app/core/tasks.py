@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from app.core.database import SingletonMeta
+
+# A periodic job may return True to say "there is more work, run me again
+# right away" (e.g. a full batch was processed), anything else means sleep.
+PeriodicJob = Callable[[], Awaitable[Optional[bool]]]
+
+
+class TaskManager(SingletonMeta):
+    _initialized = False
+
+    def __init__(self):
+        if not TaskManager._initialized:
+            self._tasks: dict[str, asyncio.Task] = {}
+            TaskManager._initialized = True
+
+    def start_periodic(self, name: str, job: PeriodicJob, interval: float):
+        """Run job every {interval} seconds until close() is called"""
+        if name in self._tasks:
+            print(f"Task {name} already running")
+            return
+
+        self._tasks[name] = asyncio.create_task(self._run(name, job, interval))
+        print(f"Task {name} started (every {interval}s)")
+
+    @staticmethod
+    async def _run(name: str, job: PeriodicJob, interval: float):
+        while True:
+            try:
+                has_more = await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Task {name} failed: {e}")
+                has_more = False
+
+            if not has_more:
+                await asyncio.sleep(interval)
+
+    async def close(self):
+        """Cancel all running tasks"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        print("TaskManager closed")
+
+
+task_manager = TaskManager()
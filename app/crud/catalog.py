@@ -0,0 +1,85 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog import CatalogTombstone, PRODUCT_ENTITY, CATEGORY_ENTITY
+from app.models.product import Product, Category
+from app.schemas.catalog import CatalogChanges
+from app.schemas.product import ProductResponse, CategoryResponse
+from app.services.catalog_version import LAST_VERSION_SQL
+
+
+class CatalogCRUD:
+
+    @staticmethod
+    async def get_changes(db: AsyncSession, since: int, limit: int) -> CatalogChanges:
+        """
+        Products and categories added, changed or deleted after version {since}
+
+        Args:
+            db: Database AsyncSession
+            since: Version the client is synced to, 0 for everything
+            limit: Max product changes (updates + deletions) per page,
+                category changes are always returned in full
+
+        Returns:
+            CatalogChanges: Changes and the version to continue from
+        """
+        current = (await db.execute(LAST_VERSION_SQL)).scalar_one()
+
+        result = await db.execute(
+            select(Product)
+            .filter(Product.version > since, Product.version <= current)
+            .order_by(Product.version)
+            .limit(limit + 1)
+        )
+        products = result.scalars().all()
+        result = await db.execute(
+            select(CatalogTombstone)
+            .filter(CatalogTombstone.entity == PRODUCT_ENTITY)
+            .filter(CatalogTombstone.version > since)
+            .filter(CatalogTombstone.version <= current)
+            .order_by(CatalogTombstone.version)
+            .limit(limit + 1)
+        )
+        tombstones = result.scalars().all()
+
+        # one page in version order across updates and deletions
+        changes = sorted([*products, *tombstones], key=lambda change: change.version)
+        has_more = len(changes) > limit
+        if has_more:
+            changes = changes[:limit]
+            version = changes[-1].version
+        else:
+            version = current
+
+        result = await db.execute(
+            select(Category)
+            .filter(Category.version > since, Category.version <= version)
+            .order_by(Category.version)
+        )
+        categories = result.scalars().all()
+        result = await db.execute(
+            select(CatalogTombstone.entity_id)
+            .filter(CatalogTombstone.entity == CATEGORY_ENTITY)
+            .filter(CatalogTombstone.version > since)
+            .filter(CatalogTombstone.version <= version)
+            .order_by(CatalogTombstone.version)
+        )
+        deleted_category_ids = result.scalars().all()
+
+        return CatalogChanges(
+            version=version,
+            has_more=has_more,
+            products=[
+                ProductResponse.from_orm(change)
+                for change in changes
+                if isinstance(change, Product)
+            ],
+            deleted_product_ids=[
+                change.entity_id
+                for change in changes
+                if isinstance(change, CatalogTombstone)
+            ],
+            categories=[CategoryResponse.from_orm(category) for category in categories],
+            deleted_category_ids=deleted_category_ids,
+        )
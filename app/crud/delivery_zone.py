@@ -0,0 +1,144 @@
+import asyncio
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.delivery_zone import DeliveryZone
+from app.schemas.delivery_zone import (
+    DeliveryZoneCreate,
+    DeliveryZoneUpdate,
+    DeliveryZoneResponse,
+    DeliveryZoneMatch,
+)
+from app.services.delivery_zones import cover, delivery_zone_index
+
+
+class DeliveryZoneCRUD:
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, zone_id: int) -> Optional[DeliveryZone]:
+        result = await db.execute(
+            select(DeliveryZone).filter(DeliveryZone.id == zone_id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_by_restaurant_id(
+        db: AsyncSession, restaurant_id: int
+    ) -> List[DeliveryZoneResponse]:
+        result = await db.execute(
+            select(DeliveryZone)
+            .filter(DeliveryZone.restaurant_id == restaurant_id)
+            .order_by(DeliveryZone.id)
+        )
+        zones = result.scalars().all()
+        return [DeliveryZoneResponse.from_orm(zone) for zone in zones]
+
+    @staticmethod
+    async def get_serving(latitude: float, longitude: float) -> List[DeliveryZoneMatch]:
+        """
+        Zones containing a point, from the in-memory index
+
+        Args:
+            latitude, longitude: Delivery point
+
+        Returns:
+            List[DeliveryZoneMatch]: Matching zones and their restaurants
+        """
+        matches = await delivery_zone_index.lookup(latitude, longitude)
+        return [
+            DeliveryZoneMatch(zone_id=match.zone_id, restaurant_id=match.restaurant_id)
+            for match in sorted(matches)
+        ]
+
+    @staticmethod
+    async def create(db: AsyncSession, zone_create: DeliveryZoneCreate) -> DeliveryZone:
+        """
+        Create new delivery zone, its geohash cover is computed here
+
+        Args:
+            db: Database AsyncSession
+            zone_create: Delivery zone creation schema
+
+        Returns:
+            DeliveryZone: Created zone
+
+        Raises:
+            ValueError: If the polygon is too large to cover
+        """
+        interior, boundary = await asyncio.to_thread(cover, zone_create.polygon)
+        db_zone = DeliveryZone(
+            restaurant_id=zone_create.restaurant_id,
+            name=zone_create.name,
+            polygon=zone_create.polygon,
+            interior_cells=interior,
+            boundary_cells=boundary,
+        )
+
+        db.add(db_zone)
+        await db.commit()
+        await delivery_zone_index.invalidate()
+        await db.refresh(db_zone)
+
+        return db_zone
+
+    @staticmethod
+    async def update(
+        db: AsyncSession, zone_id: int, zone_update: DeliveryZoneUpdate
+    ) -> Optional[DeliveryZone]:
+        """
+        Update delivery zone
+
+        Args:
+            db: Database AsyncSession
+            zone_id: Delivery zone ID
+            zone_update: Data for update
+
+        Returns:
+            DeliveryZone: Updated zone or None if not found
+
+        Raises:
+            ValueError: If the polygon is too large to cover
+        """
+        db_zone = await DeliveryZoneCRUD.get_by_id(db, zone_id)
+        if not db_zone:
+            return None
+
+        update_data = zone_update.model_dump(exclude_unset=True, exclude_none=True)
+
+        for field, value in update_data.items():
+            setattr(db_zone, field, value)
+
+        if "polygon" in update_data:
+            interior, boundary = await asyncio.to_thread(cover, db_zone.polygon)
+            db_zone.interior_cells = interior
+            db_zone.boundary_cells = boundary
+
+        await db.commit()
+        await delivery_zone_index.invalidate()
+        await db.refresh(db_zone)
+
+        return db_zone
+
+    @staticmethod
+    async def delete(db: AsyncSession, zone_id: int) -> bool:
+        """
+        Delete delivery zone
+
+        Args:
+            db: Database AsyncSession
+            zone_id: Delivery zone ID
+
+        Returns:
+            bool: True if deleted, False if not found
+        """
+        db_zone = await DeliveryZoneCRUD.get_by_id(db, zone_id)
+        if not db_zone:
+            return False
+
+        await db.delete(db_zone)
+        await db.commit()
+        await delivery_zone_index.invalidate()
+
+        return True
@@ -0,0 +1,128 @@
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.opening_hours import RestaurantOpeningHours, RestaurantHoursException
+from app.models.restaurant import Restaurant
+from app.schemas.opening_hours import OpeningHoursUpdate, HoursExceptionCreate
+from app.services.opening_hours import recompute_open_slots
+
+
+class OpeningHoursCRUD:
+
+    @staticmethod
+    async def get(db: AsyncSession, restaurant_id: int) -> Optional[Restaurant]:
+        """Restaurant with opening_hours and hours_exceptions loaded"""
+        result = await db.execute(
+            select(Restaurant)
+            .options(
+                selectinload(Restaurant.opening_hours),
+                selectinload(Restaurant.hours_exceptions),
+            )
+            .filter(Restaurant.id == restaurant_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def set_weekly(
+        db: AsyncSession, restaurant_id: int, hours_update: OpeningHoursUpdate
+    ) -> Optional[Restaurant]:
+        """
+        Replace the weekly schedule (and the time zone, if given)
+
+        Args:
+            db: Database AsyncSession
+            restaurant_id: Restaurant ID
+            hours_update: New weekly intervals
+
+        Returns:
+            Restaurant: Restaurant with its schedule or None if not found
+        """
+        db_restaurant = await OpeningHoursCRUD.get(db, restaurant_id)
+        if not db_restaurant:
+            return None
+
+        if hours_update.timezone is not None:
+            db_restaurant.timezone = hours_update.timezone
+        await db.execute(
+            delete(RestaurantOpeningHours).where(
+                RestaurantOpeningHours.restaurant_id == restaurant_id
+            )
+        )
+        db.add_all(
+            RestaurantOpeningHours(
+                restaurant_id=restaurant_id,
+                weekday=interval.weekday,
+                opens_at=interval.opens_at,
+                closes_at=interval.closes_at,
+            )
+            for interval in hours_update.weekly
+        )
+        await db.flush()
+        await recompute_open_slots(db, restaurant_id)
+        await db.commit()
+
+        return await OpeningHoursCRUD.get(db, restaurant_id)
+
+    @staticmethod
+    async def add_exception(
+        db: AsyncSession, restaurant_id: int, exception_create: HoursExceptionCreate
+    ) -> Optional[RestaurantHoursException]:
+        """
+        Add special hours (or a closure) for a local date
+
+        Args:
+            db: Database AsyncSession
+            restaurant_id: Restaurant ID
+            exception_create: Date and interval
+
+        Returns:
+            RestaurantHoursException: Created exception or None if the
+                restaurant was not found
+        """
+        restaurant = await db.get(Restaurant, restaurant_id)
+        if not restaurant:
+            return None
+
+        db_exception = RestaurantHoursException(
+            restaurant_id=restaurant_id,
+            day=exception_create.day,
+            opens_at=exception_create.opens_at,
+            closes_at=exception_create.closes_at,
+            note=exception_create.note,
+        )
+        db.add(db_exception)
+        await db.flush()
+        await recompute_open_slots(db, restaurant_id)
+        await db.commit()
+        await db.refresh(db_exception)
+
+        return db_exception
+
+    @staticmethod
+    async def delete_exception(
+        db: AsyncSession, restaurant_id: int, exception_id: int
+    ) -> bool:
+        """
+        Delete an exception of the restaurant
+
+        Returns:
+            bool: True if deleted, False if not found
+        """
+        result = await db.execute(
+            delete(RestaurantHoursException)
+            .where(RestaurantHoursException.id == exception_id)
+            .where(RestaurantHoursException.restaurant_id == restaurant_id)
+            .returning(RestaurantHoursException.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await db.rollback()
+            return False
+
+        await recompute_open_slots(db, restaurant_id)
+        await db.commit()
+
+        return True
@@ -1,9 +1,21 @@
 from typing import Optional, List, Any, Coroutine, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, func, literal
+from sqlalchemy.orm import selectinload
 
 from app.models import Order
-from app.models.order import Order, OrderItem, OrderStatus
+from app.models.order import (
+    Order,
+    OrderItem,
+    OrderStatus,
+    OrderArchive,
+)
+from app.models.product import Product
+from app.crud.outbox import OutboxCRUD, OrderEventType
+from app.crud.report import ReportCRUD
+from app.services.delivery_zones import delivery_zone_index
+from app.services.order_archive import ARCHIVED_STATUSES
+from app.services.surge import get_delivery_fee
 from app.schemas.order import (
     OrderCreate,
     OrderUpdate,
@@ -17,26 +29,46 @@ from app.schemas.order import (
 class OrderCRUD:
 
     @staticmethod
-    async def get_by_id(db: AsyncSession, order_id: int) -> Optional[Order]:
-        result = await db.execute(select(Order).filter(Order.id == order_id))
-        return result.scalar_one_or_none()
+    async def get_by_id(
+        db: AsyncSession, order_id: int, include_archive: bool = True
+    ) -> Optional[Order | OrderArchive]:
+        result = await db.execute(
+            select(Order)
+            .options(selectinload(Order.items))
+            .filter(Order.id == order_id)
+        )
+        order = result.scalar_one_or_none()
+        if order is None and include_archive:
+            result = await db.execute(
+                select(OrderArchive)
+                .options(selectinload(OrderArchive.items))
+                .filter(OrderArchive.id == order_id)
+            )
+            order = result.scalar_one_or_none()
+        return order
 
     @staticmethod
     async def get_last_order_by_user_id(
         db: AsyncSession, user_id: int
-    ) -> Optional[Order]:
-        result = await db.execute(
-            select(Order)
-            .filter(Order.user_id == user_id)
-            .order_by(Order.created_at.desc())
-            .limit(1)
-        )
-        return result.scalar_one_or_none()
+    ) -> Optional[Order | OrderArchive]:
+        for model in (Order, OrderArchive):
+            result = await db.execute(
+                select(model)
+                .options(selectinload(model.items))
+                .filter(model.user_id == user_id)
+                .order_by(model.created_at.desc())
+                .limit(1)
+            )
+            order = result.scalar_one_or_none()
+            if order is not None:
+                return order
+        return None
 
     @staticmethod
     async def get_open_orders(db: AsyncSession, user_id: int) -> List[OrderResponse]:
         result = await db.execute(
             select(Order)
+            .options(selectinload(Order.items))
             .filter(Order.status != OrderStatus.COMPLETED)
             .filter(Order.status != OrderStatus.CANCELED)
             .filter(Order.user_id == user_id)
@@ -51,6 +83,7 @@ class OrderCRUD:
         """
         result = await db.execute(
             select(Order)
+            .options(selectinload(Order.items))
             .filter(Order.status != OrderStatus.COMPLETED)
             .filter(Order.status != OrderStatus.CANCELED)
         )
@@ -61,8 +94,14 @@ class OrderCRUD:
     async def get_by_status(
         db: AsyncSession, status: OrderStatus, user_id: int
     ) -> List[OrderResponse]:
-        result = await db.execute(select(Order).filter(Order.status == status))
-        orders = result.scalars().all()
+        result = await db.execute(
+            select(Order)
+            .options(selectinload(Order.items))
+            .filter(Order.status == status)
+        )
+        orders = list(result.scalars().all())
+        if status in ARCHIVED_STATUSES:
+            orders += await OrderCRUD._get_archived(db, OrderArchive.status == status)
         return [OrderResponse.from_orm(order) for order in orders]
 
     @staticmethod
@@ -72,7 +111,28 @@ class OrderCRUD:
         """
         Returns all {status} orders, without user_id
         """
-        result = await db.execute(select(Order).filter(Order.status == status))
+        result = await db.execute(
+            select(Order)
+            .options(selectinload(Order.items))
+            .filter(Order.status == status)
+        )
+        orders = list(result.scalars().all())
+        if status in ARCHIVED_STATUSES:
+            orders += await OrderCRUD._get_archived(db, OrderArchive.status == status)
+        return [OrderResponse.from_orm(order) for order in orders]
+
+    @staticmethod
+    async def get_by_courier_id(
+        db: AsyncSession, courier_id: int
+    ) -> List[OrderResponse]:
+        """Open orders assigned to the courier, oldest first"""
+        result = await db.execute(
+            select(Order)
+            .options(selectinload(Order.items))
+            .filter(Order.courier_id == courier_id)
+            .filter(Order.status.in_([OrderStatus.PROCESSING, OrderStatus.DELIVERY]))
+            .order_by(Order.created_at)
+        )
         orders = result.scalars().all()
         return [OrderResponse.from_orm(order) for order in orders]
 
@@ -80,10 +140,13 @@ class OrderCRUD:
     async def get_all(db: AsyncSession, user_id: int) -> List[OrderResponse]:
         result = await db.execute(
             select(Order)
+            .options(selectinload(Order.items))
             .filter(Order.user_id == user_id)
             .order_by(Order.created_at.desc())
         )
-        orders = result.scalars().all()
+        orders = list(result.scalars().all())
+        orders += await OrderCRUD._get_archived(db, OrderArchive.user_id == user_id)
+        orders.sort(key=lambda order: order.created_at, reverse=True)
         return [OrderResponse.from_orm(order) for order in orders]
 
     @staticmethod
@@ -91,10 +154,29 @@ class OrderCRUD:
         """
         Returns all orders, without user_id
         """
-        result = await db.execute(select(Order).order_by(Order.created_at.desc()))
-        orders = result.scalars().all()
+        result = await db.execute(
+            select(Order)
+            .options(selectinload(Order.items))
+            .order_by(Order.created_at.desc())
+        )
+        orders = list(result.scalars().all())
+        orders += await OrderCRUD._get_archived(db)
+        orders.sort(key=lambda order: order.created_at, reverse=True)
         return [OrderResponse.from_orm(order) for order in orders]
 
+    @staticmethod
+    async def _get_archived(db: AsyncSession, *filters) -> List[OrderArchive]:
+        """
+        Returns archived orders matching {filters}, newest first
+        """
+        result = await db.execute(
+            select(OrderArchive)
+            .options(selectinload(OrderArchive.items))
+            .filter(*filters)
+            .order_by(OrderArchive.created_at.desc())
+        )
+        return list(result.scalars().all())
+
     @staticmethod
     async def create(db: AsyncSession, order_create: OrderCreate) -> Order:
         """
@@ -106,27 +188,57 @@ class OrderCRUD:
 
         Returns:
             Order: Created order
+
+        Raises:
+            ValueError: If the delivery point is outside the restaurant's
+                delivery zones
         """
+        if (
+            order_create.restaurant_id is not None
+            and order_create.delivery_latitude is not None
+            and order_create.delivery_longitude is not None
+            and not await delivery_zone_index.serves(
+                order_create.restaurant_id,
+                order_create.delivery_latitude,
+                order_create.delivery_longitude,
+            )
+        ):
+            raise ValueError("The restaurant does not deliver to this address")
+
         total_amount = sum(item.price * item.quantity for item in order_create.items)
+        _, delivery_fee = await get_delivery_fee(
+            order_create.delivery_latitude, order_create.delivery_longitude
+        )
+        product_names = await OrderCRUD._get_product_names(
+            db, [item.product_id for item in order_create.items]
+        )
 
         db_order = Order(
             user_id=order_create.user_id,
             status=OrderStatus.NEW,
             total_amount=total_amount,
+            delivery_fee=delivery_fee,
             delivery_address=order_create.delivery_address,
+            delivery_latitude=order_create.delivery_latitude,
+            delivery_longitude=order_create.delivery_longitude,
+            restaurant_id=order_create.restaurant_id,
         )
 
         for item in order_create.items:
             order_item = OrderItem(
                 product_id=item.product_id,
+                product_name=product_names.get(item.product_id),
                 quantity=item.quantity,
                 price=item.price,
             )
             db_order.items.append(order_item)
 
         db.add(db_order)
+        await db.flush()
+        await ReportCRUD.mark_orders_dirty(db, [db_order.id])
+        await OutboxCRUD.add_order_events(db, OrderEventType.CREATED, [db_order.id])
         await db.commit()
-        await db.refresh(db_order)
+        await db.refresh(db_order, attribute_names=["items"])
 
         return db_order
 
@@ -145,33 +257,258 @@ class OrderCRUD:
         Returns:
             Order: Updated order or None if not found
         """
-        db_order = await OrderCRUD.get_by_id(db, order_id)
+        db_order = await OrderCRUD.get_by_id(db, order_id, include_archive=False)
         if not db_order:
             return None
 
         update_data = order_update.model_dump(exclude_unset=True)
 
         if "items" in update_data:
+            product_names = await OrderCRUD._get_product_names(
+                db, [item.product_id for item in order_update.items]
+            )
             db_order.items.clear()
-            for item in update_data["items"]:
+            for item in order_update.items:
                 db_order.items.append(
                     OrderItem(
                         product_id=item.product_id,
+                        product_name=product_names.get(item.product_id),
                         quantity=item.quantity,
                         price=item.price,
                     )
                 )
 
             db_order.total_amount = sum(
-                i.price * i.quantity for i in update_data["items"]
+                i.price * i.quantity for i in order_update.items
             )
             update_data.pop("items")
 
+        if "status" in update_data:
+            update_data["status"] = OrderStatus(update_data["status"].value)
+            if update_data["status"] != db_order.status:
+                if update_data["status"] == OrderStatus.DELIVERY:
+                    db_order.picked_up_at = func.now()
+                elif update_data["status"] == OrderStatus.COMPLETED:
+                    db_order.delivered_at = func.now()
+
+        for field, value in update_data.items():
+            setattr(db_order, field, value)
+
+        await db.flush()
+        await ReportCRUD.mark_orders_dirty(db, [db_order.id])
+        await OutboxCRUD.add_order_events(db, OrderEventType.UPDATED, [db_order.id])
         await db.commit()
-        await db.refresh(db_order)
+        # the timestamps were set to now() and are not loaded
+        await db.refresh(
+            db_order, attribute_names=["items", "picked_up_at", "delivered_at"]
+        )
 
         return db_order
 
+    @staticmethod
+    async def accept(db: AsyncSession, order_id: int, restaurant_id: int) -> bool:
+        """
+        The kitchen accepted the order: NEW -> PROCESSING, in one conditional
+        UPDATE so concurrent displays accept it once
+
+        Args:
+            db: Database AsyncSession
+            order_id: Order ID
+            restaurant_id: Restaurant of the accepting kitchen
+
+        Returns:
+            bool: True if accepted, False if it is not a NEW order of the
+                restaurant
+        """
+        result = await db.execute(
+            update(Order)
+            .where(Order.id == order_id)
+            .where(Order.restaurant_id == restaurant_id)
+            .where(Order.status == OrderStatus.NEW)
+            .values(status=OrderStatus.PROCESSING)
+            .returning(Order.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await db.rollback()
+            return False
+
+        await ReportCRUD.mark_orders_dirty(db, [order_id])
+        await OutboxCRUD.add_order_events(db, OrderEventType.UPDATED, [order_id])
+        await db.commit()
+        return True
+
+    @staticmethod
+    async def reorder(db: AsyncSession, order_id: int) -> Optional[Order]:
+        """
+        Clone an order and its items with current prices
+
+        Args:
+            db: Database AsyncSession
+            order_id: ID of the order to repeat
+
+        Returns:
+            Order: New order or None if the source order does not exist
+            or none of its products are available anymore
+
+        Raises:
+            ValueError: If the restaurant no longer delivers to the order's
+                delivery point
+        """
+        return await OrderCRUD._reorder(db, literal(order_id))
+
+    @staticmethod
+    async def reorder_last(db: AsyncSession, user_id: int) -> Optional[Order]:
+        """
+        Clone the last order of the user with current prices
+
+        Args:
+            db: Database AsyncSession
+            user_id: User ID
+
+        Returns:
+            Order: New order or None if the user has nothing to repeat
+
+        Raises:
+            ValueError: If the restaurant no longer delivers to the order's
+                delivery point
+        """
+        last_order_id = (
+            select(Order.id)
+            .filter(Order.user_id == user_id)
+            .order_by(Order.created_at.desc())
+            .limit(1)
+            # never correlated to the orders of the statements it is used in
+            .correlate(None)
+            .scalar_subquery()
+        )
+        return await OrderCRUD._reorder(db, last_order_id)
+
+    @staticmethod
+    async def _reorder(db: AsyncSession, source_order_id) -> Optional[Order]:
+        """
+        Copies the source order and its still available items in a single
+        INSERT ... SELECT statement (the new order is a data-modifying CTE),
+        so prices and availability are read from `products` at write time.
+        The restaurant and delivery point are copied, the delivery zone is
+        checked again and the delivery fee is the current one for the point.
+
+        Raises:
+            ValueError: If the restaurant no longer delivers to the point
+        """
+        result = await db.execute(
+            select(
+                Order.restaurant_id, Order.delivery_latitude, Order.delivery_longitude
+            ).filter(Order.id == source_order_id)
+        )
+        source = result.first()
+        if source is None:
+            return None
+
+        restaurant_id, latitude, longitude = source
+        if (
+            restaurant_id is not None
+            and latitude is not None
+            and longitude is not None
+            and not await delivery_zone_index.serves(restaurant_id, latitude, longitude)
+        ):
+            raise ValueError("The restaurant does not deliver to this address")
+        _, delivery_fee = await get_delivery_fee(latitude, longitude)
+
+        source_items = (
+            select(
+                OrderItem.product_id,
+                OrderItem.quantity,
+                Product.price,
+                Product.name.label("product_name"),
+            )
+            .join(Product, Product.id == OrderItem.product_id)
+            .filter(OrderItem.order_id == source_order_id)
+            .filter(Product.is_available.is_(True))
+        )
+        total_amount = (
+            select(func.sum(Product.price * OrderItem.quantity))
+            .join(Product, Product.id == OrderItem.product_id)
+            .filter(OrderItem.order_id == source_order_id)
+            .filter(Product.is_available.is_(True))
+            .scalar_subquery()
+        )
+
+        new_order = (
+            insert(Order)
+            .from_select(
+                [
+                    "user_id",
+                    "status",
+                    "total_amount",
+                    "delivery_fee",
+                    "delivery_address",
+                    "delivery_latitude",
+                    "delivery_longitude",
+                    "restaurant_id",
+                ],
+                select(
+                    Order.user_id,
+                    literal(OrderStatus.NEW, Order.__table__.c.status.type),
+                    total_amount,
+                    literal(delivery_fee),
+                    Order.delivery_address,
+                    Order.delivery_latitude,
+                    Order.delivery_longitude,
+                    Order.restaurant_id,
+                )
+                .filter(Order.id == source_order_id)
+                .filter(source_items.exists()),
+            )
+            .returning(Order.id)
+            .cte("new_order")
+        )
+        source_items = source_items.subquery()
+
+        stmt = (
+            insert(OrderItem)
+            .from_select(
+                ["order_id", "product_id", "quantity", "price", "product_name"],
+                select(
+                    new_order.c.id,
+                    source_items.c.product_id,
+                    source_items.c.quantity,
+                    source_items.c.price,
+                    source_items.c.product_name,
+                ),
+            )
+            .add_cte(new_order)
+            .returning(OrderItem.order_id)
+        )
+
+        result = await db.execute(stmt)
+        new_order_id = result.scalars().first()
+        if new_order_id is None:
+            await db.rollback()
+            return None
+
+        await ReportCRUD.mark_orders_dirty(db, [new_order_id])
+        await OutboxCRUD.add_order_events(db, OrderEventType.CREATED, [new_order_id])
+        await db.commit()
+
+        result = await db.execute(
+            select(Order)
+            .options(selectinload(Order.items))
+            .filter(Order.id == new_order_id)
+        )
+        return result.scalar_one()
+
+    @staticmethod
+    async def _get_product_names(
+        db: AsyncSession, product_ids: List[int]
+    ) -> dict[int, str]:
+        """
+        Returns {product_id: name} for the snapshot stored on order items
+        """
+        result = await db.execute(
+            select(Product.id, Product.name).filter(Product.id.in_(set(product_ids)))
+        )
+        return {product_id: name for product_id, name in result.all()}
+
     @staticmethod
     async def delete(db: AsyncSession, order_id: int) -> bool:
         """
@@ -184,10 +521,12 @@ class OrderCRUD:
         Returns:
             bool: True if deleted, False if not found
         """
-        db_order = await OrderCRUD.get_by_id(db, order_id)
+        db_order = await OrderCRUD.get_by_id(db, order_id, include_archive=False)
         if not db_order:
             return False
 
+        await ReportCRUD.mark_orders_dirty(db, [db_order.id])
+        await OutboxCRUD.add_order_events(db, OrderEventType.DELETED, [db_order.id])
         await db.delete(db_order)
         await db.commit()
 
@@ -226,13 +565,23 @@ class OrderItemCRUD:
             OrderItem: Created order_item
         """
 
+        product_names = await OrderCRUD._get_product_names(
+            db, [order_item_create.product_id]
+        )
+
         db_order_item = OrderItem(
             product_id=order_item_create.product_id,
+            product_name=product_names.get(order_item_create.product_id),
             quantity=order_item_create.quantity,
             price=order_item_create.price,
         )
 
         db.add(db_order_item)
+        await db.flush()
+        await ReportCRUD.mark_orders_dirty(db, [db_order_item.order_id])
+        await OutboxCRUD.add_order_events(
+            db, OrderEventType.UPDATED, [db_order_item.order_id]
+        )
         await db.commit()
         await db.refresh(db_order_item)
 
@@ -250,6 +599,11 @@ class OrderItemCRUD:
         for field, value in update_data.items():
             setattr(db_item, field, value)
 
+        await db.flush()
+        await ReportCRUD.mark_orders_dirty(db, [db_item.order_id])
+        await OutboxCRUD.add_order_events(
+            db, OrderEventType.UPDATED, [db_item.order_id]
+        )
         await db.commit()
         await db.refresh(db_item)
         return db_item
@@ -268,6 +622,11 @@ class OrderItemCRUD:
         if not db_item:
             return False
 
+        order_id = db_item.order_id
+        # the event carries the order without the item
         await db.delete(db_item)
+        await db.flush()
+        await ReportCRUD.mark_orders_dirty(db, [order_id])
+        await OutboxCRUD.add_order_events(db, OrderEventType.UPDATED, [order_id])
         await db.commit()
         return True
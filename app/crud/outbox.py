@@ -0,0 +1,89 @@
+from typing import List
+
+from sqlalchemy import select, insert, delete, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order, OrderItem
+from app.models.outbox import OrderOutbox
+
+
+class OrderEventType:
+    CREATED = "order.created"
+    UPDATED = "order.updated"
+    DELETED = "order.deleted"
+    COURIER_ASSIGNED = "order.courier_assigned"
+
+
+class OutboxCRUD:
+
+    @staticmethod
+    async def add_order_events(db: AsyncSession, event_type: str, order_ids: List[int]):
+        """
+        Write {event_type} events for {order_ids} with the current order state.
+        Runs in the caller's transaction, the caller commits.
+        """
+        # kitchen displays need the items (app.services.kitchen_display)
+        items = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        func.json_build_object(
+                            "product_id",
+                            OrderItem.product_id,
+                            "product_name",
+                            OrderItem.product_name,
+                            "quantity",
+                            OrderItem.quantity,
+                        )
+                    ),
+                    func.json_build_array(),
+                )
+            )
+            .where(OrderItem.order_id == Order.id)
+            .scalar_subquery()
+        )
+        payload = func.json_build_object(
+            "id",
+            Order.id,
+            "user_id",
+            Order.user_id,
+            "status",
+            Order.status,
+            "total_amount",
+            Order.total_amount,
+            "delivery_address",
+            Order.delivery_address,
+            "restaurant_id",
+            Order.restaurant_id,
+            "courier_id",
+            Order.courier_id,
+            "created_at",
+            Order.created_at,
+            "items",
+            items,
+        )
+        await db.execute(
+            insert(OrderOutbox).from_select(
+                ["order_id", "event_type", "payload"],
+                select(Order.id, literal(event_type), payload).filter(
+                    Order.id.in_(order_ids)
+                ),
+            )
+        )
+
+    @staticmethod
+    async def get_batch(db: AsyncSession, batch_size: int) -> List[OrderOutbox]:
+        """
+        Oldest unpublished events, locked so concurrent relays skip them
+        """
+        result = await db.execute(
+            select(OrderOutbox)
+            .order_by(OrderOutbox.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def delete_batch(db: AsyncSession, event_ids: List[int]):
+        await db.execute(delete(OrderOutbox).where(OrderOutbox.id.in_(event_ids)))
@@ -1,19 +1,72 @@
 from typing import Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-
+from sqlalchemy import (
+    Boolean,
+    Float,
+    Integer,
+    column,
+    func,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.orm import joinedload
+
+from app.core.pagination import encode_cursor, decode_cursor
+from app.services.catalog import catalog_changed
+from app.services.category_list import (
+    get_category_list_generation,
+    get_cached_category_list,
+    cache_category_list,
+)
+from app.models.catalog import CatalogTombstone, PRODUCT_ENTITY, CATEGORY_ENTITY
 from app.models.product import Product, Category
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
+    ProductSortField,
+    ProductPage,
+    ProductBulkItem,
     CategoryCreate,
     CategoryUpdate,
     CategoryResponse,
 )
 
 
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _decode_product_cursor(cursor: str, sort: ProductSortField) -> tuple:
+    """
+    (sort_value, id) of a get_all_products cursor
+
+    Raises:
+        ValueError: If the cursor is invalid or was issued for another sort key
+    """
+    values = decode_cursor(cursor)
+    if len(values) != 3:
+        raise ValueError("Invalid cursor")
+    cursor_sort, last_sort_value, last_id = values
+    if cursor_sort != sort.value:
+        raise ValueError(f"Cursor was issued for sort={cursor_sort}")
+    is_sort_value = {
+        ProductSortField.ID: _is_id,
+        ProductSortField.PRICE: _is_number,
+        ProductSortField.NAME: lambda value: isinstance(value, str),
+    }[sort]
+    if not is_sort_value(last_sort_value) or not _is_id(last_id):
+        raise ValueError("Invalid cursor")
+    return last_sort_value, last_id
+
+
 class ProductCRUD:
 
     @staticmethod
@@ -29,17 +82,145 @@ class ProductCRUD:
         return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_all_products(db: AsyncSession) -> List[ProductResponse]:
-        result = await db.execute(select(Product))
+    async def get_all_products(
+        db: AsyncSession,
+        category_id: Optional[int] = None,
+        is_available: Optional[bool] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort: ProductSortField = ProductSortField.ID,
+        descending: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> ProductPage:
+        """
+        Filtered product page with keyset pagination over (sort_key, id)
+
+        Args:
+            db: Database AsyncSession
+            category_id, is_available, min_price, max_price: Optional filters
+            sort: Sort key, ties are broken by id
+            descending: Sort direction
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            ProductPage: Products and the cursor of the next page (None at the end)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        sort_column = {
+            ProductSortField.ID: Product.id,
+            ProductSortField.PRICE: Product.price,
+            ProductSortField.NAME: Product.name,
+        }[sort]
+
+        query = select(Product).options(joinedload(Product.category))
+        if category_id is not None:
+            query = query.filter(Product.category_id == category_id)
+        if is_available is not None:
+            query = query.filter(Product.is_available.is_(is_available))
+        if min_price is not None:
+            query = query.filter(Product.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Product.price <= max_price)
+
+        # row comparison (sort_key, id) > (:sort_key, :id) is served by the
+        # composite (.., sort_key, id) indexes on products
+        key = tuple_(sort_column, Product.id)
+        if cursor is not None:
+            last_sort_value, last_id = _decode_product_cursor(cursor, sort)
+            last_key = tuple_(last_sort_value, last_id)
+            query = query.filter(key < last_key if descending else key > last_key)
+
+        if descending:
+            query = query.order_by(sort_column.desc(), Product.id.desc())
+        else:
+            query = query.order_by(sort_column, Product.id)
+
+        result = await db.execute(query.limit(limit + 1))
         products = result.scalars().all()
-        return [ProductResponse.from_orm(product) for product in products]
+
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            last = products[-1]
+            next_cursor = encode_cursor(
+                [sort.value, getattr(last, sort.value), last.id]
+            )
+
+        return ProductPage(
+            items=[ProductResponse.from_orm(product) for product in products],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        query_text: str,
+        category_id: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> ProductPage:
+        """
+        Full-text product search ranked by weighted name and description
+
+        Args:
+            db: Database AsyncSession
+            query_text: Search query in web search syntax
+            category_id: Optional category filter
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            ProductPage: Best matches first
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        ts_query = func.websearch_to_tsquery("simple", query_text)
+        rank = func.ts_rank_cd(Product.search_vector, ts_query)
+
+        query = (
+            select(Product, rank.label("rank"))
+            .options(joinedload(Product.category))
+            .filter(Product.search_vector.op("@@")(ts_query))
+        )
+        if category_id is not None:
+            query = query.filter(Product.category_id == category_id)
+        if cursor is not None:
+            last_rank, last_id = decode_cursor(cursor)
+            if not _is_number(last_rank) or not _is_id(last_id):
+                raise ValueError("Invalid cursor")
+            query = query.filter(
+                (rank < last_rank) | ((rank == last_rank) & (Product.id > last_id))
+            )
+
+        result = await db.execute(
+            query.order_by(rank.desc(), Product.id).limit(limit + 1)
+        )
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_product, last_rank = rows[-1]
+            next_cursor = encode_cursor([last_rank, last_product.id])
+
+        return ProductPage(
+            items=[ProductResponse.from_orm(product) for product, _ in rows],
+            next_cursor=next_cursor,
+        )
 
     @staticmethod
     async def get_products_by_category(
         db: AsyncSession, category_id: int
     ) -> List[ProductResponse]:
         result = await db.execute(
-            select(Product).filter(Product.category_id == category_id)
+            select(Product)
+            .options(joinedload(Product.category))
+            .filter(Product.category_id == category_id)
         )
         products = result.scalars().all()
         return [ProductResponse.from_orm(product) for product in products]
@@ -55,10 +236,73 @@ class ProductCRUD:
 
         db_product.is_available = not db_product.is_available
         await db.commit()
+        await catalog_changed({db_product.restaurant_id})
         await db.refresh(db_product)
 
         return db_product
 
+    @staticmethod
+    async def bulk_update(db: AsyncSession, items: List[ProductBulkItem]) -> int:
+        """
+        Apply price and availability changes to many products at once with a
+        single UPDATE ... FROM (VALUES ...). Omitted fields are left unchanged.
+
+        Args:
+            db: Database AsyncSession
+            items: Changes per product id
+
+        Returns:
+            int: Number of updated products
+        """
+        changes = values(
+            column("id", Integer),
+            column("price", Float),
+            column("is_available", Boolean),
+            name="changes",
+        ).data([(item.id, item.price, item.is_available) for item in items])
+
+        result = await db.execute(
+            update(Product)
+            .where(Product.id == changes.c.id)
+            .values(
+                price=func.coalesce(changes.c.price, Product.price),
+                is_available=func.coalesce(
+                    changes.c.is_available, Product.is_available
+                ),
+            )
+            .returning(Product.restaurant_id)
+            .execution_options(synchronize_session=False)
+        )
+        restaurant_ids = result.scalars().all()
+        await db.commit()
+        await catalog_changed(set(restaurant_ids))
+
+        return len(restaurant_ids)
+
+    @staticmethod
+    async def set_category_availability(
+        db: AsyncSession, category_id: int, is_available: bool
+    ) -> int:
+        """
+        Mark all products of a category as (un)available in one UPDATE
+
+        Returns:
+            int: Number of updated products
+        """
+        result = await db.execute(
+            update(Product)
+            .where(Product.category_id == category_id)
+            .where(Product.is_available.is_not(is_available))
+            .values(is_available=is_available)
+            .returning(Product.restaurant_id)
+            .execution_options(synchronize_session=False)
+        )
+        restaurant_ids = result.scalars().all()
+        await db.commit()
+        await catalog_changed(set(restaurant_ids))
+
+        return len(restaurant_ids)
+
     @staticmethod
     async def create(db: AsyncSession, product_create: ProductCreate) -> Product:
         """
@@ -77,10 +321,12 @@ class ProductCRUD:
             price=product_create.price,
             is_available=product_create.is_available,
             category_id=product_create.category_id,
+            restaurant_id=product_create.restaurant_id,
         )
 
         db.add(db_product)
         await db.commit()
+        await catalog_changed({db_product.restaurant_id})
         await db.refresh(db_product)
 
         return db_product
@@ -105,11 +351,13 @@ class ProductCRUD:
             return None
 
         update_data = product_update.model_dump(exclude_unset=True)
+        previous_restaurant_id = db_product.restaurant_id
 
         for field, value in update_data.items():
             setattr(db_product, field, value)
 
         await db.commit()
+        await catalog_changed({previous_restaurant_id, db_product.restaurant_id})
         await db.refresh(db_product)
 
         return db_product
@@ -131,7 +379,9 @@ class ProductCRUD:
             return False
 
         await db.delete(db_product)
+        db.add(CatalogTombstone(entity=PRODUCT_ENTITY, entity_id=product_id))
         await db.commit()
+        await catalog_changed({db_product.restaurant_id})
 
         return True
 
@@ -140,9 +390,46 @@ class CategoryCRUD:
 
     @staticmethod
     async def get_all(db: AsyncSession) -> List[CategoryResponse]:
-        result = await db.execute(select(Category))
-        categories = result.scalars().all()
-        return [CategoryResponse.from_orm(category) for category in categories]
+        """
+        All categories with their product counts, from one GROUP BY over
+        categories LEFT JOIN products. The list is cached in Redis until the
+        next catalog write.
+
+        Args:
+            db: Database AsyncSession
+
+        Returns:
+            List[CategoryResponse]: Categories with products_count and
+                available_products_count
+        """
+        generation = await get_category_list_generation()
+        cached = await get_cached_category_list(generation)
+        if cached is not None:
+            return cached
+
+        result = await db.execute(
+            select(
+                Category.id,
+                Category.name,
+                func.count(Product.id),
+                func.count(Product.id).filter(Product.is_available.is_(True)),
+            )
+            .outerjoin(Product, Product.category_id == Category.id)
+            .group_by(Category.id)
+            .order_by(Category.id)
+        )
+        categories = [
+            CategoryResponse(
+                id=id_,
+                name=name,
+                products_count=products_count,
+                available_products_count=available_products_count,
+            )
+            for id_, name, products_count, available_products_count in result.all()
+        ]
+
+        await cache_category_list(generation, categories)
+        return categories
 
     @staticmethod
     async def get_by_id(db: AsyncSession, category_id: int) -> Optional[Category]:
@@ -176,6 +463,7 @@ class CategoryCRUD:
 
         db.add(db_category)
         await db.commit()
+        await catalog_changed()
         await db.refresh(db_category)
 
         return db_category
@@ -204,7 +492,14 @@ class CategoryCRUD:
         for field, value in update_data.items():
             setattr(db_category, field, value)
 
+        result = await db.execute(
+            select(Product.restaurant_id)
+            .filter(Product.category_id == category_id)
+            .distinct()
+        )
+        restaurant_ids = set(result.scalars().all())
         await db.commit()
+        await catalog_changed(restaurant_ids)
         await db.refresh(db_category)
 
         return db_category
@@ -225,16 +520,17 @@ class CategoryCRUD:
         if not db_category:
             return False
 
-        result = await db.execute(
-            select(func.count())
-            .select_from(Product)
-            .filter(Product.category_id == category_id)
+        has_products = await db.scalar(
+            select(
+                select(Product.id).filter(Product.category_id == category_id).exists()
+            )
         )
-        products_count = result.scalar_one()
-        if products_count > 0:
+        if has_products:
             raise ValueError("Cannot delete category with existing products")
 
         await db.delete(db_category)
+        db.add(CatalogTombstone(entity=CATEGORY_ENTITY, entity_id=category_id))
         await db.commit()
+        await catalog_changed()
 
         return True
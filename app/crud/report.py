@@ -0,0 +1,75 @@
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order, OrderStatus
+from app.models.report import (
+    OrderDailyRollup,
+    ProductDailyRollup,
+    OrderRollupDirtyDay,
+)
+from app.schemas.report import OrderDailyRollupResponse, ProductDailyRollupResponse
+
+
+class ReportCRUD:
+
+    @staticmethod
+    async def get_order_rollups(
+        db: AsyncSession,
+        date_from: date,
+        date_to: date,
+        status: Optional[OrderStatus] = None,
+    ) -> List[OrderDailyRollupResponse]:
+        query = (
+            select(OrderDailyRollup)
+            .filter(OrderDailyRollup.day.between(date_from, date_to))
+            .order_by(OrderDailyRollup.day, OrderDailyRollup.status)
+        )
+        if status is not None:
+            query = query.filter(OrderDailyRollup.status == status)
+
+        result = await db.execute(query)
+        rollups = result.scalars().all()
+        return [OrderDailyRollupResponse.from_orm(rollup) for rollup in rollups]
+
+    @staticmethod
+    async def get_product_rollups(
+        db: AsyncSession,
+        date_from: date,
+        date_to: date,
+        product_id: Optional[int] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> List[ProductDailyRollupResponse]:
+        query = (
+            select(ProductDailyRollup)
+            .filter(ProductDailyRollup.day.between(date_from, date_to))
+            .order_by(ProductDailyRollup.day, ProductDailyRollup.product_id)
+        )
+        if product_id is not None:
+            query = query.filter(ProductDailyRollup.product_id == product_id)
+        if status is not None:
+            query = query.filter(ProductDailyRollup.status == status)
+
+        result = await db.execute(query)
+        rollups = result.scalars().all()
+        return [ProductDailyRollupResponse.from_orm(rollup) for rollup in rollups]
+
+    @staticmethod
+    async def mark_orders_dirty(db: AsyncSession, order_ids: List[int]):
+        """
+        Queue the creation days of {order_ids} for a rollup refresh.
+        Runs in the caller's transaction, the caller commits.
+        """
+        await db.execute(
+            insert(OrderRollupDirtyDay)
+            .from_select(
+                ["day"],
+                select(func.date(Order.created_at))
+                .filter(Order.id.in_(order_ids))
+                .distinct(),
+            )
+            .on_conflict_do_nothing()
+        )
@@ -1,23 +1,104 @@
+from datetime import UTC, datetime
 from typing import Optional, List, Any, Type, Coroutine
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
+from app.core.pagination import encode_cursor, decode_cursor
+from app.models.product import Product
+from app.models.opening_hours import RestaurantOpenSlot
 from app.models.restaurant import Restaurant
+from app.services.catalog import catalog_changed
+from app.services.delivery_zones import delivery_zone_index
+from app.services.geocoding import fill_coordinates
+from app.services.opening_hours import bucket_floor, bucket_size, recompute_open_slots
+from app.services.restaurant_geo import restaurant_geo_index
+from app.services.restaurant_list import (
+    list_scope,
+    get_restaurant_list_generation,
+    get_cached_restaurant_page,
+    cache_restaurant_page,
+    invalidate_restaurant_list,
+)
 from app.schemas.order import OrderResponse
 from app.schemas.restaurant import (
     RestaurantCreate,
     RestaurantUpdate,
     RestaurantResponse,
+    RestaurantNearbyResponse,
+    RestaurantPage,
 )
 
 
 class RestaurantCRUD:
 
     @staticmethod
-    async def get_all(db: AsyncSession) -> List[RestaurantResponse]:
-        result = await db.execute(select(Restaurant))
+    async def get_all(
+        db: AsyncSession,
+        city: Optional[str] = None,
+        country: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> RestaurantPage:
+        """
+        Restaurant page in id order, with keyset pagination. Pages are
+        cached in Redis per (country, city) filter.
+
+        Args:
+            db: Database AsyncSession
+            city, country: Optional filters
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            RestaurantPage: Restaurants and the cursor of the next page
+                (None at the end)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        scope = list_scope(country, city)
+        generation = await get_restaurant_list_generation(scope)
+        cached = await get_cached_restaurant_page(scope, generation, limit, cursor)
+        if cached is not None:
+            return cached
+
+        query = select(Restaurant)
+        if city is not None:
+            query = query.filter(Restaurant.city == city)
+        if country is not None:
+            query = query.filter(Restaurant.country == country)
+        page = await RestaurantCRUD._get_page(db, query, limit, cursor)
+
+        await cache_restaurant_page(scope, generation, limit, cursor, page)
+        return page
+
+    @staticmethod
+    async def _get_page(
+        db: AsyncSession, query, limit: int, cursor: Optional[str]
+    ) -> RestaurantPage:
+        """
+        Keyset page of a Restaurant query over id, served by the
+        (filter, id) indexes on restaurants
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        if cursor is not None:
+            (last_id,) = decode_cursor(cursor)
+            if not isinstance(last_id, int):
+                raise ValueError("Invalid cursor")
+            query = query.filter(Restaurant.id > last_id)
+
+        result = await db.execute(query.order_by(Restaurant.id).limit(limit + 1))
         restaurants = result.scalars().all()
-        return [RestaurantResponse.from_orm(restaurant) for restaurant in restaurants]
+
+        next_cursor = None
+        if len(restaurants) > limit:
+            restaurants = restaurants[:limit]
+            next_cursor = encode_cursor([restaurants[-1].id])
+
+        items = [RestaurantResponse.from_orm(restaurant) for restaurant in restaurants]
+        return RestaurantPage(items=items, next_cursor=next_cursor)
 
     @staticmethod
     async def get_by_id(db: AsyncSession, restaurant_id: int) -> Optional[Restaurant]:
@@ -28,13 +109,102 @@ class RestaurantCRUD:
 
     @staticmethod
     async def get_by_name(
-        db: AsyncSession, restaurant_name: str
-    ) -> List[RestaurantResponse]:
+        db: AsyncSession,
+        restaurant_name: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> RestaurantPage:
+        """
+        Restaurants with exactly this name, with keyset pagination
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = select(Restaurant).filter(Restaurant.name == restaurant_name)
+        return await RestaurantCRUD._get_page(db, query, limit, cursor)
+
+    @staticmethod
+    async def get_open_now(
+        db: AsyncSession,
+        city: str,
+        country: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> RestaurantPage:
+        """
+        Restaurants of a city open at this moment, from the precomputed
+        restaurant_open_slots. Restaurants without opening hours are never
+        listed.
+
+        Args:
+            db: Database AsyncSession
+            city: City filter
+            country: Optional country filter
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            RestaurantPage: Restaurants and the cursor of the next page
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        now = datetime.now(UTC)
+        query = (
+            select(Restaurant)
+            .join(RestaurantOpenSlot, RestaurantOpenSlot.restaurant_id == Restaurant.id)
+            .filter(RestaurantOpenSlot.city == city)
+            .filter(RestaurantOpenSlot.bucket_start == bucket_floor(now, bucket_size()))
+            .filter(RestaurantOpenSlot.open_from <= now)
+            .filter(RestaurantOpenSlot.open_until > now)
+        )
+        if country is not None:
+            query = query.filter(RestaurantOpenSlot.country == country)
+        return await RestaurantCRUD._get_page(db, query, limit, cursor)
+
+    @staticmethod
+    async def get_nearby(
+        db: AsyncSession,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int,
+        nearest: bool = False,
+    ) -> List[RestaurantNearbyResponse]:
+        """
+        Restaurants around a point, nearest first
+
+        Args:
+            db: Database AsyncSession
+            latitude, longitude: Search center
+            radius_km: Search radius
+            limit: Max restaurants
+            nearest: k-nearest query: {limit} restaurants however close they
+                are, within {radius_km}. Otherwise every restaurant within
+                {radius_km}, up to {limit}.
+
+        Returns:
+            List[RestaurantNearbyResponse]: Restaurants with their distance
+        """
+        grid = await restaurant_geo_index.get_grid()
+        if nearest:
+            found = grid.nearest(latitude, longitude, limit, radius_km)
+        else:
+            found = grid.within(latitude, longitude, radius_km, limit)
+        if not found:
+            return []
+
+        distances = dict(found)
         result = await db.execute(
-            select(Restaurant).filter(Restaurant.name == restaurant_name)
+            select(Restaurant).filter(Restaurant.id.in_(distances))
         )
-        restaurants = result.scalars().all()
-        return [RestaurantResponse.from_orm(restaurant) for restaurant in restaurants]
+        restaurants = sorted(
+            result.scalars().all(), key=lambda restaurant: distances[restaurant.id]
+        )
+        return [
+            RestaurantNearbyResponse.from_orm(restaurant, distances[restaurant.id])
+            for restaurant in restaurants
+        ]
 
     @staticmethod
     async def create(
@@ -58,10 +228,16 @@ class RestaurantCRUD:
             apartment=restaurant_create.apartment,
             city=restaurant_create.city,
             country=restaurant_create.country,
+            latitude=restaurant_create.latitude,
+            longitude=restaurant_create.longitude,
+            timezone=restaurant_create.timezone,
         )
+        await fill_coordinates(db_restaurant)
 
         db.add(db_restaurant)
         await db.commit()
+        await restaurant_geo_index.invalidate()
+        await invalidate_restaurant_list([(db_restaurant.country, db_restaurant.city)])
         await db.refresh(db_restaurant)
 
         return db_restaurant
@@ -86,11 +262,21 @@ class RestaurantCRUD:
             return None
 
         update_data = restaurant_update.model_dump(exclude_unset=True)
+        old_location = (db_restaurant.country, db_restaurant.city)
 
         for field, value in update_data.items():
             setattr(db_restaurant, field, value)
 
+        await fill_coordinates(db_restaurant, update_data)
+        if any(field in update_data for field in ("timezone", "city", "country")):
+            await db.flush()
+            await recompute_open_slots(db, restaurant_id)
         await db.commit()
+        await catalog_changed({restaurant_id})
+        await restaurant_geo_index.invalidate()
+        await invalidate_restaurant_list(
+            [old_location, (db_restaurant.country, db_restaurant.city)]
+        )
         await db.refresh(db_restaurant)
 
         return db_restaurant
@@ -111,7 +297,20 @@ class RestaurantCRUD:
         if not db_restaurant:
             return False
 
+        # explicit instead of ON DELETE SET NULL, so the products get a new
+        # catalog version
+        await db.execute(
+            update(Product)
+            .where(Product.restaurant_id == restaurant_id)
+            .values(restaurant_id=None)
+        )
+        location = (db_restaurant.country, db_restaurant.city)
         await db.delete(db_restaurant)
         await db.commit()
+        await catalog_changed({restaurant_id})
+        await restaurant_geo_index.invalidate()
+        # its zones are gone with ON DELETE CASCADE
+        await delivery_zone_index.invalidate()
+        await invalidate_restaurant_list([location])
 
         return True
@@ -5,6 +5,7 @@ import hashlib
 
 from app.core.security import verify_password
 from app.models.user import User, UserAddress
+from app.services.geocoding import fill_coordinates
 from app.schemas.user import (
     UserCreate,
     UserUpdate,
@@ -265,6 +266,7 @@ class UserAddressCRUD:
             UserAddress: Created address
         """
         db_address = UserAddress(user_id=user_id, **user_address_create.model_dump())
+        await fill_coordinates(db_address)
 
         db.add(db_address)
         await db.commit()
@@ -295,6 +297,7 @@ class UserAddressCRUD:
         for field, value in update_data.items():
             setattr(db_address, field, value)
 
+        await fill_coordinates(db_address, update_data)
         await db.commit()
         await db.refresh(db_address)
 
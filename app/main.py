@@ -5,6 +5,24 @@ from sqlalchemy import select
 
 from app.core.config import settings
 from app.core.database import db_manager, redis_manager
+from app.core.tasks import task_manager
+from app.services.order_archive import run_order_archival
+from app.services.order_rollups import run_order_rollup_refresh
+from app.services.outbox_relay import run_outbox_relay
+from app.services.autocomplete import refresh_autocomplete_index
+from app.services.catalog_snapshot import catalog_snapshots, refresh_catalog_snapshot
+from app.services.restaurant_geo import refresh_restaurant_geo_index
+from app.services.delivery_zones import refresh_delivery_zone_index
+from app.services.opening_hours import run_open_slot_refresh
+from app.services.dispatch import close_dispatch_pool, run_dispatch
+from app.services.kitchen_display import close_kitchen_pool
+from app.services.surge import run_surge_refresh
+from app.services.order_eta import eta_subscribers, run_eta_refresh
+from app.services.courier_locations import (
+    flush_courier_locations,
+    prune_courier_locations,
+    run_courier_location_flush,
+)
 
 from app.api import *
 
@@ -25,6 +43,9 @@ async def lifespan(app: FastAPI):
         print("🟢 Testing connections...")
         await _test_connections()
 
+        print("🟢 Starting background tasks...")
+        _start_background_tasks()
+
         print("🟢 All services initialized successfully!")
 
     except Exception as e:
@@ -61,9 +82,92 @@ async def _test_connections():
         raise
 
 
+def _start_background_tasks():
+    """Periodic jobs running next to the API"""
+    task_manager.start_periodic(
+        "order_archival",
+        run_order_archival,
+        settings.ORDER_ARCHIVE_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "order_rollups",
+        run_order_rollup_refresh,
+        settings.ORDER_ROLLUP_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "outbox_relay",
+        run_outbox_relay,
+        settings.OUTBOX_POLL_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "autocomplete_index",
+        refresh_autocomplete_index,
+        settings.AUTOCOMPLETE_REFRESH_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "catalog_snapshot",
+        refresh_catalog_snapshot,
+        settings.CATALOG_SNAPSHOT_REFRESH_SECONDS,
+    )
+    task_manager.start_periodic(
+        "restaurant_geo_index",
+        refresh_restaurant_geo_index,
+        settings.RESTAURANT_GEO_REFRESH_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "delivery_zone_index",
+        refresh_delivery_zone_index,
+        settings.DELIVERY_ZONE_REFRESH_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "open_slots",
+        run_open_slot_refresh,
+        settings.OPEN_SLOT_REFRESH_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "dispatch",
+        run_dispatch,
+        settings.DISPATCH_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "surge_heatmap",
+        run_surge_refresh,
+        settings.SURGE_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "order_eta",
+        run_eta_refresh,
+        settings.ETA_INTERVAL_SECONDS,
+    )
+    # blocks on the subscription, the interval is the retry delay on errors
+    task_manager.start_periodic("order_eta_push", eta_subscribers.listen, 1)
+    task_manager.start_periodic(
+        "courier_locations",
+        run_courier_location_flush,
+        settings.COURIER_LOCATION_FLUSH_INTERVAL_SECONDS,
+    )
+    task_manager.start_periodic(
+        "courier_location_retention",
+        prune_courier_locations,
+        settings.COURIER_LOCATION_PRUNE_INTERVAL_SECONDS,
+    )
+
+
 async def _cleanup():
     """Cleaning up resources"""
     try:
+        # Stopping background tasks
+        await task_manager.close()
+        print("🟢 Background tasks stopped")
+
+        # pings buffered since the last periodic flush
+        await flush_courier_locations()
+
+        catalog_snapshots.close()
+        close_dispatch_pool()
+        close_kitchen_pool()
+        eta_subscribers.close()
+
         # Closing Redis
         await redis_manager.close()
         print("🟢 Redis connections closed")
@@ -79,10 +183,15 @@ async def _cleanup():
 main_app = FastAPI(lifespan=lifespan)
 
 main_app.include_router(authorization_router)
+main_app.include_router(catalog_router)
 main_app.include_router(categories_router)
+main_app.include_router(delivery_zone_router)
+main_app.include_router(dispatch_router)
+main_app.include_router(kitchen_router)
 main_app.include_router(order_item_router)
 main_app.include_router(orders_router)
 main_app.include_router(product_router)
+main_app.include_router(report_router)
 main_app.include_router(restaurant_router)
 main_app.include_router(user_router)
 main_app.include_router(user_address_router)
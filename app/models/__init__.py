@@ -1,14 +1,37 @@
 __all__ = [
     "Order",
     "OrderItem",
+    "OrderArchive",
+    "OrderItemArchive",
+    "OrderOutbox",
+    "CatalogTombstone",
+    "CatalogVersion",
     "Category",
     "Product",
     "Restaurant",
+    "DeliveryZone",
+    "CourierLocation",
+    "RestaurantOpeningHours",
+    "RestaurantHoursException",
+    "RestaurantOpenSlot",
+    "OrderDailyRollup",
+    "ProductDailyRollup",
+    "OrderRollupDirtyDay",
     "User",
     "UserAddress",
 ]
 
-from app.models.order import Order, OrderItem
+from app.models.order import Order, OrderItem, OrderArchive, OrderItemArchive
+from app.models.outbox import OrderOutbox
+from app.models.catalog import CatalogTombstone, CatalogVersion
 from app.models.product import Category, Product
 from app.models.restaurant import Restaurant
+from app.models.delivery_zone import DeliveryZone
+from app.models.courier_location import CourierLocation
+from app.models.opening_hours import (
+    RestaurantOpeningHours,
+    RestaurantHoursException,
+    RestaurantOpenSlot,
+)
+from app.models.report import OrderDailyRollup, ProductDailyRollup, OrderRollupDirtyDay
 from app.models.user import User, UserAddress
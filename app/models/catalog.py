@@ -0,0 +1,96 @@
+from sqlalchemy import DDL, BigInteger, Index, Sequence, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+# Catalog version: every product/category insert, update and delete draws
+# the next value, so "changed since version N" is a plain range scan
+catalog_version_seq = Sequence("catalog_version_seq", metadata=Base.metadata)
+
+CATALOG_TABLES = ("categories", "products", "catalog_tombstones")
+
+
+class CatalogVersion(Base):
+    """
+    Single row: the catalog version of the last committed catalog write.
+
+    Sequence values are handed out in allocation order, not commit order,
+    so the sequence alone can't tell which versions are visible. Triggers on
+    CATALOG_TABLES lock this row before a statement draws versions and
+    store the drawn maximum after it: catalog writers commit one at a time
+    in version order, and every version up to the stored one is committed.
+    """
+
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+CATALOG_VERSION_DDL = [
+    "INSERT INTO catalog_version (id, version) "
+    "SELECT 1, CASE WHEN is_called THEN last_value ELSE 0 END "
+    "FROM catalog_version_seq "
+    "ON CONFLICT (id) DO NOTHING",
+    """
+    CREATE OR REPLACE FUNCTION catalog_version_lock() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        -- held until commit: the next writer draws after this one committed
+        UPDATE catalog_version SET version = version WHERE id = 1;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION catalog_version_store() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE catalog_version
+        SET version = greatest(
+            version, (SELECT last_value FROM catalog_version_seq WHERE is_called)
+        )
+        WHERE id = 1;
+        RETURN NULL;
+    END $$
+    """,
+    *(
+        f"""
+        CREATE OR REPLACE TRIGGER {table}_catalog_version_lock
+        BEFORE INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH STATEMENT EXECUTE FUNCTION catalog_version_lock()
+        """
+        for table in CATALOG_TABLES
+    ),
+    *(
+        f"""
+        CREATE OR REPLACE TRIGGER {table}_catalog_version_store
+        AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH STATEMENT EXECUTE FUNCTION catalog_version_store()
+        """
+        for table in CATALOG_TABLES
+    ),
+]
+
+# create_all runs on every start: all statements are idempotent
+for statement in CATALOG_VERSION_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
+
+PRODUCT_ENTITY = "product"
+CATEGORY_ENTITY = "category"
+
+
+class CatalogTombstone(Base):
+    """Deleted products and categories, for the incremental change feed"""
+
+    __tablename__ = "catalog_tombstones"
+    __table_args__ = (
+        Index("ix_catalog_tombstones_entity_version", "entity", "version"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    # PRODUCT_ENTITY | CATEGORY_ENTITY
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(
+        BigInteger, server_default=catalog_version_seq.next_value(), nullable=False
+    )
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class CourierLocation(Base):
+    """
+    Append-only courier GPS history, written in COPY batches by
+    app.services.courier_locations. No foreign key: rows are never updated
+    and the write path stays a plain COPY.
+    """
+
+    __tablename__ = "courier_locations"
+    __table_args__ = (
+        Index(
+            "ix_courier_locations_courier_id_recorded_at", "courier_id", "recorded_at"
+        ),
+        # rows arrive in time order, a BRIN index is enough for retention
+        Index(
+            "ix_courier_locations_recorded_at", "recorded_at", postgresql_using="brin"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    courier_id: Mapped[int] = mapped_column(nullable=False)
+    latitude: Mapped[float] = mapped_column(nullable=False)
+    longitude: Mapped[float] = mapped_column(nullable=False)
+    recorded_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class DeliveryZone(Base):
+    """
+    Delivery area of a restaurant. The geohash cover of the polygon
+    (app.services.delivery_zones.cover) is computed on write, so rebuilding
+    the lookup index does not redo any geometry.
+    """
+
+    __tablename__ = "delivery_zones"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    restaurant_id: Mapped[int] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    # [[latitude, longitude], ...]
+    polygon: Mapped[list] = mapped_column(JSONB, nullable=False)
+    interior_cells: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    boundary_cells: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    # Many-to-One
+    restaurant: Mapped["Restaurant"] = relationship(back_populates="delivery_zones")
@@ -0,0 +1,89 @@
+from datetime import date, datetime, time
+
+from sqlalchemy import DateTime, ForeignKey, Index, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class RestaurantOpeningHours(Base):
+    """
+    Weekly schedule: one row per opening interval, in the restaurant's local
+    time. closes_at <= opens_at means the interval runs past midnight.
+    """
+
+    __tablename__ = "restaurant_opening_hours"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    restaurant_id: Mapped[int] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # 0 = Monday .. 6 = Sunday
+    weekday: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    opens_at: Mapped[time] = mapped_column(nullable=False)
+    closes_at: Mapped[time] = mapped_column(nullable=False)
+
+    # Many-to-One
+    restaurant: Mapped["Restaurant"] = relationship(back_populates="opening_hours")
+
+
+class RestaurantHoursException(Base):
+    """
+    Local date with special hours, replacing the weekly schedule of that
+    date. A row without opens_at/closes_at closes the restaurant for the day.
+    """
+
+    __tablename__ = "restaurant_hours_exceptions"
+    __table_args__ = (
+        Index(
+            "ix_restaurant_hours_exceptions_restaurant_id_day", "restaurant_id", "day"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    restaurant_id: Mapped[int] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(nullable=False)
+    opens_at: Mapped[time | None]
+    closes_at: Mapped[time | None]
+    note: Mapped[str | None] = mapped_column(String(200))
+
+    # Many-to-One
+    restaurant: Mapped["Restaurant"] = relationship(back_populates="hours_exceptions")
+
+
+class RestaurantOpenSlot(Base):
+    """
+    Precomputed opening state: one row per restaurant and UTC time bucket in
+    which it is open, with the exact open interval inside the bucket.
+    Maintained by app.services.opening_hours.
+    """
+
+    __tablename__ = "restaurant_open_slots"
+    __table_args__ = (
+        # "open now in city X": one bucket of one city, in restaurant order
+        Index(
+            "ix_restaurant_open_slots_city_bucket_start",
+            "city",
+            "bucket_start",
+            "restaurant_id",
+        ),
+    )
+
+    restaurant_id: Mapped[int] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="CASCADE"), primary_key=True
+    )
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    # part of the key: a bucket may hold several disjoint open intervals
+    open_from: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    open_until: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # copied from the restaurant, so the lookup needs no join
+    city: Mapped[str] = mapped_column(nullable=False)
+    country: Mapped[str] = mapped_column(nullable=False)
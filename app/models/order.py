@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import Float, ForeignKey, String, func, Enum
+from sqlalchemy import Float, ForeignKey, String, func, Enum, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.models.base import Base
@@ -18,6 +18,22 @@ class OrderStatus(enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        # open orders a courier carries (dispatch load)
+        Index("ix_orders_courier_id_status", "courier_id", "status"),
+        Index("ix_orders_restaurant_id_status", "restaurant_id", "status"),
+        # dispatch queue: PROCESSING orders without a courier, oldest first
+        Index(
+            "ix_orders_status_courier_id_created_at",
+            "status",
+            "courier_id",
+            "created_at",
+        ),
+        # prep and delivery time history for ETAs
+        Index("ix_orders_picked_up_at", "picked_up_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -26,12 +42,27 @@ class Order(Base):
         Enum(OrderStatus), default=OrderStatus.NEW
     )
     total_amount: Mapped[float] = mapped_column(default=0.0)
+    # base fee times the surge multiplier at checkout, not in total_amount
+    delivery_fee: Mapped[float] = mapped_column(default=0.0, server_default="0")
 
     delivery_address: Mapped[str] = mapped_column(String(255))
+    delivery_latitude: Mapped[float | None]
+    delivery_longitude: Mapped[float | None]
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
+    restaurant_id: Mapped[int | None] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="SET NULL")
+    )
+    courier_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL")
+    )
+    assigned_at: Mapped[datetime | None]
+    # set on the switch to DELIVERY and COMPLETED
+    picked_up_at: Mapped[datetime | None]
+    delivered_at: Mapped[datetime | None]
+
     # Many-to-One
-    user: Mapped["User"] = relationship(back_populates="orders")
+    user: Mapped["User"] = relationship(back_populates="orders", foreign_keys=[user_id])
     # One-to-Many
     items: Mapped[List["OrderItem"]] = relationship(
         back_populates="order", cascade="all, delete-orphan"
@@ -45,9 +76,54 @@ class OrderItem(Base):
     order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), nullable=False)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
     quantity: Mapped[int] = mapped_column(nullable=False, default=1)
+    # Unit price and product name at order time
     price: Mapped[float] = mapped_column(nullable=False)
+    product_name: Mapped[str | None] = mapped_column(String(100))
 
     # Many-to-One
     order: Mapped["Order"] = relationship(back_populates="items")
     # Many-to-One
     product: Mapped["Product"] = relationship()
+
+
+class OrderArchive(Base):
+    """
+    Cold COMPLETED/CANCELED orders, range partitioned by month on created_at.
+    Monthly partitions are created by app.services.order_archive.
+    """
+
+    __tablename__ = "orders_archive"
+    __table_args__ = (
+        Index("ix_orders_archive_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # the partition key has to be part of the primary key
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(nullable=False)
+
+    status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus))
+    total_amount: Mapped[float] = mapped_column(default=0.0)
+
+    delivery_address: Mapped[str] = mapped_column(String(255))
+    restaurant_id: Mapped[int | None]
+    delivery_fee: Mapped[float] = mapped_column(default=0.0, server_default="0")
+    archived_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    # One-to-Many
+    items: Mapped[List["OrderItemArchive"]] = relationship(
+        primaryjoin="OrderArchive.id == foreign(OrderItemArchive.order_id)",
+        viewonly=True,
+    )
+
+
+class OrderItemArchive(Base):
+    __tablename__ = "order_items_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    order_id: Mapped[int] = mapped_column(nullable=False, index=True)
+    product_id: Mapped[int] = mapped_column(nullable=False)
+    quantity: Mapped[int] = mapped_column(nullable=False, default=1)
+    price: Mapped[float] = mapped_column(nullable=False)
+    product_name: Mapped[str | None] = mapped_column(String(100))
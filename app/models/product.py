@@ -1,8 +1,15 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, BigInteger, Computed, ForeignKey, Index, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship, Mapped
 from sqlalchemy.orm import mapped_column
 
 from app.models.base import Base
+from app.models.catalog import catalog_version_seq
+
+# gin_trgm_ops on products.name
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
 
 
 class Category(Base):
@@ -10,6 +17,12 @@ class Category(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False, unique=True)
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=catalog_version_seq.next_value(),
+        onupdate=catalog_version_seq.next_value(),
+        nullable=False,
+    )
 
     # One-to-Many
     products: Mapped[list["Product"]] = relationship(
@@ -19,6 +32,23 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # keyset pagination of the catalog: (filter, sort_key, id)
+        Index("ix_products_category_id_price_id", "category_id", "price", "id"),
+        Index("ix_products_category_id_name_id", "category_id", "name", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_name_id", "name", "id"),
+        Index("ix_products_version", "version"),
+        # menu of a restaurant grouped by category
+        Index("ix_products_restaurant_id_category_id", "restaurant_id", "category_id"),
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
@@ -28,6 +58,26 @@ class Product(Base):
     category_id: Mapped[int] = mapped_column(
         ForeignKey("categories.id"), nullable=False
     )
+    restaurant_id: Mapped[int | None] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="SET NULL")
+    )
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=catalog_version_seq.next_value(),
+        onupdate=catalog_version_seq.next_value(),
+        nullable=False,
+    )
+    # Full-text search document, name weighs more than description
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # Many-to-One
     category: Mapped["Category"] = relationship(back_populates="products")
+    restaurant: Mapped["Restaurant"] = relationship(back_populates="products")
@@ -0,0 +1,42 @@
+from datetime import date
+
+from sqlalchemy import Enum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.order import OrderStatus
+
+
+class OrderDailyRollup(Base):
+    """Orders, items and revenue per day and status"""
+
+    __tablename__ = "order_daily_rollups"
+
+    day: Mapped[date] = mapped_column(primary_key=True)
+    status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), primary_key=True)
+
+    order_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    item_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(nullable=False, default=0.0)
+
+
+class ProductDailyRollup(Base):
+    """Orders, sold quantity and revenue per day, status and product"""
+
+    __tablename__ = "product_daily_rollups"
+
+    day: Mapped[date] = mapped_column(primary_key=True)
+    status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), primary_key=True)
+    product_id: Mapped[int] = mapped_column(primary_key=True)
+
+    order_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    item_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(nullable=False, default=0.0)
+
+
+class OrderRollupDirtyDay(Base):
+    """Days whose rollups have to be recomputed, filled by the order write paths"""
+
+    __tablename__ = "order_rollup_dirty_days"
+
+    day: Mapped[date] = mapped_column(primary_key=True)
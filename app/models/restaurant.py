@@ -1,10 +1,19 @@
-from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
 
 
 class Restaurant(Base):
     __tablename__ = "restaurants"
+    __table_args__ = (
+        # keyset pagination of the listing: (filter, id)
+        Index("ix_restaurants_city_id", "city", "id"),
+        Index("ix_restaurants_country_id", "country", "id"),
+        Index("ix_restaurants_name_id", "name", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
@@ -15,3 +24,29 @@ class Restaurant(Base):
     apartment: Mapped[str | None]
     city: Mapped[str] = mapped_column(nullable=False)
     country: Mapped[str] = mapped_column(nullable=False)
+    latitude: Mapped[float | None]
+    longitude: Mapped[float | None]
+    # IANA name, opening hours are in this zone
+    timezone: Mapped[str] = mapped_column(
+        String(64), nullable=False, server_default="UTC"
+    )
+    # restaurant_open_slots are computed up to here
+    open_slots_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    # One-to-Many
+    products: Mapped[list["Product"]] = relationship(
+        back_populates="restaurant", passive_deletes=True
+    )
+    delivery_zones: Mapped[list["DeliveryZone"]] = relationship(
+        back_populates="restaurant", passive_deletes=True
+    )
+    opening_hours: Mapped[list["RestaurantOpeningHours"]] = relationship(
+        back_populates="restaurant",
+        passive_deletes=True,
+        order_by="[RestaurantOpeningHours.weekday, RestaurantOpeningHours.opens_at]",
+    )
+    hours_exceptions: Mapped[list["RestaurantHoursException"]] = relationship(
+        back_populates="restaurant",
+        passive_deletes=True,
+        order_by="[RestaurantHoursException.day, RestaurantHoursException.opens_at]",
+    )
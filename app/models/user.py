@@ -22,7 +22,9 @@ class User(Base):
         back_populates="user", cascade="all, delete-orphan"
     )
     # One-to-Many
-    orders: Mapped[List["Order"]] = relationship(back_populates="user")
+    orders: Mapped[List["Order"]] = relationship(
+        back_populates="user", foreign_keys="Order.user_id"
+    )
 
     def __repr__(self):
         return f"<User(id={self.id}, number='{self.number}', name='{self.first_name} {self.last_name}')>"
@@ -39,6 +41,8 @@ class UserAddress(Base):
     apartment: Mapped[str | None]
     city: Mapped[str] = mapped_column(nullable=False)
     country: Mapped[str] = mapped_column(nullable=False)
+    latitude: Mapped[float | None]
+    longitude: Mapped[float | None]
 
     # Many-to-One
     user: Mapped["User"] = relationship(back_populates="addresses")
@@ -0,0 +1,19 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.product import CategoryResponse, ProductResponse
+
+
+class CatalogChanges(BaseModel):
+    """
+    Catalog changes in (since, version]. Pass {version} as the next {since};
+    {has_more} means the page was cut at {limit} and more changes follow.
+    """
+
+    version: int
+    has_more: bool = False
+    products: List[ProductResponse] = []
+    deleted_product_ids: List[int] = []
+    categories: List[CategoryResponse] = []
+    deleted_category_ids: List[int] = []
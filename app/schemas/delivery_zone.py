@@ -0,0 +1,107 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+MAX_POLYGON_VERTICES = 1000
+# ~110 km, keeps the geohash cover of a zone small
+MAX_POLYGON_EXTENT_DEGREES = 1.0
+
+
+def validate_polygon(polygon: List[List[float]]) -> List[List[float]]:
+    """[[latitude, longitude], ...], an explicit closing vertex is dropped"""
+    if len(polygon) > 1 and polygon[0] == polygon[-1]:
+        polygon = polygon[:-1]
+    if len(polygon) < 3:
+        raise ValueError("The polygon must have at least 3 vertices")
+    if len(polygon) > MAX_POLYGON_VERTICES:
+        raise ValueError(
+            f"The polygon should not exceed {MAX_POLYGON_VERTICES} vertices"
+        )
+    for vertex in polygon:
+        if len(vertex) != 2:
+            raise ValueError("A vertex is a [latitude, longitude] pair")
+        latitude, longitude = vertex
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("Vertex coordinates are out of range")
+
+    latitudes = [vertex[0] for vertex in polygon]
+    longitudes = [vertex[1] for vertex in polygon]
+    if max(longitudes) - min(longitudes) > 180:
+        raise ValueError("Polygons crossing the antimeridian are not supported")
+    if (
+        max(latitudes) - min(latitudes) > MAX_POLYGON_EXTENT_DEGREES
+        or max(longitudes) - min(longitudes) > MAX_POLYGON_EXTENT_DEGREES
+    ):
+        raise ValueError(
+            f"The polygon should not span more than {MAX_POLYGON_EXTENT_DEGREES}"
+            " degrees of latitude or longitude"
+        )
+    return polygon
+
+
+class DeliveryZoneBase(BaseModel):
+    name: str
+    polygon: List[List[float]]
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, v):
+        if not v or not v.strip():
+            raise ValueError("The zone name should not be empty.")
+        if len(v.strip()) > 100:
+            raise ValueError("The zone name should not exceed 100 characters")
+        return v.strip()
+
+    @field_validator("polygon")
+    @classmethod
+    def validate_polygon(cls, v):
+        return validate_polygon(v)
+
+
+class DeliveryZoneCreate(DeliveryZoneBase):
+    restaurant_id: int
+
+
+class DeliveryZoneUpdate(BaseModel):
+    name: Optional[str] = None
+    polygon: Optional[List[List[float]]] = None
+
+    @field_validator("name")
+    @classmethod
+    def validate_name_if_provided(cls, v):
+        if v is not None:
+            return DeliveryZoneBase.validate_name(v)
+        return v
+
+    @field_validator("polygon")
+    @classmethod
+    def validate_polygon_if_provided(cls, v):
+        if v is not None:
+            return validate_polygon(v)
+        return v
+
+
+class DeliveryZoneResponse(DeliveryZoneBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    restaurant_id: int
+    created_at: datetime
+
+    @classmethod
+    def from_orm(cls, obj):
+        return cls(
+            id=obj.id,
+            restaurant_id=obj.restaurant_id,
+            name=obj.name,
+            polygon=obj.polygon,
+            created_at=obj.created_at,
+        )
+
+
+class DeliveryZoneMatch(BaseModel):
+    """A zone containing the requested point"""
+
+    zone_id: int
+    restaurant_id: int
@@ -0,0 +1,28 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class CourierPositionUpdate(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+class CourierNearbyResponse(BaseModel):
+    courier_id: int
+    distance_km: float
+    latitude: float
+    longitude: float
+
+
+class RouteStop(BaseModel):
+    kind: Literal["pickup", "dropoff"]
+    order_id: int
+    latitude: float
+    longitude: float
+
+
+class CourierRouteResponse(BaseModel):
+    courier_id: int
+    distance_km: float
+    stops: List[RouteStop]
@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+
+class KitchenEntry(BaseModel):
+    # stream entry id, acked with it
+    entry_id: str
+    # deduplication key, the relay is at-least-once
+    event_id: int
+    event_type: str
+    order_id: int
+    # order state at the event, with its items
+    order: Dict[str, Any]
+
+
+class KitchenEntries(BaseModel):
+    entries: List[KitchenEntry]
+
+
+class KitchenAckResponse(BaseModel):
+    entry_id: str
+    order_id: int
+    # the order went from NEW to PROCESSING with this ack
+    accepted: bool
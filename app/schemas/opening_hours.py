@@ -0,0 +1,93 @@
+from datetime import date, time
+from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+
+def validate_timezone(v: str) -> str:
+    try:
+        ZoneInfo(v)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {v}")
+    return v
+
+
+class OpeningInterval(BaseModel):
+    """
+    Local time interval of a weekday. closes_at <= opens_at runs past
+    midnight, opens_at == closes_at is open around the clock.
+    """
+
+    weekday: int = Field(..., ge=0, le=6, description="0 = Monday")
+    opens_at: time
+    closes_at: time
+
+    @classmethod
+    def from_orm(cls, obj):
+        return cls(weekday=obj.weekday, opens_at=obj.opens_at, closes_at=obj.closes_at)
+
+
+class OpeningHoursUpdate(BaseModel):
+    """Replaces the whole weekly schedule"""
+
+    timezone: Optional[str] = None
+    weekly: List[OpeningInterval] = Field(..., max_length=7 * 24)
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone_if_provided(cls, v):
+        if v is not None:
+            return validate_timezone(v)
+        return v
+
+
+class HoursExceptionCreate(BaseModel):
+    """Special hours of a local date, without opens_at/closes_at it is closed"""
+
+    day: date
+    opens_at: Optional[time] = None
+    closes_at: Optional[time] = None
+    note: Optional[str] = Field(None, max_length=200)
+
+    @model_validator(mode="after")
+    def validate_interval(self):
+        if (self.opens_at is None) != (self.closes_at is None):
+            raise ValueError("Pass both opens_at and closes_at or neither")
+        return self
+
+
+class HoursExceptionResponse(HoursExceptionCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+
+    @classmethod
+    def from_orm(cls, obj):
+        return cls(
+            id=obj.id,
+            day=obj.day,
+            opens_at=obj.opens_at,
+            closes_at=obj.closes_at,
+            note=obj.note,
+        )
+
+
+class OpeningHoursResponse(BaseModel):
+    restaurant_id: int
+    timezone: str
+    weekly: List[OpeningInterval] = []
+    exceptions: List[HoursExceptionResponse] = []
+
+    @classmethod
+    def from_orm(cls, obj):
+        """Restaurant with opening_hours and hours_exceptions loaded"""
+        return cls(
+            restaurant_id=obj.id,
+            timezone=obj.timezone,
+            weekly=[OpeningInterval.from_orm(hours) for hours in obj.opening_hours],
+            exceptions=[
+                HoursExceptionResponse.from_orm(exception)
+                for exception in obj.hours_exceptions
+            ],
+        )
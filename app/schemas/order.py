@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import List, Optional
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum
 
 from app.schemas.user import UserResponse
@@ -9,7 +9,8 @@ from app.schemas.user import UserResponse
 class OrderStatus(str, Enum):
     NEW = "new"
     PROCESSING = "processing"
-    DELIVERED = "delivered"
+    DELIVERY = "delivery"
+    COMPLETED = "completed"
     CANCELED = "canceled"
 
 
@@ -34,6 +35,7 @@ class OrderItemResponse(OrderItemBase):
 
     id: int
     order_id: int
+    product_name: Optional[str] = None
 
     @classmethod
     def from_orm(cls, obj):
@@ -41,6 +43,7 @@ class OrderItemResponse(OrderItemBase):
             id=obj.id,
             order_id=obj.order_id,
             product_id=obj.product_id,
+            product_name=obj.product_name,
             quantity=obj.quantity,
             price=obj.price,
         )
@@ -54,6 +57,10 @@ class OrderBase(BaseModel):
 class OrderCreate(OrderBase):
     user_id: int
     items: List[OrderItemCreate] = Field(min_length=1)
+    restaurant_id: Optional[int] = None
+    # delivery point for dispatch and delivery zone checks
+    delivery_latitude: Optional[float] = Field(None, ge=-90, le=90)
+    delivery_longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 
 class OrderUpdate(BaseModel):
@@ -69,18 +76,33 @@ class OrderResponse(OrderBase):
     user_id: int
     status: OrderStatus
     total_amount: float
+    delivery_fee: float = 0.0
     created_at: datetime
+    restaurant_id: Optional[int] = None
+    courier_id: Optional[int] = None
+    delivery_latitude: Optional[float] = None
+    delivery_longitude: Optional[float] = None
+    picked_up_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
     items: List[OrderItemResponse] = []
 
     @classmethod
     def from_orm(cls, obj):
+        """Order or OrderArchive, the archive keeps no courier or delivery point"""
         return cls(
             id=obj.id,
             user_id=obj.user_id,
             status=obj.status,
             total_amount=obj.total_amount,
+            delivery_fee=obj.delivery_fee,
             created_at=obj.created_at,
             delivery_address=obj.delivery_address,
+            restaurant_id=obj.restaurant_id,
+            courier_id=getattr(obj, "courier_id", None),
+            delivery_latitude=getattr(obj, "delivery_latitude", None),
+            delivery_longitude=getattr(obj, "delivery_longitude", None),
+            picked_up_at=getattr(obj, "picked_up_at", None),
+            delivered_at=getattr(obj, "delivered_at", None),
             items=(
                 [OrderItemResponse.from_orm(item) for item in obj.items]
                 if obj.items
@@ -89,6 +111,34 @@ class OrderResponse(OrderBase):
         )
 
 
+class OrderEtaResponse(BaseModel):
+    order_id: int
+    status: OrderStatus
+    pickup_at: datetime
+    delivery_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_cache(cls, eta: dict):
+        """Cached ETA (unix times of the database clock, naive like created_at)"""
+
+        def to_datetime(timestamp: int) -> datetime:
+            return datetime.fromtimestamp(timestamp, UTC).replace(tzinfo=None)
+
+        return cls(
+            order_id=eta["order_id"],
+            status=eta["status"],
+            pickup_at=to_datetime(eta["pickup_at"]),
+            delivery_at=to_datetime(eta["delivery_at"]),
+            updated_at=to_datetime(eta["updated_at"]),
+        )
+
+
+class DeliveryFeeQuote(BaseModel):
+    surge_multiplier: float
+    delivery_fee: float
+
+
 # Extended response schema with user information
 class OrderWithUserResponse(OrderResponse):
     model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from enum import Enum
+from pydantic import BaseModel, Field, field_validator, model_validator
+from sqlalchemy import inspect
+from typing import List, Optional
 
 
 class CategoryBase(BaseModel):
@@ -41,6 +43,7 @@ class CategoryUpdate(BaseModel):
 class CategoryResponse(CategoryBase):
     id: int
     products_count: Optional[int] = None
+    available_products_count: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -56,6 +59,7 @@ class ProductBase(BaseModel):
     price: float
     is_available: bool = False
     category_id: int
+    restaurant_id: Optional[int] = None
 
     @field_validator("name")
     @classmethod
@@ -91,6 +95,19 @@ class ProductBase(BaseModel):
             raise ValueError("The category ID must be greater than 0")
         return v
 
+    @field_validator("restaurant_id", mode="before")
+    @classmethod
+    def empty_restaurant_id_to_none(cls, v):
+        # empty CSV cell on import
+        return None if v == "" else v
+
+    @field_validator("restaurant_id")
+    @classmethod
+    def validate_restaurant_id(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError("The restaurant ID must be greater than 0")
+        return v
+
 
 class ProductCreate(ProductBase):
     pass
@@ -102,6 +119,7 @@ class ProductUpdate(BaseModel):
     price: Optional[float] = None
     is_available: Optional[bool] = None
     category_id: Optional[int] = None
+    restaurant_id: Optional[int] = None
 
     @field_validator("name")
     @classmethod
@@ -141,6 +159,13 @@ class ProductUpdate(BaseModel):
             raise ValueError("The category ID must be greater than 0")
         return v
 
+    @field_validator("restaurant_id")
+    @classmethod
+    def validate_restaurant_id_if_provided(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError("The restaurant ID must be greater than 0")
+        return v
+
 
 class ProductResponse(ProductBase):
     id: int
@@ -151,14 +176,93 @@ class ProductResponse(ProductBase):
 
     @classmethod
     def from_orm(cls, obj):
+        # category is only included when it was eager loaded, a lazy load
+        # per product is not possible (and not wanted) under AsyncSession
+        category = None
+        if "category" not in inspect(obj).unloaded and obj.category:
+            category = {"id": obj.category.id, "name": obj.category.name}
+
         return cls(
             id=obj.id,
             name=obj.name,
             price=obj.price,
             description=obj.description,
-            category=(
-                {"id": obj.category.id, "name": obj.category.name}
-                if obj.category
-                else None
-            ),
+            is_available=obj.is_available,
+            category_id=obj.category_id,
+            restaurant_id=obj.restaurant_id,
+            category=category,
         )
+
+
+class ProductSortField(str, Enum):
+    ID = "id"
+    PRICE = "price"
+    NAME = "name"
+
+
+class ProductPage(BaseModel):
+    items: List[ProductResponse]
+    next_cursor: Optional[str] = None
+
+
+class ProductSuggestion(BaseModel):
+    id: int
+    name: str
+
+
+class ProductImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ProductImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ProductImportReport(BaseModel):
+    total_rows: int
+    created: int
+    updated: int
+    errors: List[ProductImportRowError] = []
+
+
+class ProductBulkItem(BaseModel):
+    id: int
+    price: Optional[float] = None
+    is_available: Optional[bool] = None
+
+    @field_validator("price")
+    @classmethod
+    def validate_price_if_provided(cls, v):
+        if v is not None:
+            if v <= 0:
+                raise ValueError("The price must be more than 0")
+            if v > 999999.99:
+                raise ValueError("The price is too high")
+            return round(v, 2)
+        return v
+
+
+class ProductBulkUpdate(BaseModel):
+    items: List[ProductBulkItem] = Field(min_length=1, max_length=10_000)
+
+    @model_validator(mode="after")
+    def validate_unique_ids(self):
+        # UPDATE ... FROM (VALUES ...) would apply one of the duplicates at random
+        seen, duplicates = set(), set()
+        for item in self.items:
+            if item.id in seen:
+                duplicates.add(item.id)
+            seen.add(item.id)
+        if duplicates:
+            raise ValueError(f"Duplicate product ids: {sorted(duplicates)}")
+        return self
+
+
+class CategoryAvailabilityUpdate(BaseModel):
+    is_available: bool
+
+
+class ProductBulkUpdateResult(BaseModel):
+    updated: int
@@ -0,0 +1,40 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.order import OrderStatus
+
+
+class OrderDailyRollupResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    status: OrderStatus
+    order_count: int
+    item_count: int
+    revenue: float
+
+    @classmethod
+    def from_orm(cls, obj):
+        return cls(
+            day=obj.day,
+            status=obj.status.value,
+            order_count=obj.order_count,
+            item_count=obj.item_count,
+            revenue=obj.revenue,
+        )
+
+
+class ProductDailyRollupResponse(OrderDailyRollupResponse):
+    product_id: int
+
+    @classmethod
+    def from_orm(cls, obj):
+        return cls(
+            day=obj.day,
+            status=obj.status.value,
+            product_id=obj.product_id,
+            order_count=obj.order_count,
+            item_count=obj.item_count,
+            revenue=obj.revenue,
+        )
@@ -1,6 +1,9 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict
+
+from app.schemas.opening_hours import validate_timezone
+from app.schemas.product import ProductResponse
 
 
 class RestaurantBase(BaseModel):
@@ -12,6 +15,11 @@ class RestaurantBase(BaseModel):
     apartment: str
     city: str
     country: str
+    # geocoded from the address when omitted
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    # IANA time zone of the opening hours
+    timezone: str = "UTC"
 
     @field_validator("name", "street", "house_number", "apartment", "city", "country")
     @classmethod
@@ -20,6 +28,11 @@ class RestaurantBase(BaseModel):
             raise ValueError("Поле не может быть пустым")
         return v.strip()
 
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v):
+        return validate_timezone(v)
+
 
 class RestaurantCreate(RestaurantBase):
     pass
@@ -34,6 +47,9 @@ class RestaurantUpdate(BaseModel):
     apartment: Optional[str] = None
     city: Optional[str] = None
     country: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    timezone: Optional[str] = None
 
     @field_validator("name", "street", "house_number", "apartment", "city", "country")
     @classmethod
@@ -42,6 +58,13 @@ class RestaurantUpdate(BaseModel):
             raise ValueError("Поле не может быть пустым")
         return v.strip() if v else v
 
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone_if_provided(cls, v):
+        if v is not None:
+            return validate_timezone(v)
+        return v
+
 
 class RestaurantResponse(RestaurantBase):
     model_config = ConfigDict(from_attributes=True)
@@ -51,6 +74,7 @@ class RestaurantResponse(RestaurantBase):
     @classmethod
     def from_orm(cls, obj):
         return cls(
+            id=obj.id,
             name=obj.name,
             description=obj.description,
             street=obj.street,
@@ -58,9 +82,27 @@ class RestaurantResponse(RestaurantBase):
             apartment=obj.apartment,
             city=obj.city,
             country=obj.country,
+            latitude=obj.latitude,
+            longitude=obj.longitude,
+            timezone=obj.timezone,
         )
 
 
+class RestaurantNearbyResponse(RestaurantResponse):
+    distance_km: float
+
+    @classmethod
+    def from_orm(cls, obj, distance_km: float):
+        return cls(
+            **RestaurantResponse.from_orm(obj).model_dump(), distance_km=distance_km
+        )
+
+
+class RestaurantPage(BaseModel):
+    items: List[RestaurantResponse]
+    next_cursor: Optional[str] = None
+
+
 # Additional schemes for specific cases
 class RestaurantPublicInfo(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -82,3 +124,39 @@ class RestaurantWithFullAddress(RestaurantResponse):
     @property
     def full_address(self) -> str:
         return f"{self.street} {self.house_number}, кв. {self.apartment}, {self.city}, {self.country}"
+
+
+class MenuCategory(BaseModel):
+    id: int
+    name: str
+    products: List[ProductResponse] = []
+
+
+class RestaurantMenuResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    categories: List[MenuCategory] = []
+
+    @classmethod
+    def from_orm(cls, obj):
+        """
+        Group restaurant.products (with product.category eager loaded) by
+        category, keeping the order of restaurant.products
+        """
+        categories: Dict[int, MenuCategory] = {}
+        for product in obj.products:
+            menu_category = categories.get(product.category_id)
+            if menu_category is None:
+                menu_category = MenuCategory(
+                    id=product.category.id, name=product.category.name
+                )
+                categories[product.category_id] = menu_category
+            menu_category.products.append(ProductResponse.from_orm(product))
+
+        return cls(
+            id=obj.id,
+            name=obj.name,
+            description=obj.description,
+            categories=list(categories.values()),
+        )
@@ -51,6 +51,9 @@ class UserAddressBase(BaseModel):
     apartment: str
     city: str
     country: str
+    # geocoded from the address when omitted
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
     @field_validator("street", "city", "country")
     @classmethod
@@ -71,6 +74,8 @@ class UserAddressUpdate(BaseModel):
     apartment: Optional[str] = None
     city: Optional[str] = None
     country: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
     @field_validator("street", "city", "country")
     @classmethod
@@ -89,11 +94,15 @@ class UserAddressResponse(UserAddressBase):
     @classmethod
     def from_orm(cls, obj):
         return cls(
+            id=obj.id,
+            user_id=obj.user_id,
             street=obj.street,
             house_number=obj.house_number,
             apartment=obj.apartment,
             city=obj.city,
             country=obj.country,
+            latitude=obj.latitude,
+            longitude=obj.longitude,
         )
 
 
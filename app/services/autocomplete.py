@@ -0,0 +1,221 @@
+"""
+Product autocomplete
+
+Keystrokes are answered from an in-process prefix trie whenever possible:
+  - every prefix up to AUTOCOMPLETE_TRIE_DEPTH characters is precomputed from
+    the catalog (the first keystrokes are by far the most frequent ones)
+  - longer prefixes that are requested often enough are added to the trie
+    with the result of their first database lookups
+Everything else falls back to Postgres, where a pg_trgm GIN index on
+products.name serves both prefix (ILIKE) and typo tolerant (%) matching.
+Catalog writes bump a generation shared by all workers
+(app.services.index_generation); a worker whose trie is older stops
+answering from it until the periodic task has rebuilt it.
+"""
+
+import asyncio
+import heapq
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import db_manager
+from app.models.product import Product
+from app.models.report import ProductDailyRollup
+from app.services.index_generation import bump_index_generation, get_index_generation
+from app.schemas.product import ProductSuggestion
+
+INDEX_NAME = "autocomplete"
+
+# popularity window for ranking suggestions
+POPULARITY_DAYS = 30
+
+
+def normalize(prefix: str) -> str:
+    return " ".join(prefix.lower().split())
+
+
+class TrieNode:
+    __slots__ = ("children", "suggestions")
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.suggestions: Optional[List[ProductSuggestion]] = None
+
+
+class AutocompleteIndex:
+
+    def __init__(self, depth: int, size: int, hot_threshold: int, max_hot: int):
+        self.depth = depth
+        self.size = size
+        self.hot_threshold = hot_threshold
+        self.max_hot = max_hot
+
+        self._root = TrieNode()
+        self._hits: Dict[str, int] = {}
+        self._hot_count = 0
+        self._stale = True
+        # shared generation the trie was built from
+        self._generation = -1
+        self._built_at = 0.0
+
+    @property
+    def needs_rebuild(self) -> bool:
+        age = time.monotonic() - self._built_at
+        return self._stale or age > settings.AUTOCOMPLETE_MAX_AGE_SECONDS
+
+    async def sync(self):
+        """Stop answering from the trie if any worker changed the catalog"""
+        if await get_index_generation(INDEX_NAME) > self._generation:
+            self._stale = True
+
+    async def invalidate(self):
+        """Drop cached answers of every worker after a catalog change"""
+        self._stale = True
+        await bump_index_generation(INDEX_NAME)
+
+    def lookup(self, prefix: str) -> Optional[List[ProductSuggestion]]:
+        """Cached suggestions for {prefix} or None on a miss"""
+        if self._stale:
+            return None
+
+        node = self._root
+        for char in normalize(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node.suggestions
+
+    def record(self, prefix: str, suggestions: List[ProductSuggestion]):
+        """Count a database lookup and keep the result once {prefix} gets hot"""
+        if self._stale:
+            return
+
+        prefix = normalize(prefix)
+        hits = self._hits.get(prefix, 0) + 1
+        self._hits[prefix] = hits
+        if hits < self.hot_threshold or self._hot_count >= self.max_hot:
+            return
+
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, TrieNode())
+        node.suggestions = suggestions
+        self._hot_count += 1
+        del self._hits[prefix]
+
+    def rebuild(self, products: List[Tuple[int, str, int]], generation: int):
+        """
+        Precompute the top {size} suggestions for all short prefixes
+
+        Args:
+            products: (id, name, popularity) of available products
+            generation: Shared generation read before {products} were
+                loaded, a catalog change in the meantime makes the next
+                sync() mark the trie stale again
+        """
+        heaps: Dict[str, list] = {}
+        for product_id, name, popularity in products:
+            key = normalize(name)
+            # min-heap by (popularity, shorter name first), keeps the best {size}
+            entry = (popularity, -len(key), -product_id, name)
+            for length in range(1, min(self.depth, len(key)) + 1):
+                heap = heaps.setdefault(key[:length], [])
+                if len(heap) < self.size:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        root = TrieNode()
+        for prefix, heap in heaps.items():
+            node = root
+            for char in prefix:
+                node = node.children.setdefault(char, TrieNode())
+            node.suggestions = [
+                ProductSuggestion(id=-neg_id, name=name)
+                for _, _, neg_id, name in sorted(heap, reverse=True)
+            ]
+
+        self._root = root
+        self._hits = {}
+        self._hot_count = 0
+        self._generation = generation
+        self._stale = False
+        self._built_at = time.monotonic()
+
+
+autocomplete_index = AutocompleteIndex(
+    depth=settings.AUTOCOMPLETE_TRIE_DEPTH,
+    size=settings.AUTOCOMPLETE_SIZE,
+    hot_threshold=settings.AUTOCOMPLETE_HOT_THRESHOLD,
+    max_hot=settings.AUTOCOMPLETE_MAX_HOT_PREFIXES,
+)
+
+
+async def autocomplete_from_db(
+    db: AsyncSession, prefix: str, limit: int
+) -> List[ProductSuggestion]:
+    """Prefix and trigram similarity matches, both served by the trigram index"""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    result = await db.execute(
+        select(Product.id, Product.name)
+        .filter(Product.is_available.is_(True))
+        .filter(
+            or_(
+                Product.name.ilike(f"{escaped}%"),
+                Product.name.op("%")(prefix),
+            )
+        )
+        .order_by(func.similarity(Product.name, prefix).desc(), Product.id)
+        .limit(limit)
+    )
+    return [ProductSuggestion(id=id_, name=name) for id_, name in result.all()]
+
+
+async def autocomplete(
+    db: AsyncSession, prefix: str, limit: int
+) -> List[ProductSuggestion]:
+    await autocomplete_index.sync()
+    cached = autocomplete_index.lookup(prefix)
+    if cached is not None:
+        return cached[:limit]
+
+    suggestions = await autocomplete_from_db(db, prefix, autocomplete_index.size)
+    autocomplete_index.record(prefix, suggestions)
+    return suggestions[:limit]
+
+
+async def load_autocomplete_products(db: AsyncSession) -> List[Tuple[int, str, int]]:
+    """Available products with the quantity sold in the last POPULARITY_DAYS"""
+    since = date.today() - timedelta(days=POPULARITY_DAYS)
+    sold = (
+        select(
+            ProductDailyRollup.product_id,
+            func.sum(ProductDailyRollup.item_count).label("quantity"),
+        )
+        .filter(ProductDailyRollup.day >= since)
+        .group_by(ProductDailyRollup.product_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Product.id, Product.name, func.coalesce(sold.c.quantity, 0))
+        .outerjoin(sold, sold.c.product_id == Product.id)
+        .filter(Product.is_available.is_(True))
+    )
+    return [(id_, name, int(quantity)) for id_, name, quantity in result.all()]
+
+
+async def refresh_autocomplete_index():
+    """Periodic job for TaskManager"""
+    await autocomplete_index.sync()
+    if not autocomplete_index.needs_rebuild:
+        return
+
+    generation = await get_index_generation(INDEX_NAME)
+    async with db_manager.get_session() as session:
+        products = await load_autocomplete_products(session)
+    await asyncio.to_thread(autocomplete_index.rebuild, products, generation)
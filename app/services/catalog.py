@@ -0,0 +1,21 @@
+"""
+Single place where catalog caches learn about product/category writes.
+Called once per committed write (or once per bulk batch) with the
+restaurants whose menus were affected.
+"""
+
+from typing import Iterable, Optional
+
+from app.services.autocomplete import autocomplete_index
+from app.services.catalog_version import publish_catalog_version
+from app.services.category_list import invalidate_category_list
+from app.services.menu_snapshot import invalidate_menu_snapshots
+
+
+async def catalog_changed(restaurant_ids: Iterable[Optional[int]] = ()):
+    await publish_catalog_version()
+    await autocomplete_index.invalidate()
+    await invalidate_category_list()
+    await invalidate_menu_snapshots(
+        {restaurant_id for restaurant_id in restaurant_ids if restaurant_id}
+    )
@@ -0,0 +1,264 @@
+"""
+Memory-mapped catalog snapshot shared by all workers of a host
+
+One worker per host builds a compact snapshot file of all products (as
+pre-rendered ProductResponse JSON) and categories, every worker maps it
+read-only, so the pages live once in the OS page cache. Lookups are bisects
+over sorted id arrays read straight from the mapping, no deserialization.
+
+A new file is written next to the current one and swapped in with
+os.replace(); workers still holding the old mapping keep reading it until
+they remap. Builds are serialized per host with flock() on a lock file.
+
+File layout (native byte order, every section 8-byte aligned):
+    header        magic, catalog version, product count n, category count m
+    product_ids   int32[n]    sorted
+    json_offsets  uint64[n+1] product i is blob[json_offsets[i]:json_offsets[i+1]]
+    category_ids  int32[m]    sorted
+    category_pos  uint32[m+1] category j owns by_category[category_pos[j]:...[j+1]]
+    by_category   uint32[n]   product indexes ordered by (category_id, id)
+    blob          bytes
+"""
+
+import asyncio
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.core.config import settings
+from app.core.database import db_manager
+from app.models.product import Category, Product
+from app.schemas.product import ProductResponse
+from app.services.catalog_version import LAST_VERSION_SQL, get_catalog_version
+
+MAGIC = b"CATSNAP1"
+HEADER = struct.Struct("=8sQII")
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _section(data: bytes) -> bytes:
+    return data + b"\0" * (_aligned(len(data)) - len(data))
+
+
+def write_snapshot(
+    path: str,
+    version: int,
+    products: List[Tuple[int, int, bytes]],
+    category_ids: List[int],
+):
+    """
+    Write a snapshot file and atomically swap it in
+
+    Args:
+        path: Snapshot file path
+        version: Catalog version the data was read at
+        products: (id, category_id, json) sorted by id
+        category_ids: All category ids, sorted
+    """
+    json_offsets = array("Q", [0])
+    for _, _, body in products:
+        json_offsets.append(json_offsets[-1] + len(body))
+
+    by_category = sorted(
+        range(len(products)), key=lambda i: (products[i][1], products[i][0])
+    )
+    product_categories = [products[i][1] for i in by_category]
+    category_pos = array("I", [0])
+    cursor = 0
+    for category_id in category_ids:
+        while (
+            cursor < len(product_categories)
+            and product_categories[cursor] == category_id
+        ):
+            cursor += 1
+        category_pos.append(cursor)
+
+    sections = [
+        HEADER.pack(MAGIC, version, len(products), len(category_ids)),
+        array("i", [product_id for product_id, _, _ in products]).tobytes(),
+        json_offsets.tobytes(),
+        array("i", category_ids).tobytes(),
+        category_pos.tobytes(),
+        array("I", by_category).tobytes(),
+    ]
+
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".catalog-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            for section in sections:
+                file.write(_section(section))
+            for _, _, body in products:
+                file.write(body)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class CatalogSnapshot:
+    """Read-only view of one snapshot file"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.inode = (stat.st_dev, stat.st_ino)
+
+        magic, self.version, n, m = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a catalog snapshot")
+
+        view = memoryview(self._mm)
+        offset = _aligned(HEADER.size)
+
+        def take(fmt: str, count: int) -> memoryview:
+            nonlocal offset
+            size = struct.calcsize(fmt) * count
+            section = view[offset : offset + size].cast(fmt)
+            offset = _aligned(offset + size)
+            return section
+
+        self._product_ids = take("i", n)
+        self._json_offsets = take("Q", n + 1)
+        self._category_ids = take("i", m)
+        self._category_pos = take("I", m + 1)
+        self._by_category = take("I", n)
+        self._blob_start = offset
+        self._views = [
+            view,
+            self._product_ids,
+            self._json_offsets,
+            self._category_ids,
+            self._category_pos,
+            self._by_category,
+        ]
+
+    def _product_json(self, index: int) -> bytes:
+        start = self._blob_start + self._json_offsets[index]
+        end = self._blob_start + self._json_offsets[index + 1]
+        return self._mm[start:end]
+
+    def get_product(self, product_id: int) -> Optional[bytes]:
+        index = bisect_left(self._product_ids, product_id)
+        if index == len(self._product_ids) or self._product_ids[index] != product_id:
+            return None
+        return self._product_json(index)
+
+    def list_category(self, category_id: int) -> Optional[bytes]:
+        """JSON array of the category's products or None for an unknown category"""
+        index = bisect_left(self._category_ids, category_id)
+        if index == len(self._category_ids) or self._category_ids[index] != category_id:
+            return None
+        positions = self._by_category[
+            self._category_pos[index] : self._category_pos[index + 1]
+        ]
+        return b"[" + b",".join(self._product_json(i) for i in positions) + b"]"
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._mm.close()
+
+
+class CatalogSnapshotStore:
+    """The snapshot currently mapped by this worker"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.current: Optional[CatalogSnapshot] = None
+
+    def reload(self) -> bool:
+        """Map the file on disk if it was swapped since the last load"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if self.current is not None and self.current.inode == (
+            stat.st_dev,
+            stat.st_ino,
+        ):
+            return False
+
+        # lookups never await, nothing can be reading the old mapping here
+        previous, self.current = self.current, CatalogSnapshot(self.path)
+        if previous is not None:
+            previous.close()
+        return True
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+
+
+def _snapshot_path() -> str:
+    directory = settings.CATALOG_SNAPSHOT_DIR
+    if not os.path.isdir(directory):
+        directory = tempfile.gettempdir()
+    return os.path.join(directory, "food-delivery-catalog.snap")
+
+
+catalog_snapshots = CatalogSnapshotStore(_snapshot_path())
+
+
+async def build_catalog_snapshot(path: str):
+    async with db_manager.get_session() as session:
+        # read first: the data below is at least as new as {version}
+        version = (await session.execute(LAST_VERSION_SQL)).scalar_one()
+        result = await session.execute(
+            select(Product).options(joinedload(Product.category)).order_by(Product.id)
+        )
+        products = result.scalars().all()
+        result = await session.execute(select(Category.id).order_by(Category.id))
+        category_ids = result.scalars().all()
+
+    def render_and_write():
+        rendered = [
+            (
+                product.id,
+                product.category_id,
+                ProductResponse.from_orm(product).model_dump_json().encode("utf-8"),
+            )
+            for product in products
+        ]
+        write_snapshot(path, version, rendered, list(category_ids))
+
+    await asyncio.to_thread(render_and_write)
+
+
+async def refresh_catalog_snapshot():
+    """Periodic job for TaskManager: keep the mapped snapshot at the catalog version"""
+    target = await get_catalog_version()
+    catalog_snapshots.reload()
+    current = catalog_snapshots.current
+    if current is not None and current.version >= target:
+        return
+
+    with open(f"{catalog_snapshots.path}.lock", "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # another worker of this host is building, remap on the next run
+            return
+
+        # the snapshot may have been swapped while we waited for the lock
+        catalog_snapshots.reload()
+        current = catalog_snapshots.current
+        if current is None or current.version < target:
+            await build_catalog_snapshot(catalog_snapshots.path)
+            catalog_snapshots.reload()
@@ -0,0 +1,63 @@
+"""
+Current catalog version for conditional requests
+
+Catalog rows draw their versions from catalog_version_seq, but the current
+version is the one stored in catalog_version by the last committed catalog
+write (app.models.catalog.CatalogVersion): sequence values are handed out
+in allocation order and also count draws of transactions that have not
+committed, so a client synced to the sequence's last_value could skip a
+change for good. After every committed catalog write the version is
+published to Redis, so ETag checks on catalog endpoints cost one Redis GET
+and no database query.
+"""
+
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.database import db_manager, redis_manager
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+# every version up to it is committed and visible to later statements
+LAST_VERSION_SQL = text("SELECT version FROM catalog_version WHERE id = 1")
+
+# concurrent writers may publish out of order, the version never goes back
+_SET_IF_GREATER = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tonumber(ARGV[1]) > current then
+    redis.call('SET', KEYS[1], ARGV[1])
+    return tonumber(ARGV[1])
+end
+return current
+"""
+
+
+def catalog_etag(version: int) -> str:
+    # weak: the same version is served plain and gzipped
+    return f'W/"catalog-{version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header, W/ prefixes are ignored"""
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+async def publish_catalog_version() -> int:
+    async with db_manager.get_session() as session:
+        version = (await session.execute(LAST_VERSION_SQL)).scalar_one()
+
+    async with redis_manager.get_client() as redis_client:
+        published = await asyncio.to_thread(
+            redis_client.eval, _SET_IF_GREATER, 1, CATALOG_VERSION_KEY, version
+        )
+    return int(published)
+
+
+async def get_catalog_version() -> int:
+    async with redis_manager.get_client() as redis_client:
+        version = await asyncio.to_thread(redis_client.get, CATALOG_VERSION_KEY)
+    if version is None:
+        return await publish_catalog_version()
+    return int(version)
@@ -0,0 +1,56 @@
+"""
+Cached category list with product counts
+
+The list is stored in Redis under a key that embeds a generation number.
+Catalog writes bump the generation instead of deleting the key, so a list
+computed from a snapshot taken before the write can never be stored under
+the current key. Entries of old generations simply expire.
+"""
+
+import asyncio
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.database import redis_manager
+from app.schemas.product import CategoryResponse
+
+GENERATION_KEY = "catalog:categories:generation"
+
+_category_list = TypeAdapter(List[CategoryResponse])
+
+
+def _list_key(generation: str) -> str:
+    return f"catalog:categories:{generation}"
+
+
+async def get_category_list_generation() -> str:
+    async with redis_manager.get_client() as redis_client:
+        generation = await asyncio.to_thread(redis_client.get, GENERATION_KEY)
+    return generation or "0"
+
+
+async def get_cached_category_list(
+    generation: str,
+) -> Optional[List[CategoryResponse]]:
+    async with redis_manager.get_client() as redis_client:
+        payload = await asyncio.to_thread(redis_client.get, _list_key(generation))
+    if payload is None:
+        return None
+    return _category_list.validate_json(payload)
+
+
+async def cache_category_list(generation: str, categories: List[CategoryResponse]):
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(
+            redis_client.set,
+            _list_key(generation),
+            _category_list.dump_json(categories),
+            ex=settings.CATEGORY_LIST_TTL_SECONDS,
+        )
+
+
+async def invalidate_category_list():
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(redis_client.incr, GENERATION_KEY)
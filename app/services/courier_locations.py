@@ -0,0 +1,190 @@
+"""
+Courier location ingestion
+
+WebSocket handlers only parse pings and add them to an in-process buffer,
+no I/O per ping. A periodic job flushes the buffer:
+  - the latest position of each courier to the dispatch GEO set, one
+    pipelined round trip (app.services.dispatch.record_positions)
+  - every accepted ping to courier_locations, one COPY
+
+Pings are deduplicated per courier: a ping not newer than the last accepted
+one of that courier (retransmits, reordering) is dropped. Delivery is at
+most once, a failed flush is logged and its pings are lost; the next ping
+of each courier restores its position.
+"""
+
+import asyncio
+import json
+import math
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import db_manager, redis_manager
+from app.services.dispatch import record_positions
+
+# (courier_id, latitude, longitude, unix timestamp)
+Ping = Tuple[int, float, float, float]
+
+HISTORY_TABLE = "courier_locations"
+HISTORY_COLUMNS = ["courier_id", "latitude", "longitude", "recorded_at"]
+
+# a client clock this far ahead is not trusted
+MAX_CLOCK_SKEW_SECONDS = 60
+# dedupe state of a courier is kept this long after their last ping
+IDLE_COURIER_SECONDS = 3600
+
+PRUNE_SQL = text(
+    """
+    DELETE FROM courier_locations
+    WHERE id IN (
+        SELECT id FROM courier_locations
+        WHERE recorded_at < :cutoff
+        LIMIT :limit
+    )
+    """
+)
+
+
+def parse_pings(message: str, now: float) -> List[Tuple[float, float, float]]:
+    """
+    A ping {"lat": .., "lon": .., "ts": ..} or a list of them; ts (unix
+    seconds) is optional and defaults to {now}
+
+    Returns:
+        List of (latitude, longitude, timestamp)
+
+    Raises:
+        ValueError: If the message is not valid or has more than
+            COURIER_LOCATION_FLUSH_BATCH_SIZE pings
+    """
+    payload = json.loads(message)
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list):
+        raise ValueError("Expected a ping object or a list of pings")
+    # one message must not be able to fill the buffer past a flush batch
+    max_pings = settings.COURIER_LOCATION_FLUSH_BATCH_SIZE
+    if len(payload) > max_pings:
+        raise ValueError(f"A message should not exceed {max_pings} pings")
+
+    pings = []
+    for ping in payload:
+        try:
+            latitude = float(ping["lat"])
+            longitude = float(ping["lon"])
+            timestamp = float(ping.get("ts", now))
+        except (TypeError, KeyError, ValueError):
+            raise ValueError("A ping needs numeric lat and lon")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError("Coordinates are out of range")
+        if not math.isfinite(timestamp):
+            raise ValueError("Invalid ping timestamp")
+        pings.append(
+            (latitude, longitude, min(timestamp, now + MAX_CLOCK_SKEW_SECONDS))
+        )
+    return pings
+
+
+class LocationBuffer:
+
+    def __init__(self, max_history: int):
+        self.max_history = max_history
+        self.dropped = 0
+        self._latest: Dict[int, Ping] = {}
+        self._history: List[Ping] = []
+        self._last_accepted: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._history)
+
+    def add(self, courier_id: int, latitude: float, longitude: float, timestamp: float):
+        """Called from WebSocket handlers, O(1)"""
+        if timestamp <= self._last_accepted.get(courier_id, float("-inf")):
+            return
+        self._last_accepted[courier_id] = timestamp
+
+        ping = (courier_id, latitude, longitude, timestamp)
+        self._latest[courier_id] = ping
+        if len(self._history) < self.max_history:
+            self._history.append(ping)
+        else:
+            # the flush fell behind: keep positions current, skip history
+            self.dropped += 1
+
+    def take(self) -> Tuple[List[Ping], List[Ping]]:
+        """(latest ping per courier, all pings) since the previous take"""
+        latest, history = list(self._latest.values()), self._history
+        self._latest, self._history = {}, []
+        return latest, history
+
+    def forget_idle(self, before: float):
+        """Dedupe state of couriers silent since {before}"""
+        self._last_accepted = {
+            courier_id: timestamp
+            for courier_id, timestamp in self._last_accepted.items()
+            if timestamp >= before
+        }
+
+
+location_buffer = LocationBuffer(settings.COURIER_LOCATION_MAX_BUFFER)
+
+
+async def flush_courier_locations() -> int:
+    """
+    Write buffered pings to Redis and courier_locations
+
+    Returns:
+        int: Number of flushed pings
+    """
+    latest, history = location_buffer.take()
+    if not latest:
+        return 0
+
+    try:
+        async with redis_manager.get_client() as redis_client:
+            await asyncio.to_thread(record_positions, redis_client, latest)
+
+        records = [
+            (courier_id, latitude, longitude, datetime.fromtimestamp(timestamp, UTC))
+            for courier_id, latitude, longitude, timestamp in history
+        ]
+        async with db_manager.get_session() as session:
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            if records:
+                await raw_connection.driver_connection.copy_records_to_table(
+                    HISTORY_TABLE, records=records, columns=HISTORY_COLUMNS
+                )
+    except Exception as e:
+        print(f"Courier location flush of {len(history)} pings failed: {e}")
+        return 0
+
+    if location_buffer.dropped:
+        print(f"Courier location buffer full, {location_buffer.dropped} pings dropped")
+        location_buffer.dropped = 0
+    return len(history)
+
+
+async def run_courier_location_flush() -> bool:
+    """Periodic job for TaskManager, returns True while the buffer refills fast"""
+    flushed = await flush_courier_locations()
+    return flushed >= settings.COURIER_LOCATION_FLUSH_BATCH_SIZE
+
+
+async def prune_courier_locations() -> bool:
+    """Periodic job for TaskManager, deletes history past the retention period"""
+    location_buffer.forget_idle(time.time() - IDLE_COURIER_SECONDS)
+
+    cutoff = datetime.now(UTC) - timedelta(
+        days=settings.COURIER_LOCATION_RETENTION_DAYS
+    )
+    async with db_manager.get_session() as session:
+        result = await session.execute(
+            PRUNE_SQL,
+            {"cutoff": cutoff, "limit": settings.COURIER_LOCATION_PRUNE_BATCH_SIZE},
+        )
+    return result.rowcount == settings.COURIER_LOCATION_PRUNE_BATCH_SIZE
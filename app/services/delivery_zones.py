@@ -0,0 +1,280 @@
+"""
+Delivery zone lookups
+
+Every zone polygon is compiled into a geohash cell cover when the zone is
+written, and the cover is stored with the zone:
+  - cells entirely inside the polygon, as coarse as possible
+  - cells on its boundary, at COVER_PRECISION
+The in-memory index maps cells to zones. A lookup walks the prefixes of the
+point's geohash through it: an interior hit is a match without any geometry,
+only boundary cells run an exact point-in-polygon test against their zone.
+Zone writes bump a generation shared by all workers
+(app.services.index_generation). Lookups never leave the process: a periodic
+task compares the generation every DELIVERY_ZONE_REFRESH_INTERVAL_SECONDS and
+rebuilds an older index, or one older than DELIVERY_ZONE_MAX_AGE_SECONDS. The
+worker that made the write rebuilds before its next lookup.
+
+Polygons are [latitude, longitude] vertex lists and must not cross the
+antimeridian.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from app.core import geohash
+from app.core.config import settings
+from app.core.database import db_manager
+from app.models.delivery_zone import DeliveryZone
+from app.services.index_generation import bump_index_generation, get_index_generation
+
+INDEX_NAME = "delivery_zones"
+
+# ~1.2 x 0.6 km boundary cells
+COVER_PRECISION = 6
+# the schema caps the polygon extent well below this, see
+# app.schemas.delivery_zone.MAX_POLYGON_EXTENT_DEGREES
+MAX_BOUNDARY_CELLS = 20000
+
+Polygon = Sequence[Sequence[float]]
+
+
+class ZoneMatch(NamedTuple):
+    zone_id: int
+    restaurant_id: int
+
+
+def point_in_polygon(latitude: float, longitude: float, polygon: Polygon) -> bool:
+    """Ray casting (even-odd rule)"""
+    inside = False
+    lat_j, lon_j = polygon[-1]
+    for lat_i, lon_i in polygon:
+        if (lat_i > latitude) != (lat_j > latitude):
+            crossing = lon_i + (latitude - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if longitude < crossing:
+                inside = not inside
+        lat_j, lon_j = lat_i, lon_i
+    return inside
+
+
+def _segment_hits_box(
+    lat1: float, lon1: float, lat2: float, lon2: float, box: geohash.Box
+) -> bool:
+    """Liang-Barsky clipping of the segment against the box"""
+    south, west, north, east = box
+    d_lon, d_lat = lon2 - lon1, lat2 - lat1
+    t_min, t_max = 0.0, 1.0
+    for p, q in (
+        (-d_lon, lon1 - west),
+        (d_lon, east - lon1),
+        (-d_lat, lat1 - south),
+        (d_lat, north - lat1),
+    ):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t_min = max(t_min, t)
+        else:
+            t_max = min(t_max, t)
+        if t_min > t_max:
+            return False
+    return True
+
+
+INSIDE, OUTSIDE, BOUNDARY = range(3)
+
+
+Edge = Tuple[float, float, float, float]
+
+
+def classify(
+    box: geohash.Box, polygon: Polygon, bounds: geohash.Box, edges: List[Edge]
+) -> Tuple[int, List[Edge]]:
+    """
+    State of the cell and the edges touching it. Only the edges touching the
+    parent cell can touch the cell, they are all that is tested.
+    """
+    south, west, north, east = box
+    if north < bounds[0] or south > bounds[2] or east < bounds[1] or west > bounds[3]:
+        return OUTSIDE, []
+
+    touching = [edge for edge in edges if _segment_hits_box(*edge, box)]
+    if touching:
+        return BOUNDARY, touching
+
+    # no edge touches the cell: it is entirely inside or entirely outside
+    center_inside = point_in_polygon((south + north) / 2, (west + east) / 2, polygon)
+    return (INSIDE if center_inside else OUTSIDE), []
+
+
+def polygon_bounds(polygon: Polygon) -> geohash.Box:
+    latitudes = [vertex[0] for vertex in polygon]
+    longitudes = [vertex[1] for vertex in polygon]
+    return min(latitudes), min(longitudes), max(latitudes), max(longitudes)
+
+
+def polygon_edges(polygon: Polygon) -> List[Edge]:
+    return [
+        (previous[0], previous[1], vertex[0], vertex[1])
+        for previous, vertex in zip([polygon[-1], *polygon[:-1]], polygon)
+    ]
+
+
+def cover(polygon: Polygon) -> Tuple[List[str], List[str]]:
+    """
+    (interior cells, boundary cells) of the polygon
+
+    Raises:
+        ValueError: If the boundary needs more than MAX_BOUNDARY_CELLS cells
+    """
+    bounds = polygon_bounds(polygon)
+    edges = polygon_edges(polygon)
+    interior, boundary = [], []
+
+    pending = [(cell, edges) for cell in geohash.BASE32]
+    while pending:
+        cell, parent_edges = pending.pop()
+        state, touching = classify(
+            geohash.decode_box(cell), polygon, bounds, parent_edges
+        )
+        if state == INSIDE:
+            interior.append(cell)
+        elif state == BOUNDARY:
+            if len(cell) >= COVER_PRECISION:
+                boundary.append(cell)
+                if len(boundary) > MAX_BOUNDARY_CELLS:
+                    raise ValueError("The polygon is too large")
+            else:
+                pending.extend((child, touching) for child in geohash.children(cell))
+    return interior, boundary
+
+
+class ZoneIndex:
+    """Immutable once built, replaced as a whole on rebuild"""
+
+    def __init__(self, zones: List[Tuple[int, int, Polygon, List[str], List[str]]]):
+        """
+        Args:
+            zones: (zone_id, restaurant_id, polygon, interior cells,
+                boundary cells) as stored in delivery_zones
+        """
+        self._interior: Dict[str, List[ZoneMatch]] = {}
+        self._boundary: Dict[str, List[Tuple[ZoneMatch, Polygon]]] = {}
+        self.size = len(zones)
+        # restaurants with at least one zone
+        self.restaurant_ids = {zone[1] for zone in zones}
+
+        for zone_id, restaurant_id, polygon, interior, boundary in zones:
+            match = ZoneMatch(zone_id, restaurant_id)
+            for cell in interior:
+                self._interior.setdefault(cell, []).append(match)
+            for cell in boundary:
+                self._boundary.setdefault(cell, []).append((match, polygon))
+
+    def lookup(self, latitude: float, longitude: float) -> List[ZoneMatch]:
+        """Zones containing the point"""
+        point_hash = geohash.encode(latitude, longitude, COVER_PRECISION)
+        matches = []
+        for length in range(1, COVER_PRECISION + 1):
+            matches.extend(self._interior.get(point_hash[:length], ()))
+        for match, polygon in self._boundary.get(point_hash, ()):
+            if point_in_polygon(latitude, longitude, polygon):
+                matches.append(match)
+        return matches
+
+
+class DeliveryZoneIndex:
+
+    def __init__(self):
+        self.index: Optional[ZoneIndex] = None
+        # shared generation the index was built from
+        self._generation = -1
+        self._built_at = 0.0
+        # zones written by this worker since the index was built
+        self._dirty = False
+        self._rebuild_lock = asyncio.Lock()
+
+    @property
+    def needs_rebuild(self) -> bool:
+        age = time.monotonic() - self._built_at
+        return age > settings.DELIVERY_ZONE_MAX_AGE_SECONDS
+
+    async def changed(self) -> bool:
+        """Whether any worker changed zones since the index was built"""
+        return await get_index_generation(INDEX_NAME) > self._generation
+
+    async def invalidate(self):
+        """Zone added, changed or deleted, the index of every worker is stale"""
+        self._dirty = True
+        await bump_index_generation(INDEX_NAME)
+
+    async def rebuild(self):
+        async with self._rebuild_lock:
+            await self._rebuild()
+
+    async def _rebuild(self):
+        self._dirty = False
+        generation = await get_index_generation(INDEX_NAME)
+        async with db_manager.get_session() as session:
+            result = await session.execute(
+                select(
+                    DeliveryZone.id,
+                    DeliveryZone.restaurant_id,
+                    DeliveryZone.polygon,
+                    DeliveryZone.interior_cells,
+                    DeliveryZone.boundary_cells,
+                )
+            )
+            zones = [tuple(row) for row in result.all()]
+
+        self.index = await asyncio.to_thread(ZoneIndex, zones)
+        # read before loading: a write during the load leaves it stale
+        self._generation = generation
+        self._built_at = time.monotonic()
+
+    async def get_index(self) -> ZoneIndex:
+        """
+        The index, rebuilt inline first if it was never built or this worker
+        changed zones since. Changes made by other workers are picked up by
+        refresh_delivery_zone_index.
+        """
+        if self.index is None or self._dirty:
+            async with self._rebuild_lock:
+                # another request may have rebuilt it in the meantime
+                if self.index is None or self._dirty:
+                    await self._rebuild()
+        return self.index
+
+    async def lookup(self, latitude: float, longitude: float) -> List[ZoneMatch]:
+        """Zones containing the point"""
+        index = await self.get_index()
+        return index.lookup(latitude, longitude)
+
+    async def serves(
+        self, restaurant_id: int, latitude: float, longitude: float
+    ) -> bool:
+        """
+        Whether the restaurant delivers to the point. Restaurants without
+        any zone deliver everywhere.
+        """
+        index = await self.get_index()
+        if restaurant_id not in index.restaurant_ids:
+            return True
+        return any(
+            match.restaurant_id == restaurant_id
+            for match in index.lookup(latitude, longitude)
+        )
+
+
+delivery_zone_index = DeliveryZoneIndex()
+
+
+async def refresh_delivery_zone_index():
+    """Periodic job for TaskManager, also keeps idle workers current"""
+    if delivery_zone_index.needs_rebuild or await delivery_zone_index.changed():
+        await delivery_zone_index.rebuild()
@@ -0,0 +1,342 @@
+"""
+Courier dispatch
+
+Courier positions live in a Redis GEO set, with the time of the last ping
+in a sorted set next to it; couriers silent for longer than
+COURIER_POSITION_MAX_AGE_SECONDS are dropped from both.
+
+The dispatch job takes the oldest PROCESSING orders without a courier,
+the active couriers and their current load (open orders they carry), groups
+compatible orders into multi-stop batches and matches the batches to
+couriers (app.services.route_batching, app.services.dispatch_solver) in a
+worker process, so the NumPy work never blocks the event loop. Only one
+dispatcher runs at a time (transaction level advisory lock): concurrent
+batches would both see the same free capacity.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import redis
+from sqlalchemy import bindparam, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import db_manager, redis_manager
+from app.crud.outbox import OutboxCRUD, OrderEventType
+from app.models.order import Order, OrderStatus
+from app.models.restaurant import Restaurant
+from app.services.route_batching import assign_batches, plan_route
+
+COURIER_GEO_KEY = "dispatch:couriers:geo"
+COURIER_SEEN_KEY = "dispatch:couriers:seen"
+
+# orders a courier carries until they are delivered
+CARRIED_STATUSES = (OrderStatus.PROCESSING, OrderStatus.DELIVERY)
+
+DISPATCH_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(hashtext('dispatch'))")
+
+_orders = Order.__table__
+# executemany, one row per assignment
+ASSIGN_COURIER = (
+    update(_orders)
+    .where(_orders.c.id == bindparam("order_id"))
+    .values(courier_id=bindparam("assigned_courier_id"), assigned_at=func.now())
+)
+
+GEOPOS_CHUNK = 1000
+
+# (courier_id, latitude, longitude)
+CourierPosition = Tuple[int, float, float]
+
+
+def record_positions(
+    redis_client: redis.Redis, positions: Iterable[Tuple[int, float, float, float]]
+):
+    """
+    GEOADD and mark as seen, one pipelined round trip
+
+    Args:
+        positions: (courier_id, latitude, longitude, unix timestamp)
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for courier_id, latitude, longitude, seen_at in positions:
+        pipe.geoadd(COURIER_GEO_KEY, (longitude, latitude, courier_id))
+        pipe.zadd(COURIER_SEEN_KEY, {courier_id: seen_at})
+    pipe.execute()
+
+
+def forget_couriers(redis_client: redis.Redis, courier_ids: List[int]):
+    if courier_ids:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zrem(COURIER_GEO_KEY, *courier_ids)
+        pipe.zrem(COURIER_SEEN_KEY, *courier_ids)
+        pipe.execute()
+
+
+def load_active_couriers(
+    redis_client: redis.Redis, max_age: float
+) -> List[CourierPosition]:
+    """Drops couriers silent for longer than {max_age} seconds"""
+    cutoff = time.time() - max_age
+    forget_couriers(
+        redis_client, redis_client.zrangebyscore(COURIER_SEEN_KEY, "-inf", cutoff)
+    )
+
+    return get_courier_positions(
+        redis_client, redis_client.zrange(COURIER_SEEN_KEY, 0, -1)
+    )
+
+
+def get_courier_positions(
+    redis_client: redis.Redis, courier_ids: List[int]
+) -> List[CourierPosition]:
+    """Known positions of the couriers, GEOPOS in chunks"""
+    couriers = []
+    for start in range(0, len(courier_ids), GEOPOS_CHUNK):
+        chunk = courier_ids[start : start + GEOPOS_CHUNK]
+        for courier_id, position in zip(
+            chunk, redis_client.geopos(COURIER_GEO_KEY, *chunk)
+        ):
+            if position is not None:
+                longitude, latitude = position
+                couriers.append((int(courier_id), latitude, longitude))
+    return couriers
+
+
+async def update_courier_position(courier_id: int, latitude: float, longitude: float):
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(
+            record_positions,
+            redis_client,
+            [(courier_id, latitude, longitude, time.time())],
+        )
+
+
+async def remove_courier(courier_id: int):
+    """Courier went off shift"""
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(forget_couriers, redis_client, [courier_id])
+
+
+async def get_nearby_couriers(
+    latitude: float, longitude: float, radius_km: float, limit: int
+) -> List[Tuple[int, float, float, float]]:
+    """(courier_id, distance_km, latitude, longitude), nearest first"""
+    async with redis_manager.get_client() as redis_client:
+        found = await asyncio.to_thread(
+            redis_client.geosearch,
+            COURIER_GEO_KEY,
+            longitude=longitude,
+            latitude=latitude,
+            radius=radius_km,
+            unit="km",
+            sort="ASC",
+            count=limit,
+            withdist=True,
+            withcoord=True,
+        )
+    return [
+        (int(courier_id), distance, position[1], position[0])
+        for courier_id, distance, position in found
+    ]
+
+
+# (kind, order_id, latitude, longitude)
+RouteStop = Tuple[str, int, float, float]
+
+
+async def get_courier_route(
+    db: AsyncSession, courier_id: int
+) -> Tuple[float, List[RouteStop]]:
+    """
+    Visit order of the courier's open orders from their last position:
+    pickups of orders still at the restaurant, then drop-offs
+
+    Returns:
+        (route km, stops in visit order)
+    """
+    result = await db.execute(
+        select(
+            Order.id,
+            Order.status,
+            Restaurant.latitude,
+            Restaurant.longitude,
+            Order.delivery_latitude,
+            Order.delivery_longitude,
+        )
+        .outerjoin(Restaurant, Restaurant.id == Order.restaurant_id)
+        .filter(Order.courier_id == courier_id)
+        .filter(Order.status.in_(CARRIED_STATUSES))
+        .order_by(Order.id)
+    )
+    orders = result.all()
+    pickups = [
+        (order_id, latitude, longitude)
+        for order_id, status, latitude, longitude, _, _ in orders
+        if status == OrderStatus.PROCESSING and latitude is not None
+    ]
+    dropoffs = [
+        (order_id, latitude, longitude)
+        for order_id, _, _, _, latitude, longitude in orders
+        if latitude is not None
+    ]
+    if not pickups and not dropoffs:
+        return 0.0, []
+
+    async with redis_manager.get_client() as redis_client:
+        (position,) = await asyncio.to_thread(
+            redis_client.geopos, COURIER_GEO_KEY, courier_id
+        )
+    if position is not None:
+        start = (position[1], position[0])
+    else:
+        start = (pickups or dropoffs)[0][1:]
+
+    loop = asyncio.get_running_loop()
+    pickup_order, dropoff_order, km = await loop.run_in_executor(
+        get_dispatch_pool(),
+        plan_route,
+        np.array(start, dtype=np.float64),
+        np.array([stop[1:] for stop in pickups], dtype=np.float64).reshape(-1, 2),
+        np.array([stop[1:] for stop in dropoffs], dtype=np.float64).reshape(-1, 2),
+    )
+    stops = [("pickup", *pickups[index]) for index in pickup_order]
+    stops += [("dropoff", *dropoffs[index]) for index in dropoff_order]
+    return km, stops
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_dispatch_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process with a running event loop and open
+        # connections is not safe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.DISPATCH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def close_dispatch_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def _get_loads(db: AsyncSession, courier_ids: List[int]) -> dict[int, int]:
+    result = await db.execute(
+        select(Order.courier_id, func.count())
+        .filter(Order.courier_id.in_(courier_ids))
+        .filter(Order.status.in_(CARRIED_STATUSES))
+        .group_by(Order.courier_id)
+    )
+    return dict(result.all())
+
+
+async def dispatch_orders(db: AsyncSession, batch_size: int) -> int:
+    """
+    Assign couriers to up to {batch_size} waiting orders in one transaction
+
+    Returns:
+        int: Number of assigned orders (0 if another dispatcher is running)
+    """
+    if not (await db.execute(DISPATCH_LOCK_SQL)).scalar():
+        return 0
+
+    # pickup at the restaurant, at the delivery point if it is not known
+    pickup_latitude = func.coalesce(Restaurant.latitude, Order.delivery_latitude)
+    pickup_longitude = func.coalesce(Restaurant.longitude, Order.delivery_longitude)
+    result = await db.execute(
+        select(
+            Order.id,
+            pickup_latitude,
+            pickup_longitude,
+            Order.delivery_latitude,
+            Order.delivery_longitude,
+            func.extract("epoch", Order.created_at),
+        )
+        .outerjoin(Restaurant, Restaurant.id == Order.restaurant_id)
+        .filter(Order.status == OrderStatus.PROCESSING)
+        .filter(Order.courier_id.is_(None))
+        .filter(pickup_latitude.is_not(None), pickup_longitude.is_not(None))
+        .order_by(Order.created_at)
+        .limit(batch_size)
+        .with_for_update(of=Order, skip_locked=True)
+    )
+    orders = result.all()
+    if not orders:
+        return 0
+
+    async with redis_manager.get_client() as redis_client:
+        couriers = await asyncio.to_thread(
+            load_active_couriers,
+            redis_client,
+            settings.COURIER_POSITION_MAX_AGE_SECONDS,
+        )
+    if not couriers:
+        return 0
+
+    courier_ids = [courier[0] for courier in couriers]
+    loads = await _get_loads(db, courier_ids)
+    load = np.array([loads.get(courier_id, 0) for courier_id in courier_ids])
+    capacity = np.maximum(settings.DISPATCH_COURIER_CAPACITY - load, 0)
+
+    # None (unknown drop-off) becomes nan
+    points = np.array([order[1:5] for order in orders], dtype=np.float64)
+    loop = asyncio.get_running_loop()
+    courier_of, _ = await loop.run_in_executor(
+        get_dispatch_pool(),
+        partial(
+            assign_batches,
+            pickups=points[:, :2],
+            dropoffs=points[:, 2:],
+            created_at=np.array([order[5] for order in orders], dtype=np.float64),
+            courier_points=np.array(
+                [courier[1:] for courier in couriers], dtype=np.float64
+            ),
+            capacity=capacity,
+            load=load,
+            pickup_radius_km=settings.ROUTE_BATCH_PICKUP_RADIUS_KM,
+            dropoff_spread_km=settings.ROUTE_BATCH_DROPOFF_SPREAD_KM,
+            window_seconds=settings.ROUTE_BATCH_WINDOW_MINUTES * 60,
+            max_distance_km=settings.DISPATCH_MAX_DISTANCE_KM,
+            load_penalty_km=settings.DISPATCH_LOAD_PENALTY_KM,
+            candidates=settings.DISPATCH_CANDIDATES,
+        ),
+    )
+
+    assignments = [
+        {"order_id": order[0], "assigned_courier_id": courier_ids[courier]}
+        for order, courier in zip(orders, courier_of.tolist())
+        if courier >= 0
+    ]
+    if assignments:
+        await db.execute(ASSIGN_COURIER, assignments)
+        await OutboxCRUD.add_order_events(
+            db,
+            OrderEventType.COURIER_ASSIGNED,
+            [assignment["order_id"] for assignment in assignments],
+        )
+    await db.commit()
+
+    return len(assignments)
+
+
+async def run_dispatch() -> bool:
+    """
+    Periodic job for TaskManager, returns True while full batches are
+    assigned: more orders may be waiting and couriers are available
+    """
+    async with db_manager.get_session() as session:
+        dispatched = await dispatch_orders(session, settings.DISPATCH_BATCH_SIZE)
+    return dispatched == settings.DISPATCH_BATCH_SIZE
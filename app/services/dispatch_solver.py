@@ -0,0 +1,133 @@
+"""
+Courier assignment solver
+
+Pure NumPy and free of app imports, so dispatch worker processes load it
+without the settings, database or Redis modules.
+
+Greedy matching in rounds: every open order takes its {candidates} nearest
+couriers that still have free capacity (distances from unit vector dot
+products, one matrix product), the candidate pairs are scored by distance
+plus a penalty per order the courier already carries, and pairs are taken
+cheapest first while the order is unassigned and the courier has room.
+Orders whose candidates all filled up try again in the next round against
+the remaining couriers. An order may stand for a batch of several orders
+(app.services.route_batching) and then takes that much capacity.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_ROUNDS = 4
+
+
+def unit_vectors(points: np.ndarray) -> np.ndarray:
+    """(n, 2) degrees [latitude, longitude] -> (n, 3) points on the unit sphere"""
+    latitude = np.radians(points[:, 0])
+    longitude = np.radians(points[:, 1])
+    cos_latitude = np.cos(latitude)
+    return np.column_stack(
+        (
+            cos_latitude * np.cos(longitude),
+            cos_latitude * np.sin(longitude),
+            np.sin(latitude),
+        )
+    )
+
+
+def chord_to_km(chord_sq: np.ndarray) -> np.ndarray:
+    """Great circle distance from the squared chord length on the unit sphere"""
+    half_chord = np.sqrt(np.clip(chord_sq, 0.0, 4.0)) / 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(half_chord, 1.0))
+
+
+def assign(
+    order_points: np.ndarray,
+    courier_points: np.ndarray,
+    capacity: np.ndarray,
+    load: np.ndarray,
+    max_distance_km: float,
+    load_penalty_km: float,
+    candidates: int = 8,
+    demand: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Args:
+        order_points: (n, 2) pickup points of the orders, oldest first
+        courier_points: (m, 2) courier positions
+        capacity: (m,) orders each courier may still take
+        load: (m,) orders each courier carries now
+        max_distance_km: Couriers farther from the pickup are never picked
+        load_penalty_km: Cost of one carried order, in km of distance
+        candidates: Nearest couriers considered per order and round
+        demand: (n,) capacity each order takes, 1 by default
+
+    Returns:
+        (courier index per order or -1, distance_km per order or nan)
+    """
+    n = len(order_points)
+    courier_of = np.full(n, -1, dtype=np.int64)
+    distance_of = np.full(n, np.nan)
+    if n == 0 or len(courier_points) == 0:
+        return courier_of, distance_of
+
+    capacity = capacity.astype(np.int64)
+    orders_xyz = unit_vectors(np.asarray(order_points, dtype=np.float64))
+    couriers_xyz = unit_vectors(np.asarray(courier_points, dtype=np.float64))
+    penalty = load_penalty_km * np.asarray(load, dtype=np.float64)
+
+    need = [1] * n if demand is None else np.asarray(demand).tolist()
+    pending = np.arange(n)
+    for _ in range(MAX_ROUNDS):
+        free = np.flatnonzero(capacity > 0)
+        if len(pending) == 0 or len(free) == 0:
+            break
+
+        chord_sq = 2.0 - 2.0 * (orders_xyz[pending] @ couriers_xyz[free].T)
+        k = min(candidates, len(free))
+        if k < len(free):
+            nearest = np.argpartition(chord_sq, k - 1, axis=1)[:, :k]
+        else:
+            nearest = np.broadcast_to(np.arange(k), chord_sq.shape)
+        distance = chord_to_km(np.take_along_axis(chord_sq, nearest, axis=1))
+
+        order_index = np.repeat(pending, k)
+        courier_index = free[nearest].ravel()
+        distance = distance.ravel()
+        cost = distance + penalty[courier_index]
+
+        within = distance <= max_distance_km
+        order_index = order_index[within]
+        courier_index = courier_index[within]
+        distance = distance[within]
+        cost = cost[within]
+
+        # cheapest first, ties by order age, then courier: deterministic
+        by_cost = np.lexsort((courier_index, order_index, cost))
+
+        # plain lists: the greedy pass is scalar work
+        assigned = courier_of.tolist()
+        room = capacity.tolist()
+        progressed = False
+        for order, courier, km in zip(
+            order_index[by_cost].tolist(),
+            courier_index[by_cost].tolist(),
+            distance[by_cost].tolist(),
+        ):
+            if assigned[order] >= 0 or room[courier] < need[order]:
+                continue
+            assigned[order] = courier
+            distance_of[order] = km
+            room[courier] -= need[order]
+            progressed = True
+        courier_of = np.array(assigned, dtype=np.int64)
+        capacity = np.array(room, dtype=np.int64)
+
+        # orders without any courier in range won't get one in later rounds
+        reachable = np.unique(order_index)
+        pending = reachable[courier_of[reachable] < 0]
+        if not progressed:
+            break
+
+    return courier_of, distance_of
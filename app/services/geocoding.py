@@ -0,0 +1,193 @@
+"""
+Address geocoding
+
+The geocoder is chosen by settings.GEOCODER:
+  - "none" (default): addresses are not geocoded, coordinates stay NULL
+    unless given explicitly
+  - "nominatim": OpenStreetMap Nominatim over HTTP (settings.GEOCODER_URL)
+  - "stub": made up but deterministic coordinates derived from the address,
+    for tests and local development only
+
+Rows created before coordinates existed, or while no geocoder was
+configured, are geocoded by `python -m app.cli geocode-addresses`.
+"""
+
+import asyncio
+import hashlib
+import json
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import select, or_
+
+from app.core.config import settings
+from app.core.database import db_manager
+
+Coordinates = Tuple[float, float]
+
+ADDRESS_FIELDS = ("street", "house_number", "city", "country")
+
+
+class Geocoder(ABC):
+
+    @abstractmethod
+    async def geocode(
+        self, street: str, house_number: str, city: str, country: str
+    ) -> Optional[Coordinates]:
+        """(latitude, longitude) of the address or None if it can't be resolved"""
+
+
+class NullGeocoder(Geocoder):
+    """No geocoding configured: nothing resolves"""
+
+    async def geocode(
+        self, street: str, house_number: str, city: str, country: str
+    ) -> Optional[Coordinates]:
+        return None
+
+
+class StubGeocoder(Geocoder):
+    """
+    Addresses of one city land within ~10 km of a point derived from the
+    city name, so distances between them are realistic
+    """
+
+    @staticmethod
+    def _unit(text: str) -> float:
+        digest = hashlib.sha256(text.lower().encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2**64
+
+    async def geocode(
+        self, street: str, house_number: str, city: str, country: str
+    ) -> Optional[Coordinates]:
+        city_key = f"{country}|{city}"
+        address_key = f"{city_key}|{street}|{house_number}"
+        city_latitude = -60 + 130 * self._unit(city_key)
+        city_longitude = -180 + 359 * self._unit(city_key[::-1])
+        # 0.1 degree of latitude is ~11 km
+        latitude = city_latitude + 0.1 * self._unit(address_key)
+        longitude = city_longitude + 0.1 * self._unit(address_key[::-1])
+        return round(latitude, 6), round(longitude, 6)
+
+
+class NominatimGeocoder(Geocoder):
+
+    def __init__(self, url: str, user_agent: str, timeout: float):
+        self.url = url
+        self.user_agent = user_agent
+        self.timeout = timeout
+
+    def _search(self, query: str) -> Optional[Coordinates]:
+        params = urllib.parse.urlencode({"q": query, "format": "json", "limit": 1})
+        request = urllib.request.Request(
+            f"{self.url}?{params}", headers={"User-Agent": self.user_agent}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            results = json.load(response)
+        if not results:
+            return None
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+    async def geocode(
+        self, street: str, house_number: str, city: str, country: str
+    ) -> Optional[Coordinates]:
+        query = f"{street} {house_number}, {city}, {country}"
+        try:
+            return await asyncio.to_thread(self._search, query)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Geocoding of '{query}' failed: {e}")
+            return None
+
+
+def get_geocoder() -> Geocoder:
+    if settings.GEOCODER == "nominatim":
+        return NominatimGeocoder(
+            url=settings.GEOCODER_URL,
+            user_agent=settings.GEOCODER_USER_AGENT,
+            timeout=settings.GEOCODER_TIMEOUT_SECONDS,
+        )
+    if settings.GEOCODER == "stub":
+        return StubGeocoder()
+    return NullGeocoder()
+
+
+geocoder = get_geocoder()
+
+
+async def fill_coordinates(obj, update_data: Optional[dict] = None):
+    """
+    Geocode an address model (Restaurant, UserAddress) in place
+
+    Args:
+        obj: Model with the ADDRESS_FIELDS and latitude/longitude
+        update_data: Fields changed by an update, None for a new object.
+            Coordinates are kept if they were given explicitly or if the
+            address did not change.
+    """
+    if update_data is None:
+        if obj.latitude is not None and obj.longitude is not None:
+            return
+    elif "latitude" in update_data or "longitude" in update_data:
+        return
+    elif not any(field in update_data for field in ADDRESS_FIELDS):
+        return
+
+    coordinates = await geocoder.geocode(
+        obj.street, obj.house_number, obj.city, obj.country
+    )
+    obj.latitude, obj.longitude = coordinates or (None, None)
+
+
+class BackfillReport(NamedTuple):
+    geocoded: int
+    unresolved: int
+    # (country, city) of the geocoded rows
+    locations: Set[Tuple[str, str]]
+
+
+async def backfill_coordinates(
+    model, batch_size: int, delay_seconds: float = 0.0
+) -> BackfillReport:
+    """
+    Geocode the rows of an address model (Restaurant, UserAddress) that have
+    no coordinates, in id order, one transaction per batch
+
+    Args:
+        model: Restaurant or UserAddress
+        batch_size: Rows per transaction
+        delay_seconds: Pause between geocoder requests (Nominatim allows
+            one request per second)
+
+    Returns:
+        BackfillReport: Rows geocoded and rows left without coordinates
+    """
+    geocoded, unresolved, locations = 0, 0, set()
+    last_id = 0
+    while True:
+        async with db_manager.get_session() as session:
+            result = await session.execute(
+                select(model)
+                .filter(model.id > last_id)
+                .filter(or_(model.latitude.is_(None), model.longitude.is_(None)))
+                .order_by(model.id)
+                .limit(batch_size)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                break
+
+            for obj in rows:
+                await fill_coordinates(obj)
+                if obj.latitude is None:
+                    unresolved += 1
+                else:
+                    geocoded += 1
+                    locations.add((obj.country, obj.city))
+                if delay_seconds:
+                    await asyncio.sleep(delay_seconds)
+            last_id = rows[-1].id
+        # the session commits the batch on exit
+
+    return BackfillReport(geocoded, unresolved, locations)
@@ -0,0 +1,33 @@
+"""
+Cross-worker invalidation of in-process indexes
+
+Every worker process keeps its own copy of the in-process indexes (delivery
+zones, restaurant grid, autocomplete trie). A write bumps the index's
+generation counter in Redis; a worker remembers the generation its copy was
+built from and treats a copy older than the shared counter as stale, no
+matter which worker made the change.
+
+The generation is read before an index loads its rows and writers bump it
+after their commit, so a copy that missed a write is always older than the
+counter.
+"""
+
+import asyncio
+
+from app.core.database import redis_manager
+
+GENERATION_KEY = "indexes:{}:generation"
+
+
+async def get_index_generation(name: str) -> int:
+    async with redis_manager.get_client() as redis_client:
+        generation = await asyncio.to_thread(
+            redis_client.get, GENERATION_KEY.format(name)
+        )
+    return int(generation or 0)
+
+
+async def bump_index_generation(name: str) -> int:
+    """Mark every worker's copy of the index stale"""
+    async with redis_manager.get_client() as redis_client:
+        return await asyncio.to_thread(redis_client.incr, GENERATION_KEY.format(name))
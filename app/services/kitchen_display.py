@@ -0,0 +1,183 @@
+"""
+Kitchen display queues
+
+The outbox relay fans every order event with a restaurant out to that
+restaurant's stream kitchen:{restaurant_id}:orders, in the same pipeline as
+the main event stream. Every kitchen display is a consumer group of its
+restaurant's stream, so each display gets every event once and acks it on
+its own. A new display starts at the end of the stream.
+
+Displays long-poll: a read returns the display's delivered but unacked
+entries first (a tablet that restarted gets them again), otherwise blocks
+on XREADGROUP for up to KITCHEN_BLOCK_MS. Blocking reads run on a
+dedicated thread pool of KITCHEN_MAX_WAITERS threads, so waiting tablets
+never take the threads the rest of the app offloads Redis calls to.
+
+Delivery is at-least-once like the outbox relay: displays deduplicate on
+event_id.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.core.database import redis_manager
+
+KITCHEN_STREAM_KEY = "kitchen:{}:orders"
+
+# (entry_id, fields)
+StreamEntry = Tuple[str, dict]
+
+
+def kitchen_stream(restaurant_id: int) -> str:
+    return KITCHEN_STREAM_KEY.format(restaurant_id)
+
+
+def _group(display: str) -> str:
+    return f"display:{display}"
+
+
+def add_to_kitchen_stream(pipe: redis.client.Pipeline, restaurant_id: int, fields):
+    """XADD an outbox event on a relay pipeline"""
+    pipe.xadd(
+        kitchen_stream(restaurant_id),
+        fields,
+        maxlen=settings.KITCHEN_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+def _read(
+    redis_client: redis.Redis, stream: str, group: str, display: str, block_ms: int
+) -> List[StreamEntry]:
+    found = redis_client.xreadgroup(
+        group, display, {stream: "0"}, count=settings.KITCHEN_READ_COUNT
+    )
+    if not found or not found[0][1]:
+        found = redis_client.xreadgroup(
+            group,
+            display,
+            {stream: ">"},
+            count=settings.KITCHEN_READ_COUNT,
+            block=block_ms,
+        )
+    return found[0][1] if found else []
+
+
+def read_display(
+    redis_client: redis.Redis, restaurant_id: int, display: str, block_ms: int
+) -> List[StreamEntry]:
+    """Unacked entries of the display, else new ones (blocking)"""
+    stream, group = kitchen_stream(restaurant_id), _group(display)
+    try:
+        return _read(redis_client, stream, group, display, block_ms)
+    except redis.ResponseError as e:
+        if "NOGROUP" not in str(e):
+            raise
+
+    # first read of this display: join at the end of the stream
+    try:
+        redis_client.xgroup_create(stream, group, id="$", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+    return _read(redis_client, stream, group, display, block_ms)
+
+
+def pending_entry(
+    redis_client: redis.Redis, restaurant_id: int, display: str, entry_id: str
+) -> Optional[dict]:
+    """
+    Fields of the entry, None if it is not pending for the display
+    """
+    stream = kitchen_stream(restaurant_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.xpending_range(stream, _group(display), entry_id, entry_id, 1)
+    pipe.xrange(stream, entry_id, entry_id)
+    try:
+        pending, entries = pipe.execute()
+    except redis.ResponseError as e:
+        if "NOGROUP" not in str(e):
+            raise
+        return None
+    if not pending or not entries:
+        return None
+    return entries[0][1]
+
+
+def ack_entry(
+    redis_client: redis.Redis, restaurant_id: int, display: str, entry_id: str
+):
+    """XACK the entry for the display, a no-op if it is not pending"""
+    redis_client.xack(kitchen_stream(restaurant_id), _group(display), entry_id)
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(
+            max_workers=settings.KITCHEN_MAX_WAITERS,
+            thread_name_prefix="kitchen-display",
+        )
+    return _pool
+
+
+def close_kitchen_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def get_display_entries(
+    restaurant_id: int, display: str, block_ms: int
+) -> List[dict]:
+    """
+    Next events for a kitchen display
+
+    Returns:
+        List of {entry_id, event_id, event_type, order_id, order}
+    """
+    loop = asyncio.get_running_loop()
+    async with redis_manager.get_client() as redis_client:
+        entries = await loop.run_in_executor(
+            _get_pool(), read_display, redis_client, restaurant_id, display, block_ms
+        )
+    return [
+        {
+            "entry_id": entry_id,
+            "event_id": int(fields["event_id"]),
+            "event_type": fields["event_type"],
+            "order_id": int(fields["order_id"]),
+            "order": json.loads(fields["payload"]),
+        }
+        for entry_id, fields in entries
+    ]
+
+
+async def get_pending_entry(
+    restaurant_id: int, display: str, entry_id: str
+) -> Optional[dict]:
+    """Fields of the entry, None if it is not pending for the display"""
+    async with redis_manager.get_client() as redis_client:
+        return await asyncio.to_thread(
+            pending_entry, redis_client, restaurant_id, display, entry_id
+        )
+
+
+async def ack_display_entry(restaurant_id: int, display: str, entry_id: str):
+    """
+    The display handled the entry. Called only once its effects are
+    committed: until then the entry stays pending and is read again.
+    """
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(
+            ack_entry, redis_client, restaurant_id, display, entry_id
+        )
@@ -0,0 +1,207 @@
+"""
+Pre-serialized per-restaurant menu snapshots
+
+The complete menu of a restaurant (categories with their products) is loaded
+in one query, rendered to JSON once, stored in Redis next to a gzip variant
+and served as raw bytes, without ORM or pydantic work per request. Catalog
+writes schedule a rebuild of the affected restaurants only; concurrent
+writes to the same restaurant coalesce into one extra rebuild.
+
+Like the category list (app.services.category_list), snapshots are stored
+under a per-restaurant generation. Writes bump the generation after their
+commit and a rebuild reads it before loading the menu, so a render that
+started before a write, on any worker, is stored under an old generation and
+never served.
+"""
+
+import asyncio
+import gzip
+from typing import Dict, Optional, Set, Tuple
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+
+from app.core.config import settings
+from app.core.database import db_manager, redis_manager
+from app.models.product import Category, Product
+from app.models.restaurant import Restaurant
+from app.schemas.restaurant import RestaurantMenuResponse
+
+
+GENERATION_KEY = "menu:snapshot:{}:generation"
+
+
+def snapshot_key(restaurant_id: int, generation: int, compressed: bool = False) -> str:
+    key = f"menu:snapshot:{restaurant_id}:{generation}"
+    return f"{key}:gz" if compressed else key
+
+
+def get_generation(redis_client: redis.Redis, restaurant_id: int) -> int:
+    return int(redis_client.get(GENERATION_KEY.format(restaurant_id)) or 0)
+
+
+def read_snapshot(
+    redis_client: redis.Redis, restaurant_id: int, compressed: bool
+) -> Tuple[int, Optional[bytes]]:
+    """(current generation, its snapshot if stored)"""
+    generation = get_generation(redis_client, restaurant_id)
+    return generation, redis_client.get(
+        snapshot_key(restaurant_id, generation, compressed)
+    )
+
+
+def bump_generations(redis_client: redis.Redis, restaurant_ids: Set[int]):
+    pipe = redis_client.pipeline(transaction=False)
+    for restaurant_id in restaurant_ids:
+        pipe.incr(GENERATION_KEY.format(restaurant_id))
+    pipe.execute()
+
+
+async def load_menu(
+    db: AsyncSession, restaurant_id: int
+) -> Optional[RestaurantMenuResponse]:
+    """
+    Restaurant with its products and their categories in one round trip
+    (outer joins + contains_eager), grouped by category
+    """
+    result = await db.execute(
+        select(Restaurant)
+        .outerjoin(Restaurant.products)
+        .outerjoin(Product.category)
+        .options(contains_eager(Restaurant.products).contains_eager(Product.category))
+        .filter(Restaurant.id == restaurant_id)
+        .order_by(Category.name, Product.name, Product.id)
+    )
+    restaurant = result.unique().scalar_one_or_none()
+    if restaurant is None:
+        return None
+    return RestaurantMenuResponse.from_orm(restaurant)
+
+
+def render_menu(menu: RestaurantMenuResponse) -> Tuple[bytes, bytes]:
+    """(json, gzipped json)"""
+    body = menu.model_dump_json().encode("utf-8")
+    return body, gzip.compress(body, compresslevel=6)
+
+
+def store_snapshot(
+    redis_client: redis.Redis,
+    restaurant_id: int,
+    generation: int,
+    menu: Optional[RestaurantMenuResponse],
+) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Render and store the snapshot of the generation read before the menu was
+    loaded, drop it if the restaurant is gone
+    """
+    if menu is None:
+        redis_client.delete(
+            snapshot_key(restaurant_id, generation),
+            snapshot_key(restaurant_id, generation, compressed=True),
+        )
+        return None
+
+    body, body_gz = render_menu(menu)
+    pipe = redis_client.pipeline()
+    ttl = settings.MENU_SNAPSHOT_TTL_SECONDS
+    pipe.set(snapshot_key(restaurant_id, generation), body, ex=ttl)
+    pipe.set(snapshot_key(restaurant_id, generation, compressed=True), body_gz, ex=ttl)
+    pipe.execute()
+    return body, body_gz
+
+
+class MenuSnapshotBuilder:
+
+    def __init__(self):
+        self._running: Dict[int, asyncio.Task] = {}
+        self._dirty: Set[int] = set()
+
+    async def get(self, restaurant_id: int, compressed: bool) -> Optional[bytes]:
+        """
+        Snapshot bytes, built synchronously on a cold cache.
+        None if the restaurant does not exist.
+        """
+        async with redis_manager.get_raw_client() as redis_client:
+            generation, payload = await asyncio.to_thread(
+                read_snapshot, redis_client, restaurant_id, compressed
+            )
+        if payload is not None:
+            return payload
+
+        rendered = await self.rebuild(restaurant_id, generation)
+        if rendered is None:
+            return None
+        body, body_gz = rendered
+        return body_gz if compressed else body
+
+    async def rebuild(
+        self, restaurant_id: int, generation: Optional[int] = None
+    ) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Args:
+            restaurant_id: Restaurant ID
+            generation: Current generation if the caller just read it
+        """
+        if generation is None:
+            async with redis_manager.get_raw_client() as redis_client:
+                generation = await asyncio.to_thread(
+                    get_generation, redis_client, restaurant_id
+                )
+
+        async with db_manager.get_session() as session:
+            menu = await load_menu(session, restaurant_id)
+
+        # gzip and the Redis round trips stay off the event loop
+        async with redis_manager.get_raw_client() as redis_client:
+            return await asyncio.to_thread(
+                store_snapshot, redis_client, restaurant_id, generation, menu
+            )
+
+    def invalidate(self, restaurant_id: int):
+        """Schedule a background rebuild of the restaurant's snapshot"""
+        task = self._running.get(restaurant_id)
+        if task is not None and not task.done():
+            # the running rebuild may have read the catalog before this write
+            self._dirty.add(restaurant_id)
+            return
+        self._running[restaurant_id] = asyncio.create_task(
+            self._rebuild_loop(restaurant_id)
+        )
+
+    async def wait(self):
+        """Wait for scheduled rebuilds, for short-lived processes like the CLI"""
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    async def _rebuild_loop(self, restaurant_id: int):
+        try:
+            while True:
+                self._dirty.discard(restaurant_id)
+                try:
+                    await self.rebuild(restaurant_id)
+                except Exception as e:
+                    # the generation was bumped by the write, readers miss
+                    # and build the menu themselves
+                    print(f"Menu snapshot {restaurant_id} rebuild failed: {e}")
+                if restaurant_id not in self._dirty:
+                    break
+        finally:
+            self._running.pop(restaurant_id, None)
+
+
+menu_snapshots = MenuSnapshotBuilder()
+
+
+async def invalidate_menu_snapshots(restaurant_ids: Set[int]):
+    """
+    Called after the write committed: stale snapshots stop being served
+    at once, fresh ones are rebuilt in the background
+    """
+    if not restaurant_ids:
+        return
+    async with redis_manager.get_raw_client() as redis_client:
+        await asyncio.to_thread(bump_generations, redis_client, restaurant_ids)
+    for restaurant_id in restaurant_ids:
+        menu_snapshots.invalidate(restaurant_id)
@@ -0,0 +1,236 @@
+"""
+Opening hours engine
+
+Schedules (weekly intervals in the restaurant's time zone plus per-date
+exceptions) are expanded into restaurant_open_slots: one row per restaurant,
+UTC bucket and open interval inside that bucket. "Open now in city X" is
+then a single index range on (city, bucket_start) with the exact interval
+checked on the matched rows, instead of evaluating every schedule.
+
+Slots cover OPEN_SLOT_HORIZON_HOURS ahead. Schedule, time zone and address
+changes recompute the restaurant's slots in the same transaction, and a
+periodic job extends every restaurant's slots as time moves on and drops
+past buckets. Both paths lock the restaurant row, so they never interleave
+on one restaurant.
+"""
+
+from collections import defaultdict
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.database import db_manager
+from app.models.opening_hours import RestaurantOpenSlot
+from app.models.restaurant import Restaurant
+
+# (start, end) in UTC
+Interval = Tuple[datetime, datetime]
+# (opens_at, closes_at) in local time, closes_at <= opens_at runs past midnight
+LocalInterval = Tuple[time, time]
+
+
+def bucket_size() -> timedelta:
+    return timedelta(minutes=settings.OPEN_SLOT_BUCKET_MINUTES)
+
+
+def bucket_floor(moment: datetime, bucket: timedelta) -> datetime:
+    """Start of the UTC bucket containing {moment}"""
+    epoch = datetime(1970, 1, 1, tzinfo=UTC)
+    return epoch + (moment - epoch) // bucket * bucket
+
+
+def open_intervals(
+    zone: ZoneInfo,
+    weekly: Dict[int, List[LocalInterval]],
+    exceptions: Dict[date, List[LocalInterval]],
+    start: datetime,
+    stop: datetime,
+) -> List[Interval]:
+    """
+    Merged UTC intervals in [start, stop) during which the restaurant is open
+
+    Args:
+        zone: Time zone of the schedule
+        weekly: Intervals per weekday (0 = Monday)
+        exceptions: Intervals of dates with special hours, replacing the
+            weekly ones; an empty list closes the date
+        start, stop: UTC window
+    """
+    intervals = []
+    # intervals of the previous local day may run past midnight into the window
+    day = start.astimezone(zone).date() - timedelta(days=1)
+    last_day = stop.astimezone(zone).date()
+    while day <= last_day:
+        local_intervals = exceptions.get(day)
+        if local_intervals is None:
+            local_intervals = weekly.get(day.weekday(), ())
+        for opens_at, closes_at in local_intervals:
+            close_day = day + timedelta(days=1) if closes_at <= opens_at else day
+            # nonexistent local times (DST gaps) resolve with the offset
+            # before the transition
+            opens = datetime.combine(day, opens_at, tzinfo=zone).astimezone(UTC)
+            closes = datetime.combine(close_day, closes_at, tzinfo=zone)
+            opens, closes = max(opens, start), min(closes.astimezone(UTC), stop)
+            if opens < closes:
+                intervals.append((opens, closes))
+        day += timedelta(days=1)
+
+    intervals.sort()
+    merged: List[Interval] = []
+    for opens, closes in intervals:
+        if merged and opens <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], closes))
+        else:
+            merged.append((opens, closes))
+    return merged
+
+
+def split_into_buckets(
+    intervals: Iterable[Interval], bucket: timedelta
+) -> List[Tuple[datetime, datetime, datetime]]:
+    """(bucket_start, open_from, open_until) pieces of the intervals"""
+    pieces = []
+    for opens, closes in intervals:
+        bucket_start = bucket_floor(opens, bucket)
+        while bucket_start < closes:
+            bucket_end = bucket_start + bucket
+            pieces.append(
+                (bucket_start, max(opens, bucket_start), min(closes, bucket_end))
+            )
+            bucket_start = bucket_end
+    return pieces
+
+
+def restaurant_open_intervals(
+    restaurant: Restaurant, start: datetime, stop: datetime
+) -> List[Interval]:
+    """Restaurant with opening_hours and hours_exceptions loaded"""
+    weekly: Dict[int, List[LocalInterval]] = defaultdict(list)
+    for hours in restaurant.opening_hours:
+        weekly[hours.weekday].append((hours.opens_at, hours.closes_at))
+
+    exceptions: Dict[date, List[LocalInterval]] = defaultdict(list)
+    for exception in restaurant.hours_exceptions:
+        day_intervals = exceptions[exception.day]
+        if exception.opens_at is not None and exception.closes_at is not None:
+            day_intervals.append((exception.opens_at, exception.closes_at))
+
+    return open_intervals(
+        ZoneInfo(restaurant.timezone), weekly, dict(exceptions), start, stop
+    )
+
+
+async def _insert_slots(
+    db: AsyncSession, restaurant: Restaurant, start: datetime, stop: datetime
+):
+    pieces = split_into_buckets(
+        restaurant_open_intervals(restaurant, start, stop), bucket_size()
+    )
+    if pieces:
+        await db.execute(
+            insert(RestaurantOpenSlot),
+            [
+                {
+                    "restaurant_id": restaurant.id,
+                    "bucket_start": bucket_start,
+                    "open_from": open_from,
+                    "open_until": open_until,
+                    "city": restaurant.city,
+                    "country": restaurant.country,
+                }
+                for bucket_start, open_from, open_until in pieces
+            ],
+        )
+    restaurant.open_slots_until = stop
+
+
+def _slot_window() -> Tuple[datetime, datetime]:
+    start = bucket_floor(datetime.now(UTC), bucket_size())
+    return start, start + timedelta(hours=settings.OPEN_SLOT_HORIZON_HOURS)
+
+
+def _schedule_query():
+    return select(Restaurant).options(
+        selectinload(Restaurant.opening_hours),
+        selectinload(Restaurant.hours_exceptions),
+    )
+
+
+async def recompute_open_slots(db: AsyncSession, restaurant_id: int):
+    """
+    Rebuild the slots of one restaurant after a schedule, time zone or
+    address change. Runs in the caller's transaction, which commits.
+    """
+    result = await db.execute(
+        _schedule_query()
+        .filter(Restaurant.id == restaurant_id)
+        .with_for_update(of=Restaurant)
+        .execution_options(populate_existing=True)
+    )
+    restaurant = result.scalar_one_or_none()
+    if restaurant is None:
+        return
+
+    await db.execute(
+        delete(RestaurantOpenSlot).where(
+            RestaurantOpenSlot.restaurant_id == restaurant_id
+        )
+    )
+    await _insert_slots(db, restaurant, *_slot_window())
+
+
+async def extend_open_slots(db: AsyncSession, limit: int) -> int:
+    """
+    Extend the slots of up to {limit} restaurants to the current horizon and
+    drop their past buckets, in one transaction
+
+    Returns:
+        int: Number of extended restaurants
+    """
+    start, stop = _slot_window()
+    result = await db.execute(
+        _schedule_query()
+        .filter(
+            or_(
+                Restaurant.open_slots_until.is_(None),
+                Restaurant.open_slots_until < stop,
+            )
+        )
+        .order_by(Restaurant.id)
+        .limit(limit)
+        .with_for_update(of=Restaurant, skip_locked=True)
+    )
+    restaurants = result.scalars().all()
+
+    for restaurant in restaurants:
+        computed_until: Optional[datetime] = restaurant.open_slots_until
+        if computed_until is None or computed_until < start:
+            await db.execute(
+                delete(RestaurantOpenSlot).where(
+                    RestaurantOpenSlot.restaurant_id == restaurant.id
+                )
+            )
+            computed_until = start
+        else:
+            await db.execute(
+                delete(RestaurantOpenSlot).where(
+                    RestaurantOpenSlot.restaurant_id == restaurant.id,
+                    RestaurantOpenSlot.bucket_start < start,
+                )
+            )
+        await _insert_slots(db, restaurant, computed_until, stop)
+
+    await db.commit()
+    return len(restaurants)
+
+
+async def run_open_slot_refresh() -> bool:
+    """Periodic job for TaskManager, returns True while restaurants remain"""
+    async with db_manager.get_session() as session:
+        extended = await extend_open_slots(session, settings.OPEN_SLOT_BATCH_SIZE)
+    return extended == settings.OPEN_SLOT_BATCH_SIZE
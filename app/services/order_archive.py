@@ -0,0 +1,143 @@
+"""
+Cold order archival
+
+COMPLETED/CANCELED orders older than ORDER_ARCHIVE_AFTER_MONTHS are moved
+from orders/order_items into orders_archive/order_items_archive in batches.
+orders_archive is range partitioned by month on created_at; partitions are
+created on demand (plus a few months ahead) before rows are moved.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import db_manager
+from app.models.order import OrderStatus
+
+ARCHIVED_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELED)
+
+_STATUS_FILTER = "status IN ({})".format(
+    ", ".join(f"'{status.name}'" for status in ARCHIVED_STATUSES)
+)
+
+MOVE_BATCH_SQL = text(
+    f"""
+    WITH batch AS (
+        SELECT id FROM orders
+        WHERE {_STATUS_FILTER} AND created_at < :cutoff
+        ORDER BY created_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    moved_items AS (
+        DELETE FROM order_items
+        WHERE order_id IN (SELECT id FROM batch)
+        RETURNING id, order_id, product_id, quantity, price, product_name
+    ),
+    archived_items AS (
+        INSERT INTO order_items_archive
+            (id, order_id, product_id, quantity, price, product_name)
+        SELECT id, order_id, product_id, quantity, price, product_name
+        FROM moved_items
+    ),
+    moved_orders AS (
+        DELETE FROM orders
+        WHERE id IN (SELECT id FROM batch)
+        RETURNING id, user_id, status, total_amount, delivery_fee,
+            delivery_address, restaurant_id, created_at
+    )
+    INSERT INTO orders_archive
+        (id, user_id, status, total_amount, delivery_fee, delivery_address,
+            restaurant_id, created_at)
+    SELECT id, user_id, status, total_amount, delivery_fee, delivery_address,
+        restaurant_id, created_at
+    FROM moved_orders
+    """
+)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month {months} away from {day}"""
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def archive_cutoff(now: datetime, months: int) -> date:
+    return add_months(now.date(), -months)
+
+
+async def ensure_archive_partitions(
+    db: AsyncSession, cutoff: date, batch_size: int, ahead: int
+):
+    """
+    Create monthly orders_archive partitions for the months of the next
+    batch of archivable orders and for {ahead} months after the cutoff month
+    """
+    result = await db.execute(
+        text(
+            f"""
+            SELECT DISTINCT date_trunc('month', created_at)::date FROM (
+                SELECT created_at FROM orders
+                WHERE {_STATUS_FILTER} AND created_at < :cutoff
+                ORDER BY created_at
+                LIMIT :batch_size
+            ) AS batch
+            """
+        ),
+        {"cutoff": cutoff, "batch_size": batch_size},
+    )
+    months = set(result.scalars().all())
+    months.update(add_months(cutoff, i) for i in range(ahead + 1))
+
+    for month in sorted(months):
+        # partition bounds are our own dates, not user input
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS orders_archive_y{month:%Y}m{month:%m} "
+                f"PARTITION OF orders_archive "
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+    await db.commit()
+
+
+async def archive_orders(
+    db: AsyncSession, older_than_months: int, batch_size: int
+) -> int:
+    """
+    Move one batch of cold orders into the archive
+
+    Args:
+        db: Database AsyncSession
+        older_than_months: Orders created before this many months ago are cold
+        batch_size: Max orders moved in one transaction
+
+    Returns:
+        int: Number of archived orders
+    """
+    cutoff = archive_cutoff(datetime.now(), older_than_months)
+    await ensure_archive_partitions(
+        db, cutoff, batch_size, settings.ORDER_ARCHIVE_PARTITIONS_AHEAD
+    )
+
+    result = await db.execute(
+        MOVE_BATCH_SQL, {"cutoff": cutoff, "batch_size": batch_size}
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def run_order_archival() -> bool:
+    """Periodic job for TaskManager, returns True while full batches are moved"""
+    async with db_manager.get_session() as session:
+        archived = await archive_orders(
+            session,
+            older_than_months=settings.ORDER_ARCHIVE_AFTER_MONTHS,
+            batch_size=settings.ORDER_ARCHIVE_BATCH_SIZE,
+        )
+    if archived:
+        print(f"Archived {archived} orders")
+    return archived == settings.ORDER_ARCHIVE_BATCH_SIZE
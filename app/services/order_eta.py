@@ -0,0 +1,450 @@
+"""
+Delivery ETAs
+
+A periodic job estimates pickup and delivery times of all open orders at
+once, as NumPy arrays over the open orders, and caches them per order in
+Redis: reading an ETA is one HGET. ETAs that moved by at least
+ETA_PUSH_THRESHOLD_SECONDS are published on one channel per run; every API
+process listens to it and pushes them to its WebSocket clients. The last
+published ETA is kept next to the cached one, and the ids of the orders with
+a cached ETA in a set, so whichever process computes the next run pushes
+only real changes and the closing of every order.
+
+Model:
+  - pickup: created_at + the restaurant's median time to pickup over the
+    last ETA_HISTORY_DAYS + ETA_QUEUED_ORDER_MINUTES per order of the same
+    restaurant waiting ahead of it, and not before the assigned courier can
+    reach the restaurant
+  - delivery: pickup + handoff + drop-off distance / courier speed, handoff
+    and speed fitted by least squares on the orders delivered in the same
+    period; from the courier's position once the order is picked up
+The history is reloaded every ETA_HISTORY_REFRESH_SECONDS. Only one process
+computes at a time (transaction level advisory lock), like dispatch.
+
+Times are unix seconds of the database clock, like the naive created_at.
+"""
+
+import asyncio
+import json
+import time
+from datetime import timedelta
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import redis
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import db_manager, redis_manager
+from app.models.order import Order, OrderStatus
+from app.models.restaurant import Restaurant
+from app.services.dispatch import get_courier_positions
+from app.services.dispatch_solver import chord_to_km, unit_vectors
+
+# hash: "eta" the current ETA, "published" the last one pushed
+ETA_KEY = "orders:eta:{}"
+# ids of the orders with a cached ETA
+ETA_ORDERS_KEY = "orders:eta:orders"
+ETA_CHANNEL = "orders:eta"
+
+OPEN_STATUSES = (OrderStatus.NEW, OrderStatus.PROCESSING, OrderStatus.DELIVERY)
+
+ETA_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(hashtext('order_eta'))")
+
+# fitted speeds outside 6..60 km/h are noise
+MIN_SECONDS_PER_KM, MAX_SECONDS_PER_KM = 60.0, 600.0
+MAX_HANDOFF_SECONDS = 1800.0
+
+
+class TravelModel(NamedTuple):
+    """delivery time = handoff + distance * seconds_per_km"""
+
+    handoff_seconds: float
+    seconds_per_km: float
+
+
+def default_travel_model() -> TravelModel:
+    return TravelModel(
+        settings.ETA_DEFAULT_HANDOFF_MINUTES * 60,
+        3600 / settings.ETA_DEFAULT_SPEED_KMH,
+    )
+
+
+def fit_travel_model(
+    distance_km: np.ndarray, duration_seconds: np.ndarray, default: TravelModel
+) -> TravelModel:
+    """Least squares fit, {default} with too few samples"""
+    usable = (duration_seconds > 0) & (duration_seconds < 4 * 3600)
+    distance_km, duration_seconds = distance_km[usable], duration_seconds[usable]
+    if len(distance_km) < settings.ETA_MIN_SAMPLES:
+        return default
+
+    design = np.column_stack((np.ones_like(distance_km), distance_km))
+    (handoff, per_km), *_ = np.linalg.lstsq(design, duration_seconds, rcond=None)
+    return TravelModel(
+        float(np.clip(handoff, 0, MAX_HANDOFF_SECONDS)),
+        float(np.clip(per_km, MIN_SECONDS_PER_KM, MAX_SECONDS_PER_KM)),
+    )
+
+
+def distance_km(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise great circle km between (n, 2) point arrays, nan if unknown"""
+    chord = unit_vectors(a) - unit_vectors(b)
+    return chord_to_km(np.einsum("ij,ij->i", chord, chord))
+
+
+def queue_ahead(
+    restaurant_index: np.ndarray, created_at: np.ndarray, waiting: np.ndarray
+) -> np.ndarray:
+    """Waiting orders of the same restaurant created before each order"""
+    ahead = np.zeros(len(created_at))
+    queued = np.flatnonzero(waiting & (restaurant_index >= 0))
+    if len(queued) == 0:
+        return ahead
+
+    queued = queued[np.lexsort((created_at[queued], restaurant_index[queued]))]
+    restaurants = restaurant_index[queued]
+    first = np.r_[0, np.flatnonzero(np.diff(restaurants)) + 1]
+    group_size = np.diff(np.r_[first, len(queued)])
+    ahead[queued] = np.arange(len(queued)) - np.repeat(first, group_size)
+    return ahead
+
+
+def estimate(
+    now: float,
+    created_at: np.ndarray,
+    picked_up_at: np.ndarray,
+    restaurant_index: np.ndarray,
+    prep_seconds: np.ndarray,
+    pickups: np.ndarray,
+    dropoffs: np.ndarray,
+    couriers: np.ndarray,
+    model: TravelModel,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Args:
+        now: Current unix time
+        created_at: (n,) order creation times
+        picked_up_at: (n,) pickup times, nan while at the restaurant
+        restaurant_index: (n,) index into {prep_seconds}, -1 if unknown
+        prep_seconds: (r,) median time to pickup per restaurant, nan if
+            unknown
+        pickups, dropoffs, couriers: (n, 2) restaurant, delivery and
+            courier positions, nan if unknown
+        model: Courier travel model
+
+    Returns:
+        (pickup times, delivery times)
+    """
+    picked_up = ~np.isnan(picked_up_at)
+    known = restaurant_index >= 0
+
+    prep = np.full(len(created_at), np.nan)
+    prep[known] = prep_seconds[restaurant_index[known]]
+    prep = np.where(np.isnan(prep), settings.ETA_DEFAULT_PREP_MINUTES * 60, prep)
+    queued = queue_ahead(restaurant_index, created_at, ~picked_up)
+    ready = created_at + prep + queued * settings.ETA_QUEUED_ORDER_MINUTES * 60
+
+    courier_arrival = now + distance_km(couriers, pickups) * model.seconds_per_km
+    pickup_at = np.fmax(np.maximum(ready, now), courier_arrival)
+    pickup_at = np.where(picked_up, picked_up_at, pickup_at)
+
+    leg_km = distance_km(pickups, dropoffs)
+    leg_km = np.where(np.isnan(leg_km), settings.ETA_DEFAULT_DISTANCE_KM, leg_km)
+    delivery_at = pickup_at + model.handoff_seconds + leg_km * model.seconds_per_km
+
+    # on the way: from where the courier is now
+    remaining_km = distance_km(couriers, dropoffs)
+    tracked = picked_up & ~np.isnan(remaining_km)
+    delivery_at[tracked] = (
+        now + model.handoff_seconds + remaining_km[tracked] * model.seconds_per_km
+    )
+    return pickup_at, np.maximum(delivery_at, now)
+
+
+class EtaHistory:
+    """Per restaurant prep times and the travel model, from recent orders"""
+
+    def __init__(self):
+        self.prep_seconds: Dict[int, float] = {}
+        self.model = default_travel_model()
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def needs_refresh(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > settings.ETA_HISTORY_REFRESH_SECONDS
+        )
+
+    async def refresh(self, db: AsyncSession):
+        since = func.localtimestamp() - timedelta(days=settings.ETA_HISTORY_DAYS)
+        time_to_pickup = func.extract("epoch", Order.picked_up_at - Order.created_at)
+        result = await db.execute(
+            select(
+                Order.restaurant_id,
+                func.percentile_cont(0.5).within_group(time_to_pickup),
+            )
+            .filter(Order.picked_up_at >= since)
+            .filter(Order.restaurant_id.is_not(None))
+            .group_by(Order.restaurant_id)
+            .having(func.count() >= settings.ETA_MIN_SAMPLES)
+        )
+        self.prep_seconds = {
+            restaurant_id: float(seconds) for restaurant_id, seconds in result.all()
+        }
+
+        result = await db.execute(
+            select(
+                Restaurant.latitude,
+                Restaurant.longitude,
+                Order.delivery_latitude,
+                Order.delivery_longitude,
+                func.extract("epoch", Order.delivered_at - Order.picked_up_at),
+            )
+            .join(Restaurant, Restaurant.id == Order.restaurant_id)
+            .filter(Order.picked_up_at >= since)
+            .filter(Order.delivered_at.is_not(None))
+            .filter(Order.delivery_latitude.is_not(None))
+            .filter(Restaurant.latitude.is_not(None))
+            .order_by(Order.picked_up_at.desc())
+            .limit(settings.ETA_FIT_SAMPLE_SIZE)
+        )
+        samples = np.array(result.all(), dtype=np.float64).reshape(-1, 5)
+        self.model = fit_travel_model(
+            distance_km(samples[:, 0:2], samples[:, 2:4]),
+            samples[:, 4],
+            default_travel_model(),
+        )
+        self._loaded_at = time.monotonic()
+
+
+eta_history = EtaHistory()
+
+# (status, pickup_at, delivery_at)
+Published = Tuple[str, int, int]
+
+
+def _moved(previous: Optional[Published], eta: dict) -> bool:
+    if previous is None or previous[0] != eta["status"]:
+        return True
+    threshold = settings.ETA_PUSH_THRESHOLD_SECONDS
+    return (
+        abs(previous[1] - eta["pickup_at"]) >= threshold
+        or abs(previous[2] - eta["delivery_at"]) >= threshold
+    )
+
+
+def load_published(
+    redis_client: redis.Redis, order_ids: List[int]
+) -> Tuple[Dict[int, Published], Set[int]]:
+    """
+    (last published ETA per order, orders with a cached ETA), one pipelined
+    round trip
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.smembers(ETA_ORDERS_KEY)
+    for order_id in order_ids:
+        pipe.hget(ETA_KEY.format(order_id), "published")
+    cached, *published = pipe.execute()
+    return (
+        {
+            order_id: tuple(json.loads(previous))
+            for order_id, previous in zip(order_ids, published)
+            if previous is not None
+        },
+        {int(order_id) for order_id in cached},
+    )
+
+
+def store_etas(
+    redis_client: redis.Redis,
+    etas: List[dict],
+    closed: List[int],
+    changed: Dict[int, Optional[dict]],
+):
+    """Cache all ETAs and publish the changed ones, one pipelined round trip"""
+    pipe = redis_client.pipeline(transaction=False)
+    for eta in etas:
+        key = ETA_KEY.format(eta["order_id"])
+        fields = {"eta": json.dumps(eta)}
+        if eta["order_id"] in changed:
+            fields["published"] = json.dumps(
+                [eta["status"], eta["pickup_at"], eta["delivery_at"]]
+            )
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, settings.ETA_TTL_SECONDS)
+    if etas:
+        pipe.sadd(ETA_ORDERS_KEY, *(eta["order_id"] for eta in etas))
+    for order_id in closed:
+        pipe.delete(ETA_KEY.format(order_id))
+    if closed:
+        pipe.srem(ETA_ORDERS_KEY, *closed)
+    if changed:
+        pipe.publish(ETA_CHANNEL, json.dumps(changed))
+    pipe.execute()
+
+
+async def compute_etas(db: AsyncSession) -> int:
+    """
+    Estimate, cache and publish the ETAs of all open orders
+
+    Returns:
+        int: Number of open orders (0 if another process is computing)
+    """
+    if not (await db.execute(ETA_LOCK_SQL)).scalar():
+        return 0
+    if eta_history.needs_refresh:
+        await eta_history.refresh(db)
+
+    result = await db.execute(select(func.extract("epoch", func.localtimestamp())))
+    now = float(result.scalar())
+    result = await db.execute(
+        select(
+            Order.id,
+            Order.status,
+            Order.restaurant_id,
+            Order.courier_id,
+            func.extract("epoch", Order.created_at),
+            func.extract("epoch", Order.picked_up_at),
+            Restaurant.latitude,
+            Restaurant.longitude,
+            Order.delivery_latitude,
+            Order.delivery_longitude,
+        )
+        .outerjoin(Restaurant, Restaurant.id == Order.restaurant_id)
+        .filter(Order.status.in_(OPEN_STATUSES))
+    )
+    orders = result.all()
+
+    courier_ids = list({order[3] for order in orders if order[3] is not None})
+    async with redis_manager.get_client() as redis_client:
+        positions = await asyncio.to_thread(
+            get_courier_positions, redis_client, courier_ids
+        )
+    courier_position = {courier[0]: courier[1:] for courier in positions}
+
+    prep_seconds = eta_history.prep_seconds
+    restaurant_index = {
+        restaurant_id: i for i, restaurant_id in enumerate(prep_seconds)
+    }
+    # None becomes nan
+    values = np.array([order[4:] for order in orders], dtype=np.float64).reshape(-1, 6)
+    couriers = np.array(
+        [courier_position.get(order[3], (None, None)) for order in orders],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    pickup_at, delivery_at = await asyncio.to_thread(
+        estimate,
+        now,
+        values[:, 0],
+        values[:, 1],
+        np.array(
+            [restaurant_index.get(order[2], -1) for order in orders], dtype=np.int64
+        ),
+        np.array(list(prep_seconds.values()), dtype=np.float64),
+        values[:, 2:4],
+        values[:, 4:6],
+        couriers,
+        eta_history.model,
+    )
+
+    async with redis_manager.get_client() as redis_client:
+        published, cached = await asyncio.to_thread(
+            load_published, redis_client, [order[0] for order in orders]
+        )
+
+    etas, changed = [], {}
+    for order, pickup, delivery in zip(
+        orders, pickup_at.tolist(), delivery_at.tolist()
+    ):
+        eta = {
+            "order_id": order[0],
+            "status": order[1].value,
+            "pickup_at": round(pickup),
+            "delivery_at": round(delivery),
+            "updated_at": round(now),
+        }
+        etas.append(eta)
+        if _moved(published.get(order[0]), eta):
+            changed[order[0]] = eta
+
+    # open at the previous run, whichever process computed it
+    closed = list(cached - {order[0] for order in orders})
+    for order_id in closed:
+        changed[order_id] = None
+
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(store_etas, redis_client, etas, closed, changed)
+    return len(orders)
+
+
+async def run_eta_refresh():
+    """Periodic job for TaskManager"""
+    async with db_manager.get_session() as session:
+        await compute_etas(session)
+
+
+async def get_order_eta(order_id: int) -> Optional[dict]:
+    """Cached ETA of an open order"""
+    async with redis_manager.get_client() as redis_client:
+        cached = await asyncio.to_thread(
+            redis_client.hget, ETA_KEY.format(order_id), "eta"
+        )
+    return None if cached is None else json.loads(cached)
+
+
+class EtaSubscribers:
+    """
+    WebSocket clients of this process waiting for ETA changes. One Redis
+    subscription per process, fanned out to a queue per client that keeps
+    only the latest ETA; None means the order is no longer open.
+    """
+
+    def __init__(self):
+        self._queues: Dict[int, Set[asyncio.Queue]] = {}
+        self._pubsub = None
+
+    def subscribe(self, order_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=1)
+        self._queues.setdefault(order_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, order_id: int, queue: asyncio.Queue):
+        queues = self._queues.get(order_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[order_id]
+
+    def _deliver(self, changed: Dict[str, Optional[dict]]):
+        for order_id, eta in changed.items():
+            for queue in self._queues.get(int(order_id), ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(eta)
+
+    async def listen(self) -> bool:
+        """Periodic job for TaskManager, blocks up to a second per call"""
+        if self._pubsub is None:
+            async with redis_manager.get_client() as redis_client:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                await asyncio.to_thread(pubsub.subscribe, ETA_CHANNEL)
+                self._pubsub = pubsub
+        try:
+            message = await asyncio.to_thread(self._pubsub.get_message, timeout=1.0)
+        except Exception:
+            self.close()
+            raise
+        if message is not None:
+            self._deliver(json.loads(message["data"]))
+        return True
+
+    def close(self):
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+
+eta_subscribers = EtaSubscribers()
@@ -0,0 +1,114 @@
+"""
+Order analytics rollups
+
+Order write paths only queue the affected day in order_rollup_dirty_days
+(one tiny upsert, no hot counter rows to lock during checkout). This job
+claims dirty days and recomputes their rollups from orders and the archive,
+so the reporting endpoint only ever reads order_daily_rollups and
+product_daily_rollups.
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import db_manager
+
+CLAIM_DIRTY_DAYS_SQL = text(
+    """
+    DELETE FROM order_rollup_dirty_days
+    WHERE day IN (
+        SELECT day FROM order_rollup_dirty_days
+        ORDER BY day
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING day
+    """
+)
+
+_DAY_ORDERS_CTE = """
+    WITH day_orders AS (
+        SELECT id, created_at::date AS day, status, total_amount FROM orders
+        WHERE created_at >= :start AND created_at < :stop
+          AND created_at::date = ANY(:days)
+        UNION ALL
+        SELECT id, created_at::date AS day, status, total_amount FROM orders_archive
+        WHERE created_at >= :start AND created_at < :stop
+          AND created_at::date = ANY(:days)
+    ),
+    day_items AS (
+        SELECT i.order_id, i.product_id, i.quantity, i.price
+        FROM order_items AS i JOIN day_orders AS o ON o.id = i.order_id
+        UNION ALL
+        SELECT i.order_id, i.product_id, i.quantity, i.price
+        FROM order_items_archive AS i JOIN day_orders AS o ON o.id = i.order_id
+    )
+"""
+
+REFRESH_ORDER_ROLLUPS_SQL = text(
+    _DAY_ORDERS_CTE
+    + """
+    INSERT INTO order_daily_rollups (day, status, order_count, item_count, revenue)
+    SELECT o.day, o.status, count(*), coalesce(sum(i.item_count), 0),
+           sum(o.total_amount)
+    FROM day_orders AS o
+    LEFT JOIN (
+        SELECT order_id, sum(quantity) AS item_count
+        FROM day_items GROUP BY order_id
+    ) AS i ON i.order_id = o.id
+    GROUP BY o.day, o.status
+    """
+)
+
+REFRESH_PRODUCT_ROLLUPS_SQL = text(
+    _DAY_ORDERS_CTE
+    + """
+    INSERT INTO product_daily_rollups
+        (day, status, product_id, order_count, item_count, revenue)
+    SELECT o.day, o.status, i.product_id, count(DISTINCT i.order_id),
+           sum(i.quantity), sum(i.price * i.quantity)
+    FROM day_items AS i JOIN day_orders AS o ON o.id = i.order_id
+    GROUP BY o.day, o.status, i.product_id
+    """
+)
+
+
+async def refresh_order_rollups(db: AsyncSession, max_days: int) -> int:
+    """
+    Recompute rollups for up to {max_days} dirty days in one transaction
+
+    Returns:
+        int: Number of refreshed days
+    """
+    result = await db.execute(CLAIM_DIRTY_DAYS_SQL, {"limit": max_days})
+    days = sorted(result.scalars().all())
+    if not days:
+        await db.commit()
+        return 0
+
+    params = {
+        "days": days,
+        "start": days[0],
+        "stop": days[-1] + timedelta(days=1),
+    }
+    for table in ("order_daily_rollups", "product_daily_rollups"):
+        await db.execute(
+            text(f"DELETE FROM {table} WHERE day = ANY(:days)"), {"days": days}
+        )
+    await db.execute(REFRESH_ORDER_ROLLUPS_SQL, params)
+    await db.execute(REFRESH_PRODUCT_ROLLUPS_SQL, params)
+    await db.commit()
+
+    return len(days)
+
+
+async def run_order_rollup_refresh() -> bool:
+    """Periodic job for TaskManager, returns True while dirty days remain"""
+    async with db_manager.get_session() as session:
+        refreshed = await refresh_order_rollups(
+            session, settings.ORDER_ROLLUP_BATCH_DAYS
+        )
+    return refreshed == settings.ORDER_ROLLUP_BATCH_DAYS
@@ -0,0 +1,76 @@
+"""
+Outbox relay
+
+Drains order_outbox in batches into a Redis Stream, and into the
+per-restaurant kitchen display streams (app.services.kitchen_display).
+Events are deleted only after XADD succeeded, in the same transaction that
+locked them, so delivery is at-least-once: a crash between XADD and COMMIT
+republishes the batch.
+Consumers deduplicate on the event_id field.
+"""
+
+import asyncio
+import json
+from typing import List
+
+import redis
+
+from app.core.config import settings
+from app.core.database import db_manager, redis_manager
+from app.crud.outbox import OutboxCRUD
+from app.models.outbox import OrderOutbox
+from app.services.kitchen_display import add_to_kitchen_stream
+
+
+def publish_events(redis_client: redis.Redis, events: List[OrderOutbox]):
+    """
+    XADD all events with one pipelined round trip, events of an order with
+    a restaurant also to its kitchen display stream
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for event in events:
+        fields = {
+            "event_id": event.id,
+            "event_type": event.event_type,
+            "order_id": event.order_id,
+            "payload": json.dumps(event.payload),
+            "created_at": event.created_at.isoformat(),
+        }
+        pipe.xadd(
+            settings.OUTBOX_STREAM,
+            fields,
+            maxlen=settings.OUTBOX_STREAM_MAXLEN,
+            approximate=True,
+        )
+        restaurant_id = event.payload.get("restaurant_id")
+        if restaurant_id is not None:
+            add_to_kitchen_stream(pipe, restaurant_id, fields)
+    pipe.execute()
+
+
+async def relay_outbox(batch_size: int) -> int:
+    """
+    Publish one batch of outbox events
+
+    Returns:
+        int: Number of published events
+    """
+    async with db_manager.get_session() as session:
+        events = await OutboxCRUD.get_batch(session, batch_size)
+        if not events:
+            return 0
+
+        async with redis_manager.get_client() as redis_client:
+            # the redis client is synchronous, keep the event loop free
+            await asyncio.to_thread(publish_events, redis_client, events)
+
+        await OutboxCRUD.delete_batch(session, [event.id for event in events])
+        await session.commit()
+
+    return len(events)
+
+
+async def run_outbox_relay() -> bool:
+    """Periodic job for TaskManager, returns True while full batches are drained"""
+    published = await relay_outbox(settings.OUTBOX_BATCH_SIZE)
+    return published == settings.OUTBOX_BATCH_SIZE
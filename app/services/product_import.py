@@ -0,0 +1,263 @@
+"""
+Bulk product import
+
+Rows are streamed from a CSV (with a header line) or NDJSON upload, validated
+with ProductCreate in chunks and loaded with asyncpg COPY into a temporary
+staging table. A final set-based upsert matches existing products by
+(restaurant_id, category_id, name), updates them and inserts the rest, all in one
+transaction. Invalid rows are skipped and reported with their row number.
+"""
+
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.product import (
+    ProductCreate,
+    ProductImportFormat,
+    ProductImportReport,
+    ProductImportRowError,
+)
+from app.services.catalog import catalog_changed
+
+STAGING_TABLE = "product_import_staging"
+STAGING_COLUMNS = [
+    "row_number",
+    "name",
+    "description",
+    "price",
+    "is_available",
+    "category_id",
+    "restaurant_id",
+]
+
+CREATE_STAGING_SQL = text(
+    f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        row_number integer NOT NULL,
+        name varchar NOT NULL,
+        description varchar NOT NULL,
+        price double precision NOT NULL,
+        is_available boolean NOT NULL,
+        category_id integer NOT NULL,
+        restaurant_id integer
+    ) ON COMMIT DROP
+    """
+)
+
+UNKNOWN_CATEGORY_SQL = text(
+    f"""
+    DELETE FROM {STAGING_TABLE} AS s
+    WHERE NOT EXISTS (SELECT 1 FROM categories AS c WHERE c.id = s.category_id)
+    RETURNING s.row_number, s.category_id
+    """
+)
+
+UNKNOWN_RESTAURANT_SQL = text(
+    f"""
+    DELETE FROM {STAGING_TABLE} AS s
+    WHERE s.restaurant_id IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM restaurants AS r WHERE r.id = s.restaurant_id)
+    RETURNING s.row_number, s.restaurant_id
+    """
+)
+
+STAGED_RESTAURANTS_SQL = text(f"SELECT DISTINCT restaurant_id FROM {STAGING_TABLE}")
+
+# the last row wins when a file repeats a product
+_SOURCE = f"""
+    SELECT DISTINCT ON (restaurant_id, category_id, name)
+        name, description, price, is_available, category_id, restaurant_id
+    FROM {STAGING_TABLE}
+    ORDER BY restaurant_id, category_id, name, row_number DESC
+"""
+
+_MATCH = """
+    p.category_id = s.category_id AND p.name = s.name
+    AND p.restaurant_id IS NOT DISTINCT FROM s.restaurant_id
+"""
+
+UPDATE_EXISTING_SQL = text(
+    f"""
+    UPDATE products AS p
+    SET description = s.description,
+        price = s.price,
+        is_available = s.is_available,
+        version = nextval('catalog_version_seq')
+    FROM ({_SOURCE}) AS s
+    WHERE {_MATCH}
+    """
+)
+
+INSERT_NEW_SQL = text(
+    f"""
+    INSERT INTO products
+        (name, description, price, is_available, category_id, restaurant_id)
+    SELECT
+        s.name, s.description, s.price, s.is_available, s.category_id,
+        s.restaurant_id
+    FROM ({_SOURCE}) AS s
+    WHERE NOT EXISTS (SELECT 1 FROM products AS p WHERE {_MATCH})
+    """
+)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+async def iter_rows(
+    lines: AsyncIterator[str], file_format: ProductImportFormat
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yields (row_number, row) where row is a dict or an exception describing why
+    the line could not be parsed. Rows are numbered from 1, the CSV header
+    line is not counted.
+    """
+    header = None
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+
+        if file_format == ProductImportFormat.CSV and header is None:
+            header = next(csv.reader([line]))
+            continue
+
+        row_number += 1
+        try:
+            if file_format == ProductImportFormat.CSV:
+                row = dict(zip(header, next(csv.reader([line]))))
+            else:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("Row must be a JSON object")
+        except (ValueError, csv.Error) as e:
+            row = e
+        yield row_number, row
+
+
+class ProductImporter:
+    """One import = one transaction on {db}, the caller must not reuse it midway"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.total_rows = 0
+        self.errors: List[ProductImportRowError] = []
+
+    async def start(self):
+        await self.db.execute(CREATE_STAGING_SQL)
+
+    async def add_chunk(self, rows: List[Tuple[int, Any]]):
+        """Validate a chunk of parsed rows and COPY the valid ones into staging"""
+        records = []
+        for row_number, row in rows:
+            self.total_rows += 1
+            if isinstance(row, Exception):
+                self._add_error(row_number, [str(row)])
+                continue
+
+            try:
+                product = ProductCreate(**row)
+            except ValidationError as e:
+                messages = [
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                    for err in e.errors()
+                ]
+                self._add_error(row_number, messages)
+                continue
+
+            records.append(
+                (
+                    row_number,
+                    product.name,
+                    product.description,
+                    product.price,
+                    product.is_available,
+                    product.category_id,
+                    product.restaurant_id,
+                )
+            )
+
+        if records:
+            connection = await self.db.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+            )
+
+    async def finish(self) -> ProductImportReport:
+        """Upsert staged rows into products and commit"""
+        result = await self.db.execute(UNKNOWN_CATEGORY_SQL)
+        for row_number, category_id in result.all():
+            self._add_error(
+                row_number, [f"category_id: Category {category_id} not found"]
+            )
+        result = await self.db.execute(UNKNOWN_RESTAURANT_SQL)
+        for row_number, restaurant_id in result.all():
+            self._add_error(
+                row_number, [f"restaurant_id: Restaurant {restaurant_id} not found"]
+            )
+        result = await self.db.execute(STAGED_RESTAURANTS_SQL)
+        restaurant_ids = set(result.scalars().all())
+
+        updated = (await self.db.execute(UPDATE_EXISTING_SQL)).rowcount
+        created = (await self.db.execute(INSERT_NEW_SQL)).rowcount
+        await self.db.commit()
+        await catalog_changed(restaurant_ids)
+
+        self.errors.sort(key=lambda error: error.row)
+        return ProductImportReport(
+            total_rows=self.total_rows,
+            created=created,
+            updated=updated,
+            errors=self.errors,
+        )
+
+    def _add_error(self, row_number: int, messages: List[str]):
+        self.errors.append(ProductImportRowError(row=row_number, errors=messages))
+
+
+async def import_products(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    file_format: ProductImportFormat,
+    chunk_size: int,
+) -> ProductImportReport:
+    """
+    Import products from a stream of raw bytes
+
+    Args:
+        db: Database AsyncSession
+        chunks: Raw CSV/NDJSON bytes, e.g. request.stream()
+        file_format: Format of the stream
+        chunk_size: Rows validated and copied per COPY
+
+    Returns:
+        ProductImportReport: Counts and per-row errors
+    """
+    importer = ProductImporter(db)
+    await importer.start()
+
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    async for row in iter_rows(iter_lines(chunks), file_format):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            await importer.add_chunk(chunk)
+            chunk = []
+    if chunk:
+        await importer.add_chunk(chunk)
+
+    return await importer.finish()
@@ -0,0 +1,241 @@
+"""
+In-memory spatial index of restaurant coordinates
+
+Restaurants are bucketed into lat/lon grids of a few cell sizes. A radius
+query picks the finest grid where the circle's bounding box covers a bounded
+number of cells, visits only those cells and filters them with an
+equirectangular distance; k-nearest queries grow the radius until k
+restaurants are inside. Restaurant writes bump a generation shared by all
+workers (app.services.index_generation). Queries never leave the process: a
+periodic task compares the generation every
+RESTAURANT_GEO_REFRESH_INTERVAL_SECONDS and rebuilds an older grid. The
+worker that made the write rebuilds before its next query.
+"""
+
+import asyncio
+import math
+import time
+from bisect import insort
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import db_manager
+from app.models.restaurant import Restaurant
+from app.services.index_generation import bump_index_generation, get_index_generation
+
+INDEX_NAME = "restaurant_geo"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+FILTER_SLACK = 1.05
+
+# cell sizes in degrees, 0.01 is ~1.1 km
+GRID_LEVELS = (0.01, 0.1, 1.0)
+MAX_CELLS_PER_QUERY = 400
+
+# (id, latitude, longitude)
+GeoPoint = Tuple[int, float, float]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """Immutable once built, replaced as a whole on rebuild"""
+
+    def __init__(self, points: Iterable[GeoPoint], cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self.lat_cells = math.ceil(180 / cell_degrees)
+        self.lon_cells = math.ceil(360 / cell_degrees)
+        self.size = 0
+
+        self._cells: Dict[Tuple[int, int], List[GeoPoint]] = {}
+        for point in points:
+            self._cells.setdefault(self._cell(point[1], point[2]), []).append(point)
+            self.size += 1
+
+    def _row(self, latitude: float) -> int:
+        row = int((latitude + 90) // self.cell_degrees)
+        return min(max(row, 0), self.lat_cells - 1)
+
+    def _column(self, longitude: float) -> int:
+        return int((longitude + 180) // self.cell_degrees) % self.lon_cells
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return self._row(latitude), self._column(longitude)
+
+    def _columns(self, row: int, longitude: float, radius_km: float) -> Iterable[int]:
+        # the circle is widest (in degrees) at the row edge closest to a pole
+        row_south = -90 + row * self.cell_degrees
+        max_abs_latitude = max(abs(row_south), abs(row_south + self.cell_degrees))
+        cos_latitude = math.cos(math.radians(min(max_abs_latitude, 90)))
+        if cos_latitude * KM_PER_DEGREE * 180 <= radius_km:
+            return range(self.lon_cells)
+
+        lon_span = radius_km / (KM_PER_DEGREE * cos_latitude)
+        first = int((longitude - lon_span + 180) // self.cell_degrees)
+        last = int((longitude + lon_span + 180) // self.cell_degrees)
+        if last - first + 1 >= self.lon_cells:
+            return range(self.lon_cells)
+        return (column % self.lon_cells for column in range(first, last + 1))
+
+    def within(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Up to {limit} (id, distance_km) within {radius_km}, nearest first
+        """
+        lat_span = radius_km / KM_PER_DEGREE
+        # cos at the box edge closest to a pole: longitude distances are
+        # underestimated, so the filter may pass extra points but never drops
+        # one; exact distances are checked below
+        cos_latitude = math.cos(math.radians(min(abs(latitude) + lat_span, 90)))
+        filter_sq = (radius_km * FILTER_SLACK) ** 2
+        first_row = self._row(latitude - lat_span)
+        last_row = self._row(latitude + lat_span)
+
+        candidates = []
+        for row in range(first_row, last_row + 1):
+            for column in self._columns(row, longitude, radius_km):
+                for point in self._cells.get((row, column), ()):
+                    # equirectangular approximation for the filter
+                    d_lat = (point[1] - latitude) * KM_PER_DEGREE
+                    d_lon = (point[2] - longitude + 180) % 360 - 180
+                    d_lon *= KM_PER_DEGREE * cos_latitude
+                    d_sq = d_lat * d_lat + d_lon * d_lon
+                    if d_sq <= filter_sq:
+                        candidates.append((d_sq, point))
+
+        # exact distances in approximate order, until no remaining candidate
+        # can beat the current {limit}-th nearest
+        candidates.sort(key=itemgetter(0))
+        nearest: List[Tuple[int, float]] = []
+        for d_sq, point in candidates:
+            if len(nearest) == limit and d_sq > (nearest[-1][1] * FILTER_SLACK) ** 2:
+                break
+            distance = haversine_km(latitude, longitude, point[1], point[2])
+            if distance <= radius_km:
+                insort(nearest, (point[0], distance), key=itemgetter(1))
+                del nearest[limit:]
+        return nearest
+
+    def cells_in_box(self, latitude: float, radius_km: float) -> float:
+        """Rough number of cells a radius query visits"""
+        rows = 2 * radius_km / (KM_PER_DEGREE * self.cell_degrees) + 1
+        cos_latitude = max(math.cos(math.radians(latitude)), 1e-6)
+        columns = 2 * radius_km / (KM_PER_DEGREE * cos_latitude * self.cell_degrees)
+        return rows * min(columns + 1, self.lon_cells)
+
+
+class GeoIndex:
+    """
+    Grids of increasing cell size over the same points. Small radii use the
+    fine grid (few points per cell), large ones a coarse grid (few cells).
+    """
+
+    def __init__(self, points: List[GeoPoint], levels: Iterable[float]):
+        self.grids = [GridIndex(points, cell_degrees) for cell_degrees in levels]
+        self.size = len(points)
+
+    def within(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[int, float]]:
+        """Up to {limit} (id, distance_km) within {radius_km}, nearest first"""
+        grid = self.grids[-1]
+        for candidate in self.grids:
+            if candidate.cells_in_box(latitude, radius_km) <= MAX_CELLS_PER_QUERY:
+                grid = candidate
+                break
+        return grid.within(latitude, longitude, radius_km, limit)
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int, max_radius_km: float
+    ) -> List[Tuple[int, float]]:
+        """k nearest (id, distance_km) not farther than {max_radius_km}"""
+        radius_km = self.grids[0].cell_degrees * KM_PER_DEGREE
+        while True:
+            radius_km = min(radius_km, max_radius_km)
+            # everything within the radius was seen, so these are the true k nearest
+            found = self.within(latitude, longitude, radius_km, k)
+            if len(found) >= k or radius_km >= max_radius_km:
+                return found
+            radius_km *= 4
+
+
+class RestaurantGeoIndex:
+
+    def __init__(self):
+        self.grid: Optional[GeoIndex] = None
+        # shared generation the grid was built from
+        self._generation = -1
+        self._built_at = 0.0
+        # restaurants written by this worker since the grid was built
+        self._dirty = False
+        self._rebuild_lock = asyncio.Lock()
+
+    @property
+    def needs_rebuild(self) -> bool:
+        age = time.monotonic() - self._built_at
+        return age > settings.RESTAURANT_GEO_MAX_AGE_SECONDS
+
+    async def changed(self) -> bool:
+        """Whether any worker changed restaurants since the grid was built"""
+        return await get_index_generation(INDEX_NAME) > self._generation
+
+    async def invalidate(self):
+        """Restaurant added, moved or deleted, the grid of every worker is stale"""
+        self._dirty = True
+        await bump_index_generation(INDEX_NAME)
+
+    async def rebuild(self):
+        async with self._rebuild_lock:
+            await self._rebuild()
+
+    async def _rebuild(self):
+        self._dirty = False
+        generation = await get_index_generation(INDEX_NAME)
+        async with db_manager.get_session() as session:
+            result = await session.execute(
+                select(Restaurant.id, Restaurant.latitude, Restaurant.longitude)
+                .filter(Restaurant.latitude.is_not(None))
+                .filter(Restaurant.longitude.is_not(None))
+            )
+            points = [tuple(row) for row in result.all()]
+
+        self.grid = await asyncio.to_thread(GeoIndex, points, GRID_LEVELS)
+        # read before loading: a write during the load leaves it stale
+        self._generation = generation
+        self._built_at = time.monotonic()
+
+    async def get_grid(self) -> GeoIndex:
+        """
+        Current grid, rebuilt inline first if it was never built or this
+        worker changed restaurants since. Changes made by other workers are
+        picked up by refresh_restaurant_geo_index.
+        """
+        if self.grid is None or self._dirty:
+            async with self._rebuild_lock:
+                # another request may have rebuilt it in the meantime
+                if self.grid is None or self._dirty:
+                    await self._rebuild()
+        return self.grid
+
+
+restaurant_geo_index = RestaurantGeoIndex()
+
+
+async def refresh_restaurant_geo_index():
+    """Periodic job for TaskManager, also keeps idle workers current"""
+    if restaurant_geo_index.needs_rebuild or await restaurant_geo_index.changed():
+        await restaurant_geo_index.rebuild()
@@ -0,0 +1,86 @@
+"""
+Cached restaurant listing pages
+
+Pages are cached per filter scope (country, city, both or none) under a key
+that embeds the scope's generation number. A restaurant write bumps the
+generations of every scope the restaurant was or is now listed in, so a
+write in one city leaves the cached pages of other cities alone. As with
+the category list, a page computed before a write can never be stored
+under the current generation; entries of old generations simply expire.
+"""
+
+import asyncio
+from typing import Iterable, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import redis_manager
+from app.schemas.restaurant import RestaurantPage
+
+GENERATIONS_KEY = "restaurants:list:generations"
+
+ANY = "*"
+
+
+def list_scope(country: Optional[str], city: Optional[str]) -> str:
+    return f"{country or ANY}|{city or ANY}"
+
+
+def _page_key(scope: str, generation: str, limit: int, cursor: Optional[str]) -> str:
+    return f"restaurants:list:{scope}:{generation}:{limit}:{cursor or ''}"
+
+
+async def get_restaurant_list_generation(scope: str) -> str:
+    async with redis_manager.get_client() as redis_client:
+        generation = await asyncio.to_thread(redis_client.hget, GENERATIONS_KEY, scope)
+    return generation or "0"
+
+
+async def get_cached_restaurant_page(
+    scope: str, generation: str, limit: int, cursor: Optional[str]
+) -> Optional[RestaurantPage]:
+    async with redis_manager.get_client() as redis_client:
+        payload = await asyncio.to_thread(
+            redis_client.get, _page_key(scope, generation, limit, cursor)
+        )
+    if payload is None:
+        return None
+    return RestaurantPage.model_validate_json(payload)
+
+
+async def cache_restaurant_page(
+    scope: str,
+    generation: str,
+    limit: int,
+    cursor: Optional[str],
+    page: RestaurantPage,
+):
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(
+            redis_client.set,
+            _page_key(scope, generation, limit, cursor),
+            page.model_dump_json(),
+            ex=settings.RESTAURANT_LIST_TTL_SECONDS,
+        )
+
+
+async def invalidate_restaurant_list(locations: Iterable[Tuple[str, str]]):
+    """
+    Args:
+        locations: (country, city) of the restaurant before and after the write
+    """
+    scopes: Set[str] = set()
+    for country, city in locations:
+        scopes.update(
+            (
+                list_scope(None, None),
+                list_scope(country, None),
+                list_scope(None, city),
+                list_scope(country, city),
+            )
+        )
+
+    async with redis_manager.get_client() as redis_client:
+        pipe = redis_client.pipeline(transaction=False)
+        for scope in scopes:
+            pipe.hincrby(GENERATIONS_KEY, scope, 1)
+        await asyncio.to_thread(pipe.execute)
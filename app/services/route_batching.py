@@ -0,0 +1,233 @@
+"""
+Multi-stop route batching
+
+Pure NumPy with no app imports besides dispatch_solver, so it runs in the
+dispatch worker processes.
+
+Grouping: orders are taken oldest first as batch seeds; a seed collects the
+orders nearest to it that are compatible with it and still unbatched.
+Compatible means pickup within {pickup_radius_km}, drop-off within
+{dropoff_spread_km} and created within {window_seconds} of the seed's, all
+from pairwise matrices. Orders without a drop-off point are never batched.
+
+Dispatch: each batch is matched to a courier as one unit at its seed's
+pickup, taking capacity for all its orders; orders of batches no courier
+had room for are matched again one by one.
+
+Routing: all pickups first, then all drop-offs (so every pickup precedes
+its drop-off), each leg ordered by nearest neighbour and improved with
+2-opt. Batches are a few stops, an exact solver is not worth it.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.services.dispatch_solver import (
+    EARTH_RADIUS_KM,
+    assign,
+    chord_to_km,
+    unit_vectors,
+)
+
+
+def chord_sq_matrix(points: np.ndarray) -> np.ndarray:
+    """(n, 2) degrees -> (n, n) squared chords on the unit sphere, nan for nan"""
+    xyz = unit_vectors(np.asarray(points, dtype=np.float64))
+    return 2.0 - 2.0 * (xyz @ xyz.T)
+
+
+def km_to_chord_sq(km: float) -> float:
+    """Inverse of dispatch_solver.chord_to_km"""
+    return (2 * np.sin(min(km / (2 * EARTH_RADIUS_KM), np.pi / 2))) ** 2
+
+
+def distance_matrix(points: np.ndarray) -> np.ndarray:
+    """(n, 2) degrees -> (n, n) great circle km, nan for nan points"""
+    return chord_to_km(chord_sq_matrix(points))
+
+
+def nearest_neighbour(distance: Sequence[Sequence[float]], start: int) -> List[int]:
+    """Open path from {start} through all points, nearest unvisited next"""
+    unvisited = set(range(len(distance))) - {start}
+    path = [start]
+    while unvisited:
+        row = distance[path[-1]]
+        nearest = min(unvisited, key=row.__getitem__)
+        unvisited.remove(nearest)
+        path.append(nearest)
+    return path
+
+
+def two_opt(path: List[int], distance: Sequence[Sequence[float]]) -> List[int]:
+    """
+    Reverse path segments while that shortens the open path; path[0]
+    stays first
+    """
+    path = list(path)
+    last = len(path) - 1
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, last):
+            before = distance[path[i - 1]]
+            for j in range(i + 1, last + 1):
+                # reversing path[i..j] swaps edges (i-1, i), (j, j+1) for
+                # (i-1, j), (i, j+1); the path end has no edge after j
+                delta = before[path[j]] - before[path[i]]
+                if j < last:
+                    after = path[j + 1]
+                    delta += distance[path[i]][after] - distance[path[j]][after]
+                if delta < -1e-9:
+                    path[i : j + 1] = reversed(path[i : j + 1])
+                    improved = True
+                    before = distance[path[i - 1]]
+    return path
+
+
+def _leg(start: np.ndarray, points: np.ndarray) -> Tuple[List[int], float, np.ndarray]:
+    """(visit order of {points}, km, last point) starting at {start}"""
+    distance = distance_matrix(np.vstack((start, points))).tolist()
+    path = two_opt(nearest_neighbour(distance, 0), distance)
+    km = sum(distance[a][b] for a, b in zip(path, path[1:]))
+    return [stop - 1 for stop in path[1:]], km, points[path[-1] - 1]
+
+
+def plan_route(
+    start: np.ndarray, pickups: np.ndarray, dropoffs: np.ndarray
+) -> Tuple[List[int], List[int], float]:
+    """
+    Args:
+        start: [latitude, longitude] of the courier, or the first pickup
+        pickups: (p, 2) points still to pick up, may be empty
+        dropoffs: (d, 2) points to deliver to
+
+    Returns:
+        (pickup visit order, drop-off visit order, route km)
+    """
+    start = np.asarray(start, dtype=np.float64)
+    pickup_order, dropoff_order, km = [], [], 0.0
+    if len(pickups):
+        pickup_order, km, start = _leg(start, np.asarray(pickups, dtype=np.float64))
+    if len(dropoffs):
+        dropoff_order, dropoff_km, _ = _leg(
+            start, np.asarray(dropoffs, dtype=np.float64)
+        )
+        km += dropoff_km
+    return pickup_order, dropoff_order, km
+
+
+def group_orders(
+    pickups: np.ndarray,
+    dropoffs: np.ndarray,
+    created_at: np.ndarray,
+    max_size: int,
+    pickup_radius_km: float,
+    dropoff_spread_km: float,
+    window_seconds: float,
+) -> np.ndarray:
+    """
+    Args:
+        pickups: (n, 2) pickup points, oldest order first
+        dropoffs: (n, 2) drop-off points, nan if unknown
+        created_at: (n,) unix timestamps
+        max_size: Orders per batch
+
+    Returns:
+        (n,) batch label per order: index of the batch seed order
+    """
+    n = len(pickups)
+    batch_of = np.arange(n)
+    if n < 2 or max_size < 2:
+        return batch_of
+
+    # thresholds on squared chords: no trigonometry over the n x n matrices
+    pickup_chord = chord_sq_matrix(pickups)
+    dropoff_chord = chord_sq_matrix(dropoffs)
+    created_at = np.asarray(created_at, dtype=np.float64)
+    # nan (no drop-off) compares False: never compatible
+    compatible = (
+        (pickup_chord <= km_to_chord_sq(pickup_radius_km))
+        & (dropoff_chord <= km_to_chord_sq(dropoff_spread_km))
+        & (np.abs(created_at[:, None] - created_at[None, :]) <= window_seconds)
+    )
+    np.fill_diagonal(compatible, False)
+
+    free = np.ones(n, dtype=bool)
+    for seed in range(n):
+        if not free[seed]:
+            continue
+        free[seed] = False
+        partners = np.flatnonzero(compatible[seed] & free)
+        if len(partners) == 0:
+            continue
+        if len(partners) > max_size - 1:
+            # chord lengths order like distances at city scale
+            closeness = np.sqrt(np.maximum(pickup_chord[seed, partners], 0))
+            closeness += np.sqrt(np.maximum(dropoff_chord[seed, partners], 0))
+            nearest = np.argsort(closeness, kind="stable")
+            partners = partners[nearest[: max_size - 1]]
+        batch_of[partners] = seed
+        free[partners] = False
+    return batch_of
+
+
+def assign_batches(
+    pickups: np.ndarray,
+    dropoffs: np.ndarray,
+    created_at: np.ndarray,
+    courier_points: np.ndarray,
+    capacity: np.ndarray,
+    load: np.ndarray,
+    pickup_radius_km: float,
+    dropoff_spread_km: float,
+    window_seconds: float,
+    max_distance_km: float,
+    load_penalty_km: float,
+    candidates: int = 8,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group the orders and assign couriers to the batches
+
+    Args:
+        pickups, dropoffs, created_at: As for group_orders
+        courier_points, capacity, load: As for dispatch_solver.assign,
+            a batch is at most the largest free capacity
+
+    Returns:
+        (courier index per order or -1, batch label per order)
+    """
+    capacity = np.asarray(capacity, dtype=np.int64)
+    max_size = int(capacity.max()) if len(capacity) else 1
+    batch_of = group_orders(
+        pickups,
+        dropoffs,
+        created_at,
+        max_size,
+        pickup_radius_km,
+        dropoff_spread_km,
+        window_seconds,
+    )
+    solve = dict(
+        max_distance_km=max_distance_km,
+        load_penalty_km=load_penalty_km,
+        candidates=candidates,
+    )
+
+    # seeds are the oldest order of their batch, np.unique keeps age order
+    seeds, size = np.unique(batch_of, return_counts=True)
+    seed_courier, _ = assign(
+        pickups[seeds], courier_points, capacity, load, demand=size, **solve
+    )
+    courier_of = seed_courier[np.searchsorted(seeds, batch_of)]
+
+    unplaced = np.flatnonzero(courier_of < 0)
+    taken = np.bincount(courier_of[courier_of >= 0], minlength=len(capacity))
+    split = unplaced[size[np.searchsorted(seeds, batch_of[unplaced])] > 1]
+    if len(split):
+        single_courier, _ = assign(
+            pickups[split], courier_points, capacity - taken, load + taken, **solve
+        )
+        courier_of[split] = single_courier
+        batch_of[split] = split
+    return courier_of, batch_of
@@ -0,0 +1,166 @@
+"""
+Surge pricing
+
+A periodic job bins demand (open orders and orders created in the last
+SURGE_RECENT_MINUTES, by delivery point) and supply (active couriers) into
+geohash cells of SURGE_CELL_PRECISION with NumPy, and turns the demand per
+courier of every cell into a delivery fee multiplier. Only cells above 1.0
+are published, as one Redis hash cell -> multiplier: written under a
+temporary key and swapped in with RENAME, so readers never see a partial
+map. Checkout reads the multiplier of its cell with one HGET.
+
+The hash expires after SURGE_TTL_SECONDS: if the job stops, fees fall back
+to the base fee.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import redis
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import geohash
+from app.core.config import settings
+from app.core.database import db_manager, redis_manager
+from app.models.order import Order, OrderStatus
+from app.services.dispatch import load_active_couriers
+
+HEATMAP_KEY = "surge:heatmap"
+HEATMAP_NEXT_KEY = "surge:heatmap:next"
+
+OPEN_STATUSES = (OrderStatus.NEW, OrderStatus.PROCESSING, OrderStatus.DELIVERY)
+CLOSED_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELED)
+
+SURGE_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(hashtext('surge'))")
+
+
+def cell_ids(points: np.ndarray, precision: int) -> np.ndarray:
+    """(n, 2) degrees -> (n,) row * columns + column of the geohash grid"""
+    rows, columns = geohash.grid_shape(precision)
+    row = np.clip(((points[:, 0] + 90) / 180 * rows).astype(np.int64), 0, rows - 1)
+    column = np.clip(
+        ((points[:, 1] + 180) / 360 * columns).astype(np.int64), 0, columns - 1
+    )
+    return row * columns + column
+
+
+def surge_multipliers(
+    demand_points: np.ndarray, courier_points: np.ndarray, precision: int
+) -> Dict[str, float]:
+    """
+    Multiplier per geohash cell with demand, only cells above 1.0
+
+    The multiplier grows by SURGE_STEP per order per courier above
+    SURGE_DEMAND_PER_COURIER, up to SURGE_MAX_MULTIPLIER, in steps of 0.1.
+    """
+    demand_cells = cell_ids(demand_points, precision)
+    courier_cells = cell_ids(courier_points, precision)
+    cells, inverse = np.unique(
+        np.concatenate((demand_cells, courier_cells)), return_inverse=True
+    )
+    demand = np.bincount(inverse[: len(demand_cells)], minlength=len(cells))
+    supply = np.bincount(inverse[len(demand_cells) :], minlength=len(cells))
+
+    ratio = demand / np.maximum(supply, 1)
+    multiplier = 1 + settings.SURGE_STEP * (ratio - settings.SURGE_DEMAND_PER_COURIER)
+    multiplier = np.round(np.clip(multiplier, 1, settings.SURGE_MAX_MULTIPLIER), 1)
+
+    surging = np.flatnonzero(multiplier > 1)
+    _, columns = geohash.grid_shape(precision)
+    heatmap = {}
+    for cell, value in zip(cells[surging].tolist(), multiplier[surging].tolist()):
+        row, column = divmod(cell, columns)
+        heatmap[geohash.encode_cell(row, column, precision)] = value
+    return heatmap
+
+
+def publish_heatmap(redis_client: redis.Redis, heatmap: Dict[str, float]):
+    """Replace the heatmap atomically, one pipelined round trip"""
+    pipe = redis_client.pipeline(transaction=False)
+    if heatmap:
+        pipe.delete(HEATMAP_NEXT_KEY)
+        pipe.hset(HEATMAP_NEXT_KEY, mapping=heatmap)
+        pipe.expire(HEATMAP_NEXT_KEY, settings.SURGE_TTL_SECONDS)
+        pipe.rename(HEATMAP_NEXT_KEY, HEATMAP_KEY)
+    else:
+        pipe.delete(HEATMAP_KEY)
+    pipe.execute()
+
+
+async def compute_heatmap(db: AsyncSession) -> Optional[Dict[str, float]]:
+    """
+    Count demand and supply per cell and publish the heatmap
+
+    Returns:
+        Published heatmap, None if another process is computing
+    """
+    if not (await db.execute(SURGE_LOCK_SQL)).scalar():
+        return None
+
+    since = func.localtimestamp() - timedelta(minutes=settings.SURGE_RECENT_MINUTES)
+    result = await db.execute(
+        select(Order.delivery_latitude, Order.delivery_longitude)
+        .filter(Order.delivery_latitude.is_not(None))
+        .filter(Order.delivery_longitude.is_not(None))
+        .filter(
+            or_(
+                Order.status.in_(OPEN_STATUSES),
+                Order.status.in_(CLOSED_STATUSES) & (Order.created_at >= since),
+            )
+        )
+    )
+    demand_points = np.array(result.all(), dtype=np.float64).reshape(-1, 2)
+
+    async with redis_manager.get_client() as redis_client:
+        couriers = await asyncio.to_thread(
+            load_active_couriers,
+            redis_client,
+            settings.COURIER_POSITION_MAX_AGE_SECONDS,
+        )
+    courier_points = np.array(
+        [courier[1:] for courier in couriers], dtype=np.float64
+    ).reshape(-1, 2)
+
+    heatmap = await asyncio.to_thread(
+        surge_multipliers,
+        demand_points,
+        courier_points,
+        settings.SURGE_CELL_PRECISION,
+    )
+    async with redis_manager.get_client() as redis_client:
+        await asyncio.to_thread(publish_heatmap, redis_client, heatmap)
+    return heatmap
+
+
+async def run_surge_refresh():
+    """Periodic job for TaskManager"""
+    async with db_manager.get_session() as session:
+        await compute_heatmap(session)
+
+
+async def get_heatmap() -> Dict[str, float]:
+    """Published multipliers, cells missing from it are at 1.0"""
+    async with redis_manager.get_client() as redis_client:
+        heatmap = await asyncio.to_thread(redis_client.hgetall, HEATMAP_KEY)
+    return {cell: float(value) for cell, value in heatmap.items()}
+
+
+async def get_delivery_fee(
+    latitude: Optional[float], longitude: Optional[float]
+) -> Tuple[float, float]:
+    """
+    (multiplier, fee) for a delivery point, the base fee without one
+
+    One HGET, no aggregation: the multipliers are precomputed
+    """
+    multiplier = 1.0
+    if latitude is not None and longitude is not None:
+        cell = geohash.encode(latitude, longitude, settings.SURGE_CELL_PRECISION)
+        async with redis_manager.get_client() as redis_client:
+            cached = await asyncio.to_thread(redis_client.hget, HEATMAP_KEY, cell)
+        if cached is not None:
+            multiplier = float(cached)
+    return multiplier, round(settings.SURGE_BASE_DELIVERY_FEE * multiplier, 2)
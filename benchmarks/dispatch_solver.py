@@ -0,0 +1,85 @@
+"""
+Courier assignment benchmark
+
+Deterministic synthetic city: orders and couriers scattered around a center
+with a fixed seed, so runs are comparable between changes.
+
+    python -m benchmarks.dispatch_solver --orders 1000 --couriers 3000
+
+Reports solver time in process and the round trip through a worker pool
+(what the dispatcher pays: pickling the arrays both ways).
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.services.dispatch_solver import assign
+
+CENTER = (52.52, 13.405)
+# ~ +-15 km
+SPREAD_DEGREES = 0.15
+
+
+def synthetic_batch(orders: int, couriers: int, seed: int):
+    rng = np.random.default_rng(seed)
+    order_points = np.asarray(CENTER) + rng.normal(0, SPREAD_DEGREES / 2, (orders, 2))
+    courier_points = np.asarray(CENTER) + rng.uniform(
+        -SPREAD_DEGREES, SPREAD_DEGREES, (couriers, 2)
+    )
+    load = rng.integers(0, 3, couriers)
+    capacity = 3 - load
+    return order_points, courier_points, capacity, load
+
+
+def percentile(samples, q):
+    return float(np.percentile(np.asarray(samples), q))
+
+
+def run(args):
+    batch = synthetic_batch(args.orders, args.couriers, args.seed)
+    solve_args = (*batch, args.max_distance_km, args.load_penalty_km)
+
+    courier_of, distance_of = assign(*solve_args)
+    assigned = courier_of >= 0
+    print(
+        f"{args.orders} orders, {args.couriers} couriers: "
+        f"{int(assigned.sum())} assigned, "
+        f"mean pickup distance {np.nanmean(distance_of):.2f} km"
+    )
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        assign(*solve_args)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(
+        f"in process:  median {statistics.median(timings):.1f} ms, "
+        f"p95 {percentile(timings, 95):.1f} ms"
+    )
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        pool.submit(assign, *solve_args).result()  # warm up the worker
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            pool.submit(assign, *solve_args).result()
+            timings.append((time.perf_counter() - started) * 1000)
+    print(
+        f"worker pool: median {statistics.median(timings):.1f} ms, "
+        f"p95 {percentile(timings, 95):.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--couriers", type=int, default=3000)
+    parser.add_argument("--max-distance-km", type=float, default=10)
+    parser.add_argument("--load-penalty-km", type=float, default=2)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    run(parser.parse_args())
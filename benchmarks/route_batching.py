@@ -0,0 +1,154 @@
+"""
+Route batching benchmark
+
+Deterministic synthetic order sets: pickups clustered around restaurants,
+drop-offs scattered around their pickup, creation times spread over a few
+minutes, all from a fixed seed.
+
+    python -m benchmarks.route_batching --orders 1000 --couriers 3000
+
+Reports grouping and dispatch time through a worker pool, the batches
+found and the km they save against delivering every order on its own, and
+nearest neighbour against nearest neighbour + 2-opt on longer tours.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from app.services.route_batching import (
+    assign_batches,
+    distance_matrix,
+    group_orders,
+    nearest_neighbour,
+    plan_route,
+    two_opt,
+)
+
+CENTER = (52.52, 13.405)
+# ~ +-15 km
+SPREAD_DEGREES = 0.15
+RESTAURANTS = 200
+
+
+def synthetic_orders(orders: int, seed: int, window_seconds: float):
+    rng = np.random.default_rng(seed)
+    restaurants = np.asarray(CENTER) + rng.normal(
+        0, SPREAD_DEGREES / 2, (RESTAURANTS, 2)
+    )
+    pickups = restaurants[rng.integers(0, RESTAURANTS, orders)]
+    dropoffs = pickups + rng.normal(0, 0.02, (orders, 2))
+    created_at = np.sort(rng.uniform(0, window_seconds * 3, orders))
+    return pickups, dropoffs, created_at
+
+
+def synthetic_couriers(couriers: int, seed: int):
+    rng = np.random.default_rng(seed + 1)
+    points = np.asarray(CENTER) + rng.uniform(
+        -SPREAD_DEGREES, SPREAD_DEGREES, (couriers, 2)
+    )
+    load = rng.integers(0, 3, couriers)
+    return points, 3 - load, load
+
+
+def timed(repeat: int, call) -> str:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return (
+        f"median {statistics.median(timings):.1f} ms, "
+        f"p95 {float(np.percentile(timings, 95)):.1f} ms"
+    )
+
+
+def path_km(path, distance) -> float:
+    return sum(distance[a][b] for a, b in zip(path, path[1:]))
+
+
+def run(args):
+    window_seconds = args.window_minutes * 60
+    pickups, dropoffs, created_at = synthetic_orders(
+        args.orders, args.seed, window_seconds
+    )
+    group = partial(
+        group_orders,
+        pickups,
+        dropoffs,
+        created_at,
+        3,
+        args.pickup_radius_km,
+        args.dropoff_spread_km,
+        window_seconds,
+    )
+
+    batch_of = group()
+    seeds, size = np.unique(batch_of, return_counts=True)
+    single_km = batched_km = 0.0
+    for seed in seeds[size > 1]:
+        members = np.flatnonzero(batch_of == seed)
+        for member in members:
+            single_km += plan_route(pickups[member], [], dropoffs[member : member + 1])[
+                2
+            ]
+        batched_km += plan_route(pickups[seed], pickups[members], dropoffs[members])[2]
+    print(
+        f"{args.orders} orders: {len(seeds)} batches, "
+        f"{int(size[size > 1].sum())} orders batched, "
+        f"{single_km:.0f} km alone -> {batched_km:.0f} km batched"
+    )
+    print(f"grouping in process: {timed(args.repeat, group)}")
+
+    courier_points, capacity, load = synthetic_couriers(args.couriers, args.seed)
+    dispatch = partial(
+        assign_batches,
+        pickups=pickups,
+        dropoffs=dropoffs,
+        created_at=created_at,
+        courier_points=courier_points,
+        capacity=capacity,
+        load=load,
+        pickup_radius_km=args.pickup_radius_km,
+        dropoff_spread_km=args.dropoff_spread_km,
+        window_seconds=window_seconds,
+        max_distance_km=10,
+        load_penalty_km=2,
+    )
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        pool.submit(dispatch).result()  # warm up the worker
+        print(
+            f"dispatch with {args.couriers} couriers, worker pool: "
+            f"{timed(args.repeat, lambda: pool.submit(dispatch).result())}"
+        )
+
+    rng = np.random.default_rng(args.seed)
+    nn_km = opt_km = 0.0
+    for _ in range(args.tours):
+        stops = np.asarray(CENTER) + rng.normal(0, 0.03, (args.tour_stops, 2))
+        distance = distance_matrix(stops).tolist()
+        path = nearest_neighbour(distance, 0)
+        nn_km += path_km(path, distance)
+        opt_km += path_km(two_opt(path, distance), distance)
+    print(
+        f"{args.tours} tours of {args.tour_stops} stops: nearest neighbour "
+        f"{nn_km / args.tours:.1f} km, + 2-opt {opt_km / args.tours:.1f} km"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--couriers", type=int, default=3000)
+    parser.add_argument("--pickup-radius-km", type=float, default=1)
+    parser.add_argument("--dropoff-spread-km", type=float, default=3)
+    parser.add_argument("--window-minutes", type=float, default=10)
+    parser.add_argument("--tours", type=int, default=50)
+    parser.add_argument("--tour-stops", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    run(parser.parse_args())
@@ -14,10 +14,23 @@ from app.models import (
     User,
     UserAddress,
     Restaurant,
+    DeliveryZone,
+    CourierLocation,
+    RestaurantOpeningHours,
+    RestaurantHoursException,
+    RestaurantOpenSlot,
+    CatalogTombstone,
+    CatalogVersion,
     Category,
     Product,
     Order,
     OrderItem,
+    OrderArchive,
+    OrderItemArchive,
+    OrderOutbox,
+    OrderDailyRollup,
+    ProductDailyRollup,
+    OrderRollupDirtyDay,
 )
 
 # Alembic config
@@ -0,0 +1,57 @@
+"""add product_name to OrderItem
+
+Revision ID: 5c2e8f1a7d34
+Revises: ed79e53713ea
+Create Date: 2026-10-19 09:00:12.418203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8f1a7d34"
+down_revision: Union[str, Sequence[str], None] = "ed79e53713ea"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "order_items", sa.Column("product_name", sa.String(length=100), nullable=True)
+    )
+
+    # Backfill by id ranges so every batch is a short transaction-friendly
+    # UPDATE and rows whose product is gone do not stall the loop.
+    conn = op.get_bind()
+    min_id, max_id = conn.execute(
+        sa.text("SELECT min(id), max(id) FROM order_items")
+    ).one()
+    if min_id is None:
+        return
+
+    for start in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+        conn.execute(
+            sa.text(
+                """
+                UPDATE order_items AS oi
+                SET product_name = p.name
+                FROM products AS p
+                WHERE p.id = oi.product_id
+                  AND oi.id >= :start AND oi.id < :stop
+                  AND oi.product_name IS NULL
+                """
+            ),
+            {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("order_items", "product_name")
@@ -0,0 +1,86 @@
+"""add orders archive
+
+Revision ID: 9a41d7c03be2
+Revises: 5c2e8f1a7d34
+Create Date: 2026-10-19 10:30:47.102934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9a41d7c03be2"
+down_revision: Union[str, Sequence[str], None] = "5c2e8f1a7d34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_orders_user_id_created_at", "orders", ["user_id", "created_at"])
+    op.create_index("ix_orders_status_created_at", "orders", ["status", "created_at"])
+
+    # Monthly partitions are created by app.services.order_archive
+    op.create_table(
+        "orders_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "NEW",
+                "PROCESSING",
+                "DELIVERY",
+                "COMPLETED",
+                "CANCELED",
+                name="orderstatus",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("delivery_address", sa.String(length=255), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_orders_archive_user_id_created_at",
+        "orders_archive",
+        ["user_id", "created_at"],
+    )
+
+    op.create_table(
+        "order_items_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("product_name", sa.String(length=100), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_order_items_archive_order_id", "order_items_archive", ["order_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_order_items_archive_order_id", table_name="order_items_archive")
+    op.drop_table("order_items_archive")
+    op.drop_index("ix_orders_archive_user_id_created_at", table_name="orders_archive")
+    # partitions are dropped together with the partitioned table
+    op.drop_table("orders_archive")
+    op.drop_index("ix_orders_status_created_at", table_name="orders")
+    op.drop_index("ix_orders_user_id_created_at", table_name="orders")
@@ -0,0 +1,74 @@
+"""add order rollups
+
+Revision ID: e37b0c5a92f1
+Revises: 9a41d7c03be2
+Create Date: 2026-10-19 11:45:03.551870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e37b0c5a92f1"
+down_revision: Union[str, Sequence[str], None] = "9a41d7c03be2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+order_status = postgresql.ENUM(
+    "NEW",
+    "PROCESSING",
+    "DELIVERY",
+    "COMPLETED",
+    "CANCELED",
+    name="orderstatus",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "order_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("status", order_status, nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("item_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "status"),
+    )
+    op.create_table(
+        "product_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("status", order_status, nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("item_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "status", "product_id"),
+    )
+    op.create_table(
+        "order_rollup_dirty_days",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+
+    # Build the rollups for the existing history on the next refresh
+    op.execute(
+        """
+        INSERT INTO order_rollup_dirty_days (day)
+        SELECT DISTINCT created_at::date FROM orders
+        UNION
+        SELECT DISTINCT created_at::date FROM orders_archive
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("order_rollup_dirty_days")
+    op.drop_table("product_daily_rollups")
+    op.drop_table("order_daily_rollups")
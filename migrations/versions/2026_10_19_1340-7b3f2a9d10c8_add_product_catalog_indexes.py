@@ -0,0 +1,38 @@
+"""add product catalog indexes
+
+Revision ID: 7b3f2a9d10c8
+Revises: 1f8d6b2c4e07
+Create Date: 2026-10-19 13:40:55.019342
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3f2a9d10c8"
+down_revision: Union[str, Sequence[str], None] = "1f8d6b2c4e07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_products_category_id_price_id", "products", ["category_id", "price", "id"]
+    )
+    op.create_index(
+        "ix_products_category_id_name_id", "products", ["category_id", "name", "id"]
+    )
+    op.create_index("ix_products_price_id", "products", ["price", "id"])
+    op.create_index("ix_products_name_id", "products", ["name", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_name_id", table_name="products")
+    op.drop_index("ix_products_price_id", table_name="products")
+    op.drop_index("ix_products_category_id_name_id", table_name="products")
+    op.drop_index("ix_products_category_id_price_id", table_name="products")
@@ -0,0 +1,35 @@
+"""add product name trigram index
+
+Revision ID: 3d8a5e6f2b91
+Revises: c6e19d0b5f3a
+Create Date: 2026-10-19 15:10:09.385217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d8a5e6f2b91"
+down_revision: Union[str, Sequence[str], None] = "c6e19d0b5f3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_products_name_trgm",
+        "products",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_name_trgm", table_name="products")
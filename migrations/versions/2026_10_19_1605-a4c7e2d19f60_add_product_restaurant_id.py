@@ -0,0 +1,44 @@
+"""add product restaurant_id
+
+Revision ID: a4c7e2d19f60
+Revises: 3d8a5e6f2b91
+Create Date: 2026-10-19 16:05:41.517093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c7e2d19f60"
+down_revision: Union[str, Sequence[str], None] = "3d8a5e6f2b91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("products", sa.Column("restaurant_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "products_restaurant_id_fkey",
+        "products",
+        "restaurants",
+        ["restaurant_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index(
+        "ix_products_restaurant_id_category_id",
+        "products",
+        ["restaurant_id", "category_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_restaurant_id_category_id", table_name="products")
+    op.drop_constraint("products_restaurant_id_fkey", "products", type_="foreignkey")
+    op.drop_column("products", "restaurant_id")
@@ -0,0 +1,127 @@
+"""add catalog version
+
+Revision ID: 5e0b8c3f7a12
+Revises: a4c7e2d19f60
+Create Date: 2026-10-19 16:50:27.804615
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e0b8c3f7a12"
+down_revision: Union[str, Sequence[str], None] = "a4c7e2d19f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_TABLES = ("categories", "products", "catalog_tombstones")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence("catalog_version_seq")))
+    for table in ("categories", "products"):
+        op.add_column(
+            table,
+            sa.Column(
+                "version",
+                sa.BigInteger(),
+                server_default=sa.text("nextval('catalog_version_seq')"),
+                nullable=False,
+            ),
+        )
+    op.create_index("ix_products_version", "products", ["version"])
+
+    op.create_table(
+        "catalog_tombstones",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("entity", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('catalog_version_seq')"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_catalog_tombstones_entity_version",
+        "catalog_tombstones",
+        ["entity", "version"],
+    )
+
+    # last committed version: writers lock it before drawing versions and
+    # store the drawn maximum, so versions follow commit order
+    op.create_table(
+        "catalog_version",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        "INSERT INTO catalog_version (id, version) "
+        "SELECT 1, CASE WHEN is_called THEN last_value ELSE 0 END "
+        "FROM catalog_version_seq"
+    )
+    op.execute(
+        """
+        CREATE FUNCTION catalog_version_lock() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE catalog_version SET version = version WHERE id = 1;
+            RETURN NULL;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION catalog_version_store() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE catalog_version
+            SET version = greatest(
+                version, (SELECT last_value FROM catalog_version_seq WHERE is_called)
+            )
+            WHERE id = 1;
+            RETURN NULL;
+        END $$
+        """
+    )
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_catalog_version_lock
+            BEFORE INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION catalog_version_lock()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_catalog_version_store
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION catalog_version_store()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER {table}_catalog_version_store ON {table}")
+        op.execute(f"DROP TRIGGER {table}_catalog_version_lock ON {table}")
+    op.execute("DROP FUNCTION catalog_version_store()")
+    op.execute("DROP FUNCTION catalog_version_lock()")
+    op.drop_table("catalog_version")
+    op.drop_index(
+        "ix_catalog_tombstones_entity_version", table_name="catalog_tombstones"
+    )
+    op.drop_table("catalog_tombstones")
+    op.drop_index("ix_products_version", table_name="products")
+    op.drop_column("products", "version")
+    op.drop_column("categories", "version")
+    op.execute(sa.schema.DropSequence(sa.Sequence("catalog_version_seq")))
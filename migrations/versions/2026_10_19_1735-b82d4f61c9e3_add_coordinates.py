@@ -0,0 +1,33 @@
+"""add coordinates to restaurants and user addresses
+
+Revision ID: b82d4f61c9e3
+Revises: 5e0b8c3f7a12
+Create Date: 2026-10-19 17:35:12.440981
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b82d4f61c9e3"
+down_revision: Union[str, Sequence[str], None] = "5e0b8c3f7a12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("restaurants", "user_addresses"):
+        op.add_column(table, sa.Column("latitude", sa.Float(), nullable=True))
+        op.add_column(table, sa.Column("longitude", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("restaurants", "user_addresses"):
+        op.drop_column(table, "longitude")
+        op.drop_column(table, "latitude")
@@ -0,0 +1,52 @@
+"""add delivery zones
+
+Revision ID: 6f3a9c1e8d27
+Revises: b82d4f61c9e3
+Create Date: 2026-10-19 18:20:41.173520
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f3a9c1e8d27"
+down_revision: Union[str, Sequence[str], None] = "b82d4f61c9e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "delivery_zones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("restaurant_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("polygon", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("interior_cells", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("boundary_cells", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.ForeignKeyConstraint(
+            ["restaurant_id"], ["restaurants.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_delivery_zones_restaurant_id"),
+        "delivery_zones",
+        ["restaurant_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_delivery_zones_restaurant_id"), table_name="delivery_zones")
+    op.drop_table("delivery_zones")
@@ -0,0 +1,32 @@
+"""add restaurant listing indexes
+
+Revision ID: d15b7e2a4c88
+Revises: 6f3a9c1e8d27
+Create Date: 2026-10-19 19:05:27.904113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d15b7e2a4c88"
+down_revision: Union[str, Sequence[str], None] = "6f3a9c1e8d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_restaurants_city_id", "restaurants", ["city", "id"])
+    op.create_index("ix_restaurants_country_id", "restaurants", ["country", "id"])
+    op.create_index("ix_restaurants_name_id", "restaurants", ["name", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_restaurants_name_id", table_name="restaurants")
+    op.drop_index("ix_restaurants_country_id", table_name="restaurants")
+    op.drop_index("ix_restaurants_city_id", table_name="restaurants")
@@ -0,0 +1,111 @@
+"""add opening hours and precomputed open slots
+
+Revision ID: 8c4e1f7b2d93
+Revises: d15b7e2a4c88
+Create Date: 2026-10-19 19:50:08.316642
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e1f7b2d93"
+down_revision: Union[str, Sequence[str], None] = "d15b7e2a4c88"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "restaurants",
+        sa.Column(
+            "timezone", sa.String(length=64), server_default="UTC", nullable=False
+        ),
+    )
+    op.add_column(
+        "restaurants",
+        sa.Column("open_slots_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_table(
+        "restaurant_opening_hours",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("restaurant_id", sa.Integer(), nullable=False),
+        sa.Column("weekday", sa.SmallInteger(), nullable=False),
+        sa.Column("opens_at", sa.Time(), nullable=False),
+        sa.Column("closes_at", sa.Time(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["restaurant_id"], ["restaurants.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_restaurant_opening_hours_restaurant_id"),
+        "restaurant_opening_hours",
+        ["restaurant_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "restaurant_hours_exceptions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("restaurant_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("opens_at", sa.Time(), nullable=True),
+        sa.Column("closes_at", sa.Time(), nullable=True),
+        sa.Column("note", sa.String(length=200), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["restaurant_id"], ["restaurants.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_restaurant_hours_exceptions_restaurant_id_day",
+        "restaurant_hours_exceptions",
+        ["restaurant_id", "day"],
+    )
+
+    op.create_table(
+        "restaurant_open_slots",
+        sa.Column("restaurant_id", sa.Integer(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("open_from", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("open_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("country", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["restaurant_id"], ["restaurants.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("restaurant_id", "bucket_start", "open_from"),
+    )
+    op.create_index(
+        "ix_restaurant_open_slots_city_bucket_start",
+        "restaurant_open_slots",
+        ["city", "bucket_start", "restaurant_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_restaurant_open_slots_city_bucket_start",
+        table_name="restaurant_open_slots",
+    )
+    op.drop_table("restaurant_open_slots")
+    op.drop_index(
+        "ix_restaurant_hours_exceptions_restaurant_id_day",
+        table_name="restaurant_hours_exceptions",
+    )
+    op.drop_table("restaurant_hours_exceptions")
+    op.drop_index(
+        op.f("ix_restaurant_opening_hours_restaurant_id"),
+        table_name="restaurant_opening_hours",
+    )
+    op.drop_table("restaurant_opening_hours")
+    op.drop_column("restaurants", "open_slots_until")
+    op.drop_column("restaurants", "timezone")
@@ -0,0 +1,72 @@
+"""add restaurant, courier and delivery point to orders
+
+Revision ID: 2a9d5f0c7e14
+Revises: 8c4e1f7b2d93
+Create Date: 2026-10-19 20:30:44.652018
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2a9d5f0c7e14"
+down_revision: Union[str, Sequence[str], None] = "8c4e1f7b2d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("orders", sa.Column("delivery_latitude", sa.Float(), nullable=True))
+    op.add_column("orders", sa.Column("delivery_longitude", sa.Float(), nullable=True))
+    op.add_column("orders", sa.Column("restaurant_id", sa.Integer(), nullable=True))
+    op.add_column("orders", sa.Column("courier_id", sa.Integer(), nullable=True))
+    op.add_column("orders", sa.Column("assigned_at", sa.DateTime(), nullable=True))
+    # kept when the order is archived, added to every partition
+    op.add_column(
+        "orders_archive", sa.Column("restaurant_id", sa.Integer(), nullable=True)
+    )
+    op.create_foreign_key(
+        "orders_restaurant_id_fkey",
+        "orders",
+        "restaurants",
+        ["restaurant_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_foreign_key(
+        "orders_courier_id_fkey",
+        "orders",
+        "users",
+        ["courier_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_orders_courier_id_status", "orders", ["courier_id", "status"])
+    op.create_index(
+        "ix_orders_restaurant_id_status", "orders", ["restaurant_id", "status"]
+    )
+    op.create_index(
+        "ix_orders_status_courier_id_created_at",
+        "orders",
+        ["status", "courier_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_orders_status_courier_id_created_at", table_name="orders")
+    op.drop_index("ix_orders_restaurant_id_status", table_name="orders")
+    op.drop_index("ix_orders_courier_id_status", table_name="orders")
+    op.drop_constraint("orders_courier_id_fkey", "orders", type_="foreignkey")
+    op.drop_constraint("orders_restaurant_id_fkey", "orders", type_="foreignkey")
+    op.drop_column("orders_archive", "restaurant_id")
+    op.drop_column("orders", "assigned_at")
+    op.drop_column("orders", "courier_id")
+    op.drop_column("orders", "restaurant_id")
+    op.drop_column("orders", "delivery_longitude")
+    op.drop_column("orders", "delivery_latitude")
@@ -0,0 +1,58 @@
+"""add courier location history
+
+Revision ID: 5e81c3a7d0f6
+Revises: 2a9d5f0c7e14
+Create Date: 2026-10-19 21:05:12.318406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e81c3a7d0f6"
+down_revision: Union[str, Sequence[str], None] = "2a9d5f0c7e14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "courier_locations",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("courier_id", sa.Integer(), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_courier_locations_courier_id_recorded_at",
+        "courier_locations",
+        ["courier_id", "recorded_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_courier_locations_recorded_at",
+        "courier_locations",
+        ["recorded_at"],
+        unique=False,
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_courier_locations_recorded_at",
+        table_name="courier_locations",
+        postgresql_using="brin",
+    )
+    op.drop_index(
+        "ix_courier_locations_courier_id_recorded_at", table_name="courier_locations"
+    )
+    op.drop_table("courier_locations")
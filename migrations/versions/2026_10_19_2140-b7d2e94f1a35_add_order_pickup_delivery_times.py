@@ -0,0 +1,33 @@
+"""add order pickup and delivery times
+
+Revision ID: b7d2e94f1a35
+Revises: 5e81c3a7d0f6
+Create Date: 2026-10-19 21:40:27.904113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e94f1a35"
+down_revision: Union[str, Sequence[str], None] = "5e81c3a7d0f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("orders", sa.Column("picked_up_at", sa.DateTime(), nullable=True))
+    op.add_column("orders", sa.Column("delivered_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_orders_picked_up_at", "orders", ["picked_up_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_orders_picked_up_at", table_name="orders")
+    op.drop_column("orders", "delivered_at")
+    op.drop_column("orders", "picked_up_at")
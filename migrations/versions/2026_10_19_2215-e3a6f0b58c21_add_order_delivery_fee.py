@@ -0,0 +1,37 @@
+"""add order delivery fee
+
+Revision ID: e3a6f0b58c21
+Revises: b7d2e94f1a35
+Create Date: 2026-10-19 22:15:03.516770
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a6f0b58c21"
+down_revision: Union[str, Sequence[str], None] = "b7d2e94f1a35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "orders",
+        sa.Column("delivery_fee", sa.Float(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "orders_archive",
+        sa.Column("delivery_fee", sa.Float(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("orders_archive", "delivery_fee")
+    op.drop_column("orders", "delivery_fee")